@@ -3,19 +3,32 @@ import torch.nn as nn
 import torch.nn.functional as F
 from torchvision import models
 from PIL import Image, ImageDraw, ImageFont
-import matplotlib.pyplot as plt
 import os
+from contextlib import nullcontext
 from datetime import datetime
-
-from config import DEVICE, MODEL_OUT
+from functools import lru_cache
+
+from config_images import (
+    DEVICE,
+    MODEL_OUT,
+    LIP_SCRIPTED_OUT,
+    LIP_USE_SCRIPTED,
+    LIP_QUANTIZED_OUT,
+    LIP_USE_QUANTIZED,
+    LIP_QUANT_BACKEND,
+    LIP_USE_BF16
+)
 from preprocess_images import get_transforms   # ✅ CORRECT FILE
+from utils import setup_logging
+
+LOG = setup_logging()
 
 
 # ======================================================
 # LOAD TRAINED MODEL
 # ======================================================
-def load_model(class_names):
-    model = models.resnet18(pretrained=False)
+def build_model(class_names, pretrained: bool = False):
+    model = models.resnet18(pretrained=pretrained)
 
     num_ftrs = model.fc.in_features
     model.fc = nn.Sequential(
@@ -24,13 +37,82 @@ def load_model(class_names):
         nn.Dropout(0.3),
         nn.Linear(256, len(class_names))
     )
+    return model
+
 
+def load_eager_model(class_names):
+    model = build_model(class_names)
     model.load_state_dict(torch.load(MODEL_OUT, map_location=DEVICE))
-    model.to(DEVICE)
+    model.to(DEVICE, memory_format=torch.channels_last)
     model.eval()
     return model
 
 
+def export_is_current(path) -> bool:
+    # A retrained LipModel.pth makes an older export stale
+    if not path.exists():
+        return False
+    return (
+        not MODEL_OUT.exists()
+        or path.stat().st_mtime >= MODEL_OUT.stat().st_mtime
+    )
+
+
+def load_model(class_names):
+    # INT8 kernels are CPU-only; the export only exists if it passed the accuracy gate
+    if LIP_USE_QUANTIZED and DEVICE.type == "cpu" and export_is_current(LIP_QUANTIZED_OUT):
+        LOG.info(f"Loading INT8 TorchScript lip model: {LIP_QUANTIZED_OUT}")
+        torch.backends.quantized.engine = LIP_QUANT_BACKEND
+        model = torch.jit.load(str(LIP_QUANTIZED_OUT), map_location=DEVICE)
+        model.eval()
+        return model
+
+    if LIP_USE_SCRIPTED and export_is_current(LIP_SCRIPTED_OUT):
+        LOG.info(f"Loading frozen TorchScript lip model: {LIP_SCRIPTED_OUT}")
+        model = torch.jit.load(str(LIP_SCRIPTED_OUT), map_location=DEVICE)
+        model.eval()
+        return model
+
+    return load_eager_model(class_names)
+
+
+def to_model_input(tensor):
+    # Channels-last matches the layout the model (and export) was prepared for
+    return tensor.to(DEVICE).contiguous(memory_format=torch.channels_last)
+
+
+# ======================================================
+# BFLOAT16 AUTOCAST (CPU)
+# ======================================================
+@lru_cache(maxsize=None)
+def bf16_supported() -> bool:
+    # Probed once per process; any probe failure counts as unsupported
+    if DEVICE.type != "cpu":
+        return False
+    try:
+        return bool(torch.ops.mkldnn._is_mkldnn_bf16_supported())
+    except Exception:
+        return False
+
+
+@lru_cache(maxsize=None)
+def _warn_no_bf16():
+    LOG.warning("CPU has no native bfloat16 support; lip model stays in FP32")
+
+
+def lip_autocast(enabled: bool = LIP_USE_BF16):
+    """
+    bfloat16 autocast context for lip forward passes. Weights stay FP32;
+    convolutions and matmuls run in bf16 and the logits come out bf16.
+    A no-op when disabled or when the CPU lacks native bf16 (warned once).
+    """
+    if enabled:
+        if bf16_supported():
+            return torch.autocast("cpu", dtype=torch.bfloat16)
+        _warn_no_bf16()
+    return nullcontext()
+
+
 # ======================================================
 # RECOMMENDATION LOGIC
 # ======================================================
@@ -125,21 +207,49 @@ def select_image_from_terminal():
 # ======================================================
 # PREDICTION
 # ======================================================
-def predict_image(image_path, model, class_names):
+def classify_image(image, model, class_names, bf16: bool = LIP_USE_BF16):
     transform = get_transforms(train=False)
-    image = Image.open(image_path).convert("RGB")
+    tensor = to_model_input(transform(image.convert("RGB")).unsqueeze(0))
 
-    tensor = transform(image).unsqueeze(0).to(DEVICE)
-
-    with torch.no_grad():
-        outputs = model(tensor)
-        probs = F.softmax(outputs, dim=1)
+    with torch.inference_mode():
+        with lip_autocast(bf16):
+            outputs = model(tensor)
+        probs = F.softmax(outputs.float(), dim=1)
         pred = probs.argmax(dim=1).item()
 
     label = class_names[pred]
     confidence = probs[0][pred].item()
     score = calculate_hydration_score(label, confidence)
 
+    return label, score, confidence
+
+
+def classify_batch(images, model, class_names, bf16: bool = LIP_USE_BF16):
+    transform = get_transforms(train=False)
+    tensor = to_model_input(torch.stack(
+        [transform(image.convert("RGB")) for image in images]
+    ))
+
+    with torch.inference_mode():
+        with lip_autocast(bf16):
+            outputs = model(tensor)
+        probs = F.softmax(outputs.float(), dim=1)
+        confidences, preds = probs.max(dim=1)
+
+    results = []
+    for pred, confidence in zip(preds.tolist(), confidences.tolist()):
+        label = class_names[pred]
+        results.append(
+            (label, calculate_hydration_score(label, confidence), confidence)
+        )
+    return results
+
+
+def predict_image(image_path, model, class_names, bf16: bool = LIP_USE_BF16):
+    image = Image.open(image_path).convert("RGB")
+
+    label, score, confidence = classify_image(image, model, class_names, bf16)
+
     final_image = draw_hydration_score(image, score)
 
     os.makedirs("img", exist_ok=True)
@@ -147,6 +257,9 @@ def predict_image(image_path, model, class_names):
     out_path = f"img/result_{timestamp}.png"
     final_image.save(out_path)
 
+    # matplotlib is only needed for the interactive preview
+    import matplotlib.pyplot as plt
+
     plt.imshow(final_image)
     plt.axis("off")
     plt.title(f"{label} | Score: {score}/100")
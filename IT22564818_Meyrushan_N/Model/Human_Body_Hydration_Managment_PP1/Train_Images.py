@@ -1,107 +1,209 @@
+import argparse
+import time
+
+import numpy as np
 import torch
 import torch.nn as nn
 import torch.optim as optim
-from torchvision import models
 from sklearn.metrics import classification_report
 
-from config import DEVICE, EPOCHS, LR, MODEL_OUT
+from config_images import BATCH_SIZE, DEVICE, EPOCHS, LR, MODEL_OUT, LIP_TRAIN_MODE, LIP_USE_BF16
 from dataLoad_images import load_data_images   # ✅ NEW SAFE LOADER
-
-
-# ======================================================
-# LOAD DATA
-# ======================================================
-train_loader, test_loader, class_names, train_dataset = load_data_images()
-print("Classes:", class_names)
+from ImagePredict import build_model, lip_autocast
 
 
 # ======================================================
 # MODEL – RESNET18 (TRANSFER LEARNING)
 # ======================================================
-model = models.resnet18(pretrained=True)
-
-# Freeze backbone
-for param in model.parameters():
-    param.requires_grad = False
+def build_training_model(class_names, pretrained: bool = True):
+    model = build_model(class_names, pretrained=pretrained)
 
-# Replace classifier head
-num_ftrs = model.fc.in_features
-model.fc = nn.Sequential(
-    nn.Linear(num_ftrs, 256),
-    nn.ReLU(),
-    nn.Dropout(0.3),
-    nn.Linear(256, len(class_names))  # ✅ Safe (auto = 2)
-)
+    # Freeze backbone (the head is trainable again below)
+    for param in model.parameters():
+        param.requires_grad = False
+    for param in model.fc.parameters():
+        param.requires_grad = True
 
-model.to(DEVICE)
+    return model.to(DEVICE)
 
 
 # ======================================================
-# LOSS & OPTIMIZER
+# TRAINING LOOP – FULL FORWARD EVERY EPOCH
 # ======================================================
-criterion = nn.CrossEntropyLoss()
-optimizer = optim.Adam(model.fc.parameters(), lr=LR)
+def train_full(model, train_loader, test_loader, class_names, epochs=EPOCHS,
+               bf16=LIP_USE_BF16):
+    # bf16 autocast covers the forward pass and loss; gradients and the
+    # Adam update stay FP32, so no loss scaling is needed
+    criterion = nn.CrossEntropyLoss()
+    optimizer = optim.Adam(model.fc.parameters(), lr=LR)
 
+    for epoch in range(epochs):
+        # Backbone stays in eval mode: frozen BatchNorm keeps its pretrained
+        # statistics, as in train_cached (and the head has no BN/dropout)
+        model.eval()
+        model.fc.train()
+        running_loss = 0.0
+        correct = 0
+        total = 0
 
-# ======================================================
-# TRAINING LOOP
-# ======================================================
-for epoch in range(EPOCHS):
-    model.train()
-    running_loss = 0.0
-    correct = 0
-    total = 0
+        for images, labels in train_loader:
+            images = images.to(DEVICE)
+            labels = labels.to(DEVICE)
 
-    for images, labels in train_loader:
-        images = images.to(DEVICE)
-        labels = labels.to(DEVICE)
+            optimizer.zero_grad()
 
-        optimizer.zero_grad()
+            with lip_autocast(bf16):
+                outputs = model(images)
+                loss = criterion(outputs, labels)
 
-        outputs = model(images)
-        loss = criterion(outputs, labels)
+            loss.backward()
+            optimizer.step()
 
-        loss.backward()
-        optimizer.step()
+            running_loss += loss.item() * images.size(0)
+            _, preds = torch.max(outputs, 1)
 
-        running_loss += loss.item() * images.size(0)
-        _, preds = torch.max(outputs, 1)
+            correct += torch.sum(preds == labels)
+            total += labels.size(0)
 
-        correct += torch.sum(preds == labels)
-        total += labels.size(0)
+        epoch_loss = running_loss / total
+        epoch_acc = correct.double() / total
 
-    epoch_loss = running_loss / total
-    epoch_acc = correct.double() / total
+        print(
+            f"Epoch [{epoch+1}/{epochs}] "
+            f"Loss: {epoch_loss:.4f} "
+            f"Accuracy: {epoch_acc:.4f}"
+        )
 
-    print(
-        f"Epoch [{epoch+1}/{EPOCHS}] "
-        f"Loss: {epoch_loss:.4f} "
-        f"Accuracy: {epoch_acc:.4f}"
-    )
+    # ---------------- Evaluation ----------------
+    model.eval()
+    y_true, y_pred = [], []
 
+    with torch.no_grad():
+        for images, labels in test_loader:
+            images = images.to(DEVICE)
 
-# ======================================================
-# EVALUATION
-# ======================================================
-model.eval()
-y_true, y_pred = [], []
+            with lip_autocast(bf16):
+                outputs = model(images)
+            _, preds = torch.max(outputs, 1)
 
-with torch.no_grad():
-    for images, labels in test_loader:
-        images = images.to(DEVICE)
+            y_true.extend(labels.numpy())
+            y_pred.extend(preds.cpu().numpy())
 
-        outputs = model(images)
-        _, preds = torch.max(outputs, 1)
+    return y_true, y_pred
 
-        y_true.extend(labels.numpy())
-        y_pred.extend(preds.cpu().numpy())
 
-print("\nClassification Report:")
-print(classification_report(y_true, y_pred, target_names=class_names))
+# ======================================================
+# TRAINING LOOP – HEAD ONLY ON CACHED EMBEDDINGS
+# ======================================================
+def train_cached(model, train_indices, test_indices, class_names, epochs=EPOCHS,
+                 bf16=LIP_USE_BF16):
+    """
+    The backbone is frozen, so its output for a given (image, augmentation)
+    never changes. Embed once (see lip_embeddings.py) and train ``model.fc``
+    on the cached 512-d vectors; epoch ``e`` uses augmentation seed
+    ``e % LIP_EMBED_AUG_SEEDS``, augmented like ``LIP_AUGMENT_MODE``
+    training. The backbone runs in eval mode, as in ``train_full``, so
+    BatchNorm keeps its pretrained statistics.
+    """
+    from lip_embeddings import load_embedding_cache
+
+    cache = load_embedding_cache(model)
+    labels = torch.from_numpy(cache["labels"])
+    train_idx = np.asarray(train_indices)
+    n_seeds = cache["train_aug"].shape[0]
+
+    head = model.fc
+    criterion = nn.CrossEntropyLoss()
+    optimizer = optim.Adam(head.parameters(), lr=LR)
+
+    for epoch in range(epochs):
+        # One contiguous read of this epoch's augmented view
+        features = torch.from_numpy(np.ascontiguousarray(
+            cache["train_aug"][epoch % n_seeds][train_idx]
+        )).to(DEVICE)
+        targets = labels[train_idx].to(DEVICE)
+
+        head.train()
+        running_loss = 0.0
+        correct = 0
+        order = torch.randperm(len(train_idx))
+
+        for start in range(0, len(order), BATCH_SIZE):
+            batch = order[start:start + BATCH_SIZE]
+            x, y = features[batch], targets[batch]
+
+            optimizer.zero_grad()
+            with lip_autocast(bf16):
+                outputs = head(x)
+                loss = criterion(outputs, y)
+            loss.backward()
+            optimizer.step()
+
+            running_loss += loss.item() * x.size(0)
+            correct += torch.sum(outputs.argmax(dim=1) == y).item()
+
+        print(
+            f"Epoch [{epoch+1}/{epochs}] "
+            f"Loss: {running_loss / len(order):.4f} "
+            f"Accuracy: {correct / len(order):.4f}"
+        )
+
+    # ---------------- Evaluation ----------------
+    head.eval()
+    test_idx = np.asarray(test_indices)
+    with torch.no_grad():
+        features = torch.from_numpy(np.ascontiguousarray(cache["eval"][test_idx])).to(DEVICE)
+        with lip_autocast(bf16):
+            y_pred = head(features).argmax(dim=1).cpu().numpy()
+
+    return labels[test_idx].numpy(), y_pred
 
 
 # ======================================================
-# SAVE MODEL
+# MAIN
 # ======================================================
-torch.save(model.state_dict(), MODEL_OUT)
-print(f"\nModel saved successfully → {MODEL_OUT}")
+def main(mode=LIP_TRAIN_MODE, epochs=EPOCHS, pretrained=True, save=True, bf16=LIP_USE_BF16):
+    # ---------------- Load data ----------------
+    train_loader, test_loader, class_names, train_dataset = load_data_images()
+    print("Classes:", class_names)
+
+    model = build_training_model(class_names, pretrained=pretrained)
+
+    start = time.perf_counter()
+    if mode == "cached":
+        test_indices = test_loader.dataset.indices
+        y_true, y_pred = train_cached(
+            model, train_dataset.indices, test_indices, class_names, epochs, bf16
+        )
+    elif mode == "full":
+        y_true, y_pred = train_full(model, train_loader, test_loader, class_names, epochs, bf16)
+    else:
+        raise ValueError(f"Unknown training mode: {mode}")
+    train_s = time.perf_counter() - start
+
+    print(f"\nTraining mode: {mode} | Time: {train_s:.1f}s")
+    print("\nClassification Report:")
+    print(classification_report(y_true, y_pred, target_names=class_names, zero_division=0))
+
+    # ---------------- Save model ----------------
+    if save:
+        MODEL_OUT.parent.mkdir(parents=True, exist_ok=True)
+        torch.save(model.state_dict(), MODEL_OUT)
+        print(f"\nModel saved successfully → {MODEL_OUT}")
+
+        # Frozen TorchScript copy used by the serving path
+        from lip_export import export_frozen_model
+        export_frozen_model(class_names)
+
+    return {"mode": mode, "train_s": train_s, "y_true": y_true, "y_pred": y_pred}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Train the lip hydration classifier")
+    parser.add_argument("--mode", choices=["cached", "full"], default=LIP_TRAIN_MODE)
+    parser.add_argument("--epochs", type=int, default=EPOCHS)
+    parser.add_argument("--bf16", action="store_true", default=LIP_USE_BF16,
+                        help="bfloat16 autocast (CPUs with native bf16 only)")
+    args = parser.parse_args()
+
+    main(args.mode, args.epochs, bf16=args.bf16)
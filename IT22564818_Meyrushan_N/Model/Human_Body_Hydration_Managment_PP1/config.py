@@ -1,7 +1,6 @@
+import os
 import warnings
 from pathlib import Path
-import torch
-import random
 
 warnings.filterwarnings("ignore")
 
@@ -12,10 +11,23 @@ BASE_DIR = Path(__file__).parent
 
 DATA_DIR = BASE_DIR / "data"
 DATA_PATH = DATA_DIR / "dataset.csv"
+LABELED_CSV_PATH = DATA_DIR / "labeled_dataset.csv"
+
+# Cleaned + labeled dataset as Parquet with dictionary-encoded text columns
+# (see tabular_store.py); rebuilt only when dataset.csv or the labeling
+# rules change. "csv" re-parses dataset.csv and rewrites LABELED_CSV_PATH
+# on every load_data() call.
+DATASET_FORMAT = "parquet"
+LABELED_PARQUET_PATH = BASE_DIR / "data_store" / "labeled_dataset.parquet"
+
+# The Parquet store is built by streaming dataset.csv in chunks of this many
+# rows (clean + label + append), so ingestion memory does not grow with input
+DATASET_CHUNK_ROWS = 100_000
 
 MODEL_DIR = BASE_DIR / "models"
-MODEL_DIR.mkdir(exist_ok=True)
-DATA_DIR.mkdir(exist_ok=True)
+
+# Image (CNN) settings live in config_images.py so that tabular
+# prediction never pays the PyTorch import cost.
 
 # ======================================================
 # MODEL SAVE PATHS (TABULAR ML)
@@ -26,6 +38,14 @@ MODEL_CLF_PATH = MODEL_DIR / "hydration_classifier.pkl"
 PREPROCESSOR_PATH = MODEL_DIR / "preprocessor.pkl"
 ENCODER_PATH = MODEL_DIR / "hydration_label_encoder.pkl"
 
+# Pandas-free compiled preprocessing (feature_plan.py)
+FEATURE_PLAN_PATH = MODEL_DIR / "feature_plan.pkl"
+
+# Versioned serving bundle with memory-mappable forests (model_bundle.py)
+BUNDLE_DIR = MODEL_DIR / "hydration_bundle"
+BUNDLE_FORMAT_VERSION = 1
+BUNDLE_VERIFY_CHECKSUMS = True
+
 # (Optional / future)
 MODEL_DISEASE_PATH = MODEL_DIR / "disease_classifier.pkl"
 DISEASE_ENCODER_PATH = MODEL_DIR / "disease_encoder.pkl"
@@ -111,6 +131,109 @@ RF_CLASSIFIER_PARAMS = {
     "class_weight": "balanced"
 }
 
+# ======================================================
+# HISTOGRAM GRADIENT BOOSTING PARAMETERS
+# ======================================================
+HGB_REGRESSOR_PARAMS = {
+    "max_iter": 300,
+    "learning_rate": 0.1,
+    "max_leaf_nodes": 31,
+    "min_samples_leaf": 20,
+    "early_stopping": False,
+    "random_state": RANDOM_STATE
+}
+
+HGB_CLASSIFIER_PARAMS = {
+    "max_iter": 300,
+    "learning_rate": 0.1,
+    "max_leaf_nodes": 31,
+    "min_samples_leaf": 20,
+    "early_stopping": False,
+    "random_state": RANDOM_STATE,
+    "class_weight": "balanced"
+}
+
+# Model family train.py fits: "random_forest" or "hist_gradient_boosting"
+MODEL_ENGINE = "random_forest"
+
+# ======================================================
+# FOREST COMPRESSION (forest_compression.py)
+# ======================================================
+# Largest allowed drop in out-of-bag R² / accuracy vs the full forest
+COMPRESSION_TOLERANCE = 0.005
+# Share of rows a tree subset must cover out-of-bag before its score counts
+COMPRESSION_MIN_OOB_COVERAGE = 0.95
+# Shallow student forests tried for distillation, smallest first
+COMPRESSION_STUDENTS = [
+    {"n_estimators": 25, "max_depth": 6},
+    {"n_estimators": 50, "max_depth": 8},
+    {"n_estimators": 100, "max_depth": 10}
+]
+COMPACT_BUNDLE_DIR = MODEL_DIR / "hydration_bundle_compact"
+COMPACT_REG_PATH = MODEL_DIR / "hydration_regressor_compact.pkl"
+COMPACT_CLF_PATH = MODEL_DIR / "hydration_classifier_compact.pkl"
+COMPRESSION_REPORT_PATH = MODEL_DIR / "compression_report.json"
+# Serve the compressed models instead of the full forests
+USE_COMPACT_MODELS = False
+
+# ======================================================
+# JOINT FOREST (joint_forest.py)
+# ======================================================
+# One multi-output forest whose splits serve water volume and risk class.
+# Leaves are grown finer than RF_*_PARAMS: with their 5/2 split/leaf
+# limits the shared trees lose accuracy on both targets (see
+# evaluation/benchmark_joint_forest.py, which reports both settings)
+JOINT_FOREST_PARAMS = {
+    "n_estimators": 300,
+    "max_depth": 15,
+    "min_samples_split": 2,
+    "min_samples_leaf": 1,
+    "random_state": RANDOM_STATE
+}
+# Weight of the standardised water target against the one-hot risk columns
+JOINT_WATER_WEIGHT = 0.5
+JOINT_MODEL_PATH = MODEL_DIR / "hydration_joint.pkl"
+JOINT_BUNDLE_DIR = MODEL_DIR / "hydration_bundle_joint"
+# Serve both outputs from the joint forest in one traversal
+USE_JOINT_MODEL = False
+
+# Serve forests (and boosted trees) through the flat NumPy evaluators (flat_forest.py)
+USE_FLAT_FOREST = True
+# Above this many rows sklearn's compiled traversal is faster again
+FLAT_FOREST_MAX_ROWS = 64
+
+# ======================================================
+# TRAINING ORCHESTRATION
+# ======================================================
+# CPU budget shared by all concurrent fits (parallel fits x trees per fit)
+TRAINING_WORKERS = os.cpu_count() or 4
+# Folds for the classifier's cross-validated accuracy
+TRAINING_CV_FOLDS = 5
+
+# ======================================================
+# HYPERPARAMETER TUNING (tune.py)
+# ======================================================
+TUNING_PARAM_GRID = {
+    "max_depth": [8, 12, 15, 20, None],
+    "min_samples_split": [2, 5, 10],
+    "min_samples_leaf": [1, 2, 4],
+    "max_features": ["sqrt", 0.5, 1.0]
+}
+TUNING_CANDIDATES = 27
+# Successive halving: keep 1/FACTOR per round, grow rows and trees by FACTOR
+TUNING_HALVING_FACTOR = 3
+TUNING_FINALISTS = 3
+TUNING_MIN_SAMPLES = 150
+TUNING_MIN_TREES = 10
+TUNING_MAX_TREES = 300
+# Wall-clock budget for one tune.py run (both forests)
+TUNING_BUDGET_S = 600
+TUNING_VALIDATION_SIZE = 0.2
+TUNING_LATENCY_REPEATS = 200
+TUNING_RESULTS_PATH = MODEL_DIR / "tuning_results.json"
+# Train with the params tune.py picked instead of RF_*_PARAMS
+USE_TUNED_PARAMS = False
+
 # ======================================================
 # CATEGORY MAPPINGS
 # ======================================================
@@ -147,16 +270,46 @@ HYDRATION_RISK_CATEGORIES = [
 ]
 
 # ======================================================
-# OPTIONAL CNN (LIP IMAGE MODEL – ISOLATED)
+# INFERENCE SERVICE (HTTP API FOR THE FLUTTER CLIENT)
+# ======================================================
+SERVER_HOST = "0.0.0.0"
+SERVER_PORT = 8000
+
+# Threads used for CPU-bound inference off the event loop
+INFERENCE_WORKERS = os.cpu_count() or 4
+
+# ======================================================
+# WEATHER LOOKUP (OPEN-METEO)
 # ======================================================
-MODEL_OUT = MODEL_DIR / "LipModel.pth"
+WEATHER_API_URL = "https://api.open-meteo.com/v1/forecast"
+WEATHER_TIMEOUT_S = 3.0
 
-BATCH_SIZE = 8
-EPOCHS = 10
-LR = 0.001
-IMG_SIZE = 224
+# Cache readings per lat/lon grid cell (0.1° ≈ 11 km)
+WEATHER_GRID_DEG = 0.1
+WEATHER_CACHE_TTL_S = 15 * 60
+WEATHER_CACHE_MAX_CELLS = 10000
 
-DEVICE = torch.device("cuda" if torch.cuda.is_available() else "cpu")
+# Circuit breaker: open after N consecutive failures, retry after cooldown
+WEATHER_FAILURE_THRESHOLD = 3
+WEATHER_CIRCUIT_RESET_S = 60
 
-torch.manual_seed(RANDOM_STATE)
-random.seed(RANDOM_STATE)
+# (Temperature °C, Humidity %) used when no reading is available
+WEATHER_FALLBACK = (25.0, 50.0)
+
+# ======================================================
+# FORM PREDICTION RESULT CACHE
+# ======================================================
+PREDICTION_CACHE_ENABLED = True
+PREDICTION_CACHE_MAX_ENTRIES = 4096
+PREDICTION_CACHE_TTL_S = 60 * 60
+
+# Numeric inputs are rounded to these steps for the cache key only, so
+# readings that differ only by noise share one cached model output
+PREDICTION_CACHE_QUANTA = {
+    "Temperature_C": 0.5,
+    "Humidity_%": 1.0,
+    "Weight": 0.5,
+    "Height": 1.0,
+    "Water_Intake_Last_4_Hours": 0.05,
+    "Exercise Time (minutes) in Last 4 Hours": 1.0
+}
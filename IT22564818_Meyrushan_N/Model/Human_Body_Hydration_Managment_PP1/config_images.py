@@ -0,0 +1,77 @@
+import os
+import random
+import torch
+
+from config import BASE_DIR, MODEL_DIR, RANDOM_STATE
+
+# ======================================================
+# LIP IMAGE MODEL (CNN – ISOLATED FROM TABULAR CONFIG)
+# ======================================================
+MODEL_OUT = MODEL_DIR / "LipModel.pth"
+
+# Traced + frozen TorchScript export of MODEL_OUT (see lip_export.py)
+LIP_SCRIPTED_OUT = MODEL_DIR / "LipModel_frozen.pt"
+LIP_USE_SCRIPTED = True
+
+# INT8 post-training quantization ("static" or "dynamic")
+LIP_QUANTIZED_OUT = MODEL_DIR / "LipModel_int8.pt"
+LIP_QUANT_REPORT = MODEL_DIR / "lip_quantization_report.json"
+LIP_USE_QUANTIZED = True
+LIP_QUANT_MODE = "static"
+LIP_QUANT_BACKEND = "x86"
+LIP_QUANT_CALIBRATION_BATCHES = 16
+
+# Accuracy gate: refuse to publish if INT8 loses more than this vs FP32
+LIP_QUANT_MAX_ACCURACY_DROP = 0.01
+LIP_QUANT_MAX_F1_DROP = 0.01
+
+BATCH_SIZE = 8
+EPOCHS = 10
+LR = 0.001
+IMG_SIZE = 224
+
+# "cached": run the frozen backbone once per (image, augmentation seed) and
+# train the head on cached embeddings; "full": forward every image each epoch
+LIP_TRAIN_MODE = "cached"
+LIP_EMBEDDING_CACHE_DIR = MODEL_DIR / "lip_embeddings"
+LIP_EMBED_AUG_SEEDS = 4
+
+# Pre-resized uint8 shards of the data/ class folders (see lip_image_store.py);
+# kept outside data/ so ImageFolder never mistakes it for a class
+LIP_USE_IMAGE_STORE = True
+LIP_IMAGE_STORE_DIR = BASE_DIR / "data_store" / "lip_images"
+LIP_STORE_SHARD_SIZE = 256
+
+# Persisted train/test assignment by image path (see dataLoad_images.py)
+LIP_SPLIT_MANIFEST = BASE_DIR / "data_store" / "lip_split.json"
+LIP_TEST_FRACTION = 0.2
+
+# Training augmentation: "batch" collates uint8 images and augments the whole
+# batch with vectorized tensor ops (preprocess_images.BatchAugment);
+# "sample" runs the torchvision transforms per image in the worker
+LIP_AUGMENT_MODE = "batch"
+
+DEVICE = torch.device("cuda" if torch.cuda.is_available() else "cpu")
+
+# DataLoader workers (0 = load in the training process)
+LIP_NUM_WORKERS = min(4, os.cpu_count() or 1)
+LIP_PREFETCH_FACTOR = 2
+LIP_PERSISTENT_WORKERS = True
+LIP_PIN_MEMORY = DEVICE.type == "cuda"
+
+# bfloat16 autocast for lip training and inference (opt-in). Only used on
+# CPUs with native bf16 (AVX512-BF16 / AMX); everything else stays FP32
+LIP_USE_BF16 = False
+
+# Must match the ImageFolder class order used in training
+LIP_CLASS_NAMES = ["Dehydrate", "Normal"]
+
+# ======================================================
+# LIP INFERENCE SERVING
+# ======================================================
+# Lip-image micro-batching (one forward pass per batch)
+LIP_MAX_BATCH_SIZE = 16
+LIP_MAX_WAIT_MS = 10
+
+torch.manual_seed(RANDOM_STATE)
+random.seed(RANDOM_STATE)
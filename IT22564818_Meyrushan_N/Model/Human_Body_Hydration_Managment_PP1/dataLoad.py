@@ -1,12 +1,15 @@
 import pandas as pd
 import numpy as np
 from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional
 from config import (
     DATA_PATH,
-    DATA_DIR,
+    LABELED_CSV_PATH,
+    DATASET_FORMAT,
+    DATASET_CHUNK_ROWS,
     TIME_SLOT_MAPPING
 )
-from utils import setup_logging
+from utils import setup_logging, map_distinct
 
 LOG = setup_logging()
 
@@ -103,106 +106,260 @@ def calculate_targets(df: pd.DataFrame) -> pd.DataFrame:
     return df
 
 
+# ======================================================
+# LABELING RULES (THRESHOLDS + WEIGHTS AS DATA)
+# ======================================================
+URINE_COL = "Urine Color (Most Recent Urination)"
+SYMPTOM_COLS = [
+    "Thirsty (Right Now)",
+    "Dizziness (Right Now)",
+    "Fatigue / Tiredness (Right Now)",
+    "Headache (Right Now)"
+]
+
+# Litres for the next 4-hour window:
+# base * activity + heat + exercise + sweat, clipped and rounded
+WATER_RULES = {
+    "base": {"column": "Weight", "litres_per_kg_day": 0.03, "windows_per_day": 6},
+    "activity": {
+        "column": "Physical_Activity_Level",
+        "factors": {
+            "Sedentary": 1.0,
+            "Light": 1.2,
+            "Moderate": 1.5,
+            "Heavy": 2.0,
+            "Very Heavy": 2.5,
+            "Unknown": 1.2
+        },
+        "default": 1.2
+    },
+    "heat": {"column": "Temperature_C", "above": 25, "per_degrees": 5, "litres": 0.5},
+    "exercise": {
+        "column": "Exercise Time (minutes) in Last 4 Hours",
+        "litres_per_minute": 0.01,
+        "missing": 0
+    },
+    "sweat": {
+        "column": "Sweating Level (Last 4 Hours)",
+        "litres": {
+            "None": 0,
+            "Light": 0.2,
+            "Moderate": 0.5,
+            "Heavy": 0.8,
+            "Very Heavy": 1.2,
+            "Unknown": 0.3
+        },
+        "default": 0.3
+    },
+    "clip": (0.2, 3.0),
+    "decimals": 2
+}
+
+# Each rule adds ``points`` to a row's risk score:
+#   threshold    – numeric column compared against a value (NaN never matches)
+#   answer       – case-insensitive text answer; ``missing`` is used when
+#                  the column is absent from the dataset
+#   intake_ratio – intake / expected (base water) below the first matching
+#                  limit; rows with no positive expectation count as ratio 1
+RISK_RULES = [
+    {"kind": "threshold", "column": URINE_COL, "op": ">=", "value": 6, "points": 3},
+    *[
+        {"kind": "answer", "column": col, "equals": "yes", "missing": "No", "points": 2}
+        for col in SYMPTOM_COLS
+    ],
+    {"kind": "answer", "column": "Urinated (Last 4 Hours)", "equals": "no",
+     "missing": "Yes", "points": 2},
+    {"kind": "intake_ratio", "column": "Water_Intake_Last_4_Hours",
+     "bands": [(0.5, 3), (0.8, 1)]},
+    {"kind": "threshold", "column": "Temperature_C", "op": ">", "value": 30, "points": 1}
+]
+
+# Highest minimum score first; anything below the last one is the default
+RISK_LEVELS = [(8, "High"), (5, "Moderate"), (3, "Low")]
+RISK_DEFAULT_LEVEL = "Very Low"
+
+
+# ======================================================
+# RULE COMPILATION (COLUMN → NUMPY EXPRESSIONS)
+# ======================================================
+_COMPARE = {">=": np.greater_equal, ">": np.greater, "<=": np.less_equal, "<": np.less}
+
+
+def _numeric(df: pd.DataFrame, column: str) -> np.ndarray:
+    return df[column].to_numpy(dtype=np.float64, na_value=np.nan)
+
+
+def _lookup(df: pd.DataFrame, column: str, mapping: Dict[Any, float], default: float) -> np.ndarray:
+    return map_distinct(df[column], lambda v: mapping.get(v, default)).astype(np.float64)
+
+
+def _base_water(df: pd.DataFrame) -> np.ndarray:
+    rule = WATER_RULES["base"]
+    return (_numeric(df, rule["column"]) * rule["litres_per_kg_day"]) / rule["windows_per_day"]
+
+
+def _compile_risk_rule(rule: Dict[str, Any]) -> Callable[[pd.DataFrame], np.ndarray]:
+    kind = rule["kind"]
+
+    if kind == "threshold":
+        compare = _COMPARE[rule["op"]]
+
+        def points(df):
+            hit = compare(_numeric(df, rule["column"]), rule["value"])
+            return np.where(hit, rule["points"], 0)
+
+    elif kind == "answer":
+        def matches(value):
+            return str(value).lower() == rule["equals"]
+
+        def points(df):
+            if rule["column"] not in df.columns:
+                return np.full(len(df), rule["points"] if matches(rule["missing"]) else 0)
+            hit = map_distinct(df[rule["column"]], matches)
+            return np.where(hit, rule["points"], 0)
+
+    elif kind == "intake_ratio":
+        def points(df):
+            expected = _base_water(df)
+            intake = _numeric(df, rule["column"])
+            ratio = np.ones(len(df))
+            np.divide(intake, expected, out=ratio, where=expected > 0)
+            return np.select(
+                [ratio < limit for limit, _ in rule["bands"]],
+                [pts for _, pts in rule["bands"]],
+                0
+            )
+
+    else:
+        raise ValueError(f"Unknown risk rule kind: {kind}")
+
+    return points
+
+
+def compile_risk_rules(rules=RISK_RULES, levels=RISK_LEVELS, default=RISK_DEFAULT_LEVEL):
+    """
+    Turn the rule table into one function DataFrame -> risk labels. Every
+    rule is a whole-column NumPy expression; text answers are evaluated
+    once per distinct value, not once per row.
+    """
+    scorers = [_compile_risk_rule(rule) for rule in rules]
+    names = np.array([name for _, name in levels] + [default], dtype=object)
+
+    def assess(df: pd.DataFrame) -> pd.Series:
+        score = np.zeros(len(df), dtype=np.int32)
+        for scorer in scorers:
+            score += scorer(df)
+        level = np.select(
+            [score >= minimum for minimum, _ in levels], np.arange(len(levels)), len(levels)
+        )
+        return pd.Series(names[level], index=df.index)
+
+    return assess
+
+
+_assess_compiled = compile_risk_rules()
+
+
 # ======================================================
 # WATER REQUIREMENT (NEXT 4 HOURS)
 # ======================================================
 def calculate_water_recommendation(df: pd.DataFrame) -> pd.Series:
-    base = (df["Weight"] * 0.03) / 6
-
-    activity_map = {
-        "Sedentary": 1.0,
-        "Light": 1.2,
-        "Moderate": 1.5,
-        "Heavy": 2.0,
-        "Very Heavy": 2.5,
-        "Unknown": 1.2
-    }
-
-    activity = df["Physical_Activity_Level"].map(activity_map).fillna(1.2)
-    temp_adj = np.maximum(0, (df["Temperature_C"] - 25) / 5) * 0.5
-    exercise_adj = df["Exercise Time (minutes) in Last 4 Hours"].fillna(0) * 0.01
-
-    sweat_map = {
-        "None": 0,
-        "Light": 0.2,
-        "Moderate": 0.5,
-        "Heavy": 0.8,
-        "Very Heavy": 1.2,
-        "Unknown": 0.3
-    }
-
-    sweat_adj = (
-        df["Sweating Level (Last 4 Hours)"]
-        .map(sweat_map)
-        .fillna(0.3)
-    )
+    rules = WATER_RULES
+
+    activity_rule = rules["activity"]
+    activity = _lookup(df, activity_rule["column"], activity_rule["factors"], activity_rule["default"])
+
+    heat = rules["heat"]
+    temp_adj = np.maximum(
+        0, (_numeric(df, heat["column"]) - heat["above"]) / heat["per_degrees"]
+    ) * heat["litres"]
+
+    exercise = rules["exercise"]
+    minutes = _numeric(df, exercise["column"])
+    exercise_adj = np.where(np.isnan(minutes), exercise["missing"], minutes) * exercise["litres_per_minute"]
 
-    water = base * activity + temp_adj + exercise_adj + sweat_adj
-    return water.clip(0.2, 3.0).round(2)
+    sweat_rule = rules["sweat"]
+    sweat_adj = _lookup(df, sweat_rule["column"], sweat_rule["litres"], sweat_rule["default"])
+
+    water = _base_water(df) * activity + temp_adj + exercise_adj + sweat_adj
+    low, high = rules["clip"]
+    return pd.Series(np.round(np.clip(water, low, high), rules["decimals"]), index=df.index)
 
 
 # ======================================================
 # HYDRATION RISK (STANDARDIZED LABELS)
 # ======================================================
 def assess_hydration_risk(df: pd.DataFrame) -> pd.Series:
-    risks = []
-
-    for _, r in df.iterrows():
-        score = 0
-
-        if r["Urine Color (Most Recent Urination)"] >= 6:
-            score += 3
-
-        symptoms = sum([
-            str(r.get("Thirsty (Right Now)", "No")).lower() == "yes",
-            str(r.get("Dizziness (Right Now)", "No")).lower() == "yes",
-            str(r.get("Fatigue / Tiredness (Right Now)", "No")).lower() == "yes",
-            str(r.get("Headache (Right Now)", "No")).lower() == "yes"
-        ])
-        score += symptoms * 2
-
-        if str(r.get("Urinated (Last 4 Hours)", "Yes")).lower() == "no":
-            score += 2
-
-        expected = (r["Weight"] * 0.03) / 6
-        ratio = r["Water_Intake_Last_4_Hours"] / expected if expected > 0 else 1
-
-        if ratio < 0.5:
-            score += 3
-        elif ratio < 0.8:
-            score += 1
-
-        if r["Temperature_C"] > 30:
-            score += 1
-
-        if score >= 8:
-            risks.append("High")
-        elif score >= 5:
-            risks.append("Moderate")
-        elif score >= 3:
-            risks.append("Low")
-        else:
-            risks.append("Very Low")
-
-    return pd.Series(risks, index=df.index)
+    return _assess_compiled(df)
 
 
 # ======================================================
 # LOAD PIPELINE
 # ======================================================
-def load_data() -> pd.DataFrame:
-    if not DATA_PATH.exists():
-        raise FileNotFoundError(DATA_PATH)
+def build_labeled_dataset(source: Path = DATA_PATH) -> pd.DataFrame:
+    if not source.exists():
+        raise FileNotFoundError(source)
 
-    df = pd.read_csv(DATA_PATH)
+    df = pd.read_csv(source)
     df = clean_and_prepare_data(df)
-    df = calculate_targets(df)
+    return calculate_targets(df)
+
+
+def iter_labeled_chunks(source: Path = DATA_PATH,
+                        chunk_rows: Optional[int] = DATASET_CHUNK_ROWS) -> Iterator[pd.DataFrame]:
+    """
+    Yield cleaned + labeled frames of at most ``chunk_rows`` source rows.
+    Cleaning and labeling are row-local, so the chunks concatenate to the
+    same rows and index as build_labeled_dataset().
+    """
+    if not source.exists():
+        raise FileNotFoundError(source)
+    if chunk_rows is None:
+        yield build_labeled_dataset(source)
+        return
+
+    # Text columns are read as str in every chunk, as pandas infers them
+    # for the whole file (a chunk of numbers-only answers stays text)
+    head = pd.read_csv(source, nrows=chunk_rows)
+    text_cols = {col: str for col in head.columns if head[col].dtype == object}
+    del head
+
+    for chunk in pd.read_csv(source, chunksize=chunk_rows, dtype=text_cols):
+        yield calculate_targets(clean_and_prepare_data(chunk))
+
+
+def labeling_fingerprint(source: Path = DATA_PATH) -> str:
+    # Editing the rule tables relabels the store, like editing dataset.csv
+    from tabular_store import source_fingerprint
+    rules = (WATER_RULES, RISK_RULES, RISK_LEVELS, RISK_DEFAULT_LEVEL, TIME_SLOT_MAPPING)
+    return source_fingerprint(source, rules)
+
+
+def load_data(columns: Optional[List[str]] = None,
+              dataset_format: str = DATASET_FORMAT) -> pd.DataFrame:
+    """
+    Cleaned + labeled dataset, optionally only ``columns``.
+
+    "parquet" reads the columnar store (text columns as categoricals) and
+    only re-parses dataset.csv, chunk by chunk, when it or the labeling
+    rules changed;
+    "csv" rebuilds from dataset.csv and rewrites labeled_dataset.csv.
+    """
+    if dataset_format == "parquet":
+        try:
+            from tabular_store import load_labeled_dataset
+        except ImportError:
+            LOG.warning("pyarrow is not installed; loading the dataset from CSV")
+        else:
+            return load_labeled_dataset(iter_labeled_chunks, labeling_fingerprint(), columns)
+    elif dataset_format != "csv":
+        raise ValueError(f"Unknown dataset format: {dataset_format}")
 
-    output = Path(DATA_DIR) / "labeled_dataset.csv"
-    df.to_csv(output, index=False)
+    df = build_labeled_dataset()
+    df.to_csv(LABELED_CSV_PATH, index=False)
 
     LOG.info("Labeled dataset saved successfully")
-    return df
+    return df if columns is None else df[columns]
 
 
 # ======================================================
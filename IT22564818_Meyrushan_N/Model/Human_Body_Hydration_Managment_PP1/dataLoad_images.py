@@ -1,32 +1,127 @@
+import hashlib
+import json
+import os
+
+import numpy as np
 from torchvision import datasets
-from torch.utils.data import DataLoader, random_split
-from config import DATA_DIR, BATCH_SIZE
-from preprocess_images import get_transforms
+from torch.utils.data import DataLoader, Subset
+from config import DATA_DIR, RANDOM_STATE
+from config_images import (
+    BATCH_SIZE,
+    LIP_USE_IMAGE_STORE,
+    LIP_AUGMENT_MODE,
+    LIP_SPLIT_MANIFEST,
+    LIP_TEST_FRACTION,
+    LIP_NUM_WORKERS,
+    LIP_PREFETCH_FACTOR,
+    LIP_PERSISTENT_WORKERS,
+    LIP_PIN_MEMORY
+)
+from preprocess_images import (
+    get_transforms,
+    get_tensor_transforms,
+    get_batch_sample_transform,
+    AugmentingCollate
+)
 
 
-def load_data_images():
-    train_transform = get_transforms(train=True)
-    test_transform = get_transforms(train=False)
+# ======================================================
+# PERSISTED, DETERMINISTIC TRAIN/TEST SPLIT
+# ======================================================
+def _hash_fraction(rel_path: str) -> float:
+    digest = hashlib.sha256(f"{RANDOM_STATE}:{rel_path}".encode()).digest()
+    return int.from_bytes(digest[:8], "big") / 2 ** 64
 
-    full_dataset = datasets.ImageFolder(DATA_DIR, transform=train_transform)
-    class_names = full_dataset.classes
 
-    train_size = int(0.8 * len(full_dataset))
-    test_size = len(full_dataset) - train_size
+def load_split(rel_paths, manifest_path=LIP_SPLIT_MANIFEST, test_fraction=LIP_TEST_FRACTION):
+    """
+    Return {rel_path: "train" | "test"} for every image.
 
-    train_dataset, test_dataset = random_split(
-        full_dataset, [train_size, test_size]
-    )
+    The first call shuffles with RANDOM_STATE and holds out
+    ``test_fraction``. Later calls keep every recorded assignment; new
+    images are placed by a hash of their path, so adding images never
+    moves an existing one across the split.
+    """
+    split = {}
+    if manifest_path.exists():
+        with open(manifest_path) as f:
+            split = json.load(f)["assignments"]
+
+    current = set(rel_paths)
+    split = {p: s for p, s in split.items() if p in current}
+    new = [p for p in rel_paths if p not in split]
+
+    if not split:
+        order = np.random.default_rng(RANDOM_STATE).permutation(len(new))
+        n_train = int((1 - test_fraction) * len(new))
+        for rank, i in enumerate(order):
+            split[new[i]] = "train" if rank < n_train else "test"
+    else:
+        for p in new:
+            split[p] = "test" if _hash_fraction(p) < test_fraction else "train"
+
+    manifest_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = manifest_path.with_suffix(".tmp")
+    with open(tmp, "w") as f:
+        json.dump({"seed": RANDOM_STATE, "test_fraction": test_fraction,
+                   "assignments": dict(sorted(split.items()))}, f, indent=1)
+    os.replace(tmp, manifest_path)
+
+    return split
+
+
+# ======================================================
+# DATASETS + LOADERS
+# ======================================================
+def build_image_dataset(train: bool, augment_mode: str = LIP_AUGMENT_MODE):
+    # Batch mode: training items stay uint8 and AugmentingCollate augments
+    batched = train and augment_mode == "batch"
+    if LIP_USE_IMAGE_STORE:
+        # Decode + resize once; epochs read memory-mapped uint8 shards
+        from lip_image_store import ShardedImageDataset
+        transform = get_batch_sample_transform(store=True) if batched else get_tensor_transforms(train=train)
+        return ShardedImageDataset(transform=transform)
+    transform = get_batch_sample_transform(store=False) if batched else get_transforms(train=train)
+    return datasets.ImageFolder(DATA_DIR, transform=transform)
+
+
+def loader_kwargs(num_workers=LIP_NUM_WORKERS):
+    kwargs = {"batch_size": BATCH_SIZE, "num_workers": num_workers, "pin_memory": LIP_PIN_MEMORY}
+    if num_workers > 0:
+        kwargs["prefetch_factor"] = LIP_PREFETCH_FACTOR
+        kwargs["persistent_workers"] = LIP_PERSISTENT_WORKERS
+    return kwargs
+
+
+def load_data_images(num_workers=LIP_NUM_WORKERS, augment_mode=LIP_AUGMENT_MODE):
+    if augment_mode not in ("batch", "sample"):
+        raise ValueError(f"Unknown augment mode: {augment_mode}")
+
+    if LIP_USE_IMAGE_STORE:
+        from lip_image_store import ingest_images
+        ingest_images()
+
+    # Two independent views, so the test transform never leaks into training
+    train_view = build_image_dataset(train=True, augment_mode=augment_mode)
+    test_view = build_image_dataset(train=False)
+    class_names = train_view.classes
+
+    rel_paths = [os.path.relpath(path, DATA_DIR) for path, _ in train_view.samples]
+    split = load_split(rel_paths)
+
+    train_idx = [i for i, p in enumerate(rel_paths) if split[p] == "train"]
+    test_idx = [i for i, p in enumerate(rel_paths) if split[p] == "test"]
 
-    # IMPORTANT: apply test transform
-    test_dataset.dataset.transform = test_transform
+    train_dataset = Subset(train_view, train_idx)
+    test_dataset = Subset(test_view, test_idx)
 
+    collate_fn = AugmentingCollate() if augment_mode == "batch" else None
     train_loader = DataLoader(
-        train_dataset, batch_size=BATCH_SIZE, shuffle=True
+        train_dataset, shuffle=True, collate_fn=collate_fn, **loader_kwargs(num_workers)
     )
 
     test_loader = DataLoader(
-        test_dataset, batch_size=BATCH_SIZE, shuffle=False
+        test_dataset, shuffle=False, **loader_kwargs(num_workers)
     )
 
     return train_loader, test_loader, class_names, train_dataset
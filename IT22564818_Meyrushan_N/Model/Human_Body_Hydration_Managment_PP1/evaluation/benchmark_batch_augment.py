@@ -0,0 +1,80 @@
+import argparse
+import json
+import time
+from pathlib import Path
+
+import torch
+
+from dataLoad_images import load_data_images
+
+# ======================================================
+# Paths
+# ======================================================
+RESULT_DIR = Path("results")
+RESULT_DIR.mkdir(exist_ok=True)
+
+
+def epoch_cost(loader, epochs):
+    """Seconds per epoch to produce augmented batches, plus output statistics."""
+    start = time.perf_counter()
+    total = torch.zeros(3, dtype=torch.float64)
+    total_sq = torch.zeros(3, dtype=torch.float64)
+    pixels = 0
+    for _ in range(epochs):
+        for images, _ in loader:
+            x = images.double()
+            total += x.sum(dim=(0, 2, 3))
+            total_sq += (x ** 2).sum(dim=(0, 2, 3))
+            pixels += x.shape[0] * x.shape[2] * x.shape[3]
+    elapsed = time.perf_counter() - start
+
+    mean = total / pixels
+    return {
+        "epoch_s": elapsed / epochs,
+        "channel_mean": mean.tolist(),
+        "channel_std": (total_sq / pixels - mean ** 2).sqrt().tolist()
+    }
+
+
+# ======================================================
+# Main
+# ======================================================
+def main():
+    parser = argparse.ArgumentParser(description="Per-sample vs batched lip augmentation")
+    parser.add_argument("--epochs", type=int, default=3)
+    args = parser.parse_args()
+
+    results = {"threads": torch.get_num_threads(), "epochs": args.epochs}
+
+    # In-process loading so the timing is the augmentation work itself
+    for mode in ["sample", "batch"]:
+        torch.manual_seed(0)
+        train_loader, _, _, _ = load_data_images(num_workers=0, augment_mode=mode)
+        epoch_cost(train_loader, 1)
+        results[mode] = epoch_cost(train_loader, args.epochs)
+
+    sample, batch = results["sample"], results["batch"]
+    results["speedup"] = sample["epoch_s"] / batch["epoch_s"]
+    results["max_channel_mean_diff"] = max(
+        abs(a - b) for a, b in zip(sample["channel_mean"], batch["channel_mean"])
+    )
+
+    print("\n" + "=" * 60)
+    print(" LIP AUGMENTATION BENCHMARK ".center(60))
+    print("=" * 60)
+    for mode in ["sample", "batch"]:
+        r = results[mode]
+        print(f"{mode:6s}: {r['epoch_s']:.3f} s/epoch | "
+              f"mean {[round(m, 3) for m in r['channel_mean']]} | "
+              f"std {[round(s, 3) for s in r['channel_std']]}")
+    print(f"Speedup          : {results['speedup']:.1f}x")
+    print(f"Channel mean diff: {results['max_channel_mean_diff']:.4f}")
+
+    output_path = RESULT_DIR / "batch_augment_benchmark.json"
+    with open(output_path, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"Results saved to: {output_path}")
+
+
+if __name__ == "__main__":
+    main()
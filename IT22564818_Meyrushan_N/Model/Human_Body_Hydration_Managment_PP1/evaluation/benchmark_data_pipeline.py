@@ -0,0 +1,94 @@
+import argparse
+import json
+import time
+from pathlib import Path
+
+import torch
+import torch.nn as nn
+import torch.optim as optim
+
+from config_images import DEVICE, LR, LIP_NUM_WORKERS
+from dataLoad_images import load_data_images
+from Train_Images import build_training_model
+
+# ======================================================
+# Paths
+# ======================================================
+RESULT_DIR = Path("results")
+RESULT_DIR.mkdir(exist_ok=True)
+
+
+def profile_epochs(model, loader, epochs):
+    """Split wall time into waiting for the next batch vs the training step."""
+    criterion = nn.CrossEntropyLoss()
+    optimizer = optim.Adam(model.fc.parameters(), lr=LR)
+    model.train()
+
+    wait_s = step_s = 0.0
+    images = 0
+    for _ in range(epochs):
+        it = iter(loader)
+        while True:
+            start = time.perf_counter()
+            try:
+                x, y = next(it)
+            except StopIteration:
+                break
+            fetched = time.perf_counter()
+
+            x, y = x.to(DEVICE, non_blocking=True), y.to(DEVICE, non_blocking=True)
+            optimizer.zero_grad()
+            loss = criterion(model(x), y)
+            loss.backward()
+            optimizer.step()
+
+            wait_s += fetched - start
+            step_s += time.perf_counter() - fetched
+            images += x.shape[0]
+
+    total = wait_s + step_s
+    return {
+        "images": images,
+        "wait_s": wait_s,
+        "step_s": step_s,
+        "input_bound_fraction": wait_s / total,
+        "images_per_s": images / total
+    }
+
+
+# ======================================================
+# Main
+# ======================================================
+def main():
+    parser = argparse.ArgumentParser(description="Lip training data-pipeline throughput")
+    parser.add_argument("--epochs", type=int, default=2)
+    parser.add_argument("--workers", type=int, nargs="+",
+                        default=sorted({0, LIP_NUM_WORKERS}))
+    args = parser.parse_args()
+
+    model = build_training_model(["Dehydrate", "Normal"], pretrained=False)
+
+    results = {"threads": torch.get_num_threads(), "runs": {}}
+    print("\n" + "=" * 72)
+    print(" LIP DATA PIPELINE BENCHMARK ".center(72))
+    print("=" * 72)
+
+    for workers in args.workers:
+        train_loader, _, _, _ = load_data_images(num_workers=workers)
+        # Warm-up epoch starts (persistent) workers and fills the page cache
+        profile_epochs(model, train_loader, 1)
+        r = profile_epochs(model, train_loader, args.epochs)
+        results["runs"][f"workers_{workers}"] = r
+        print(
+            f"workers={workers}: {r['images_per_s']:7.1f} img/s | "
+            f"waiting on data {r['input_bound_fraction'] * 100:5.1f}% of wall time"
+        )
+
+    output_path = RESULT_DIR / "data_pipeline_benchmark.json"
+    with open(output_path, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"Results saved to: {output_path}")
+
+
+if __name__ == "__main__":
+    main()
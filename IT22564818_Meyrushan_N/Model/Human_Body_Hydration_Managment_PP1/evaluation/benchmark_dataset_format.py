@@ -0,0 +1,106 @@
+import argparse
+import json
+import multiprocessing
+import shutil
+import tempfile
+import time
+from pathlib import Path
+
+import pandas as pd
+
+from config import DATA_PATH
+from dataLoad import build_labeled_dataset, iter_labeled_chunks, labeling_fingerprint
+from tabular_store import load_labeled_dataset
+from utils import proc_status_mb, reset_peak_rss
+
+# ======================================================
+# Paths
+# ======================================================
+RESULT_DIR = Path("results")
+RESULT_DIR.mkdir(exist_ok=True)
+
+PROJECTED_COLS = [
+    "Weight",
+    "Water_Intake_Last_4_Hours",
+    "Physical_Activity_Level",
+    "Hydration_Risk_Level"
+]
+
+
+def _run_scenario(name, source, csv_out, parquet_out):
+    # Fresh process per scenario: peak RSS is reset after imports
+    peak_reset = reset_peak_rss()
+    baseline = proc_status_mb("VmRSS")
+    start = time.perf_counter()
+
+    fingerprint = labeling_fingerprint(source)
+    if name == "csv":
+        df = build_labeled_dataset(source)
+        df.to_csv(csv_out, index=False)
+    else:
+        df = load_labeled_dataset(
+            lambda: iter_labeled_chunks(source), fingerprint,
+            columns=PROJECTED_COLS if name == "parquet_projected" else None,
+            path=parquet_out,
+            compact=name == "parquet_compact"
+        )
+
+    elapsed = time.perf_counter() - start
+    peak = proc_status_mb("VmHWM")
+    return {
+        "load_s": elapsed,
+        "peak_rss_mb": None if not peak_reset or peak is None else peak - baseline,
+        "frame_mb": df.memory_usage(deep=True).sum() / 1024 ** 2,
+        "columns": df.shape[1]
+    }
+
+
+# ======================================================
+# Main
+# ======================================================
+def main():
+    parser = argparse.ArgumentParser(description="CSV vs Parquet labeled dataset loading")
+    parser.add_argument("--scale", type=int, default=200,
+                        help="Replicate dataset.csv this many times")
+    args = parser.parse_args()
+
+    work = Path(tempfile.mkdtemp(prefix="hydration_dataset_"))
+    try:
+        source = work / "dataset.csv"
+        raw = pd.read_csv(DATA_PATH)
+        pd.concat([raw] * args.scale, ignore_index=True).to_csv(source, index=False)
+        csv_out = work / "labeled_dataset.csv"
+        parquet_out = work / "labeled_dataset.parquet"
+
+        ctx = multiprocessing.get_context("spawn")
+        results = {"rows": len(raw) * args.scale, "runs": {}}
+        # parquet_cold builds the store; the later runs only read it
+        for name in ["csv", "parquet_cold", "parquet_warm", "parquet_compact", "parquet_projected"]:
+            with ctx.Pool(1) as pool:
+                results["runs"][name] = pool.apply(
+                    _run_scenario, (name, source, csv_out, parquet_out)
+                )
+
+        results["csv_file_mb"] = csv_out.stat().st_size / 1024 ** 2
+        results["parquet_file_mb"] = parquet_out.stat().st_size / 1024 ** 2
+    finally:
+        shutil.rmtree(work, ignore_errors=True)
+
+    print("\n" + "=" * 78)
+    print(" LABELED DATASET FORMAT BENCHMARK ".center(78))
+    print("=" * 78)
+    print(f"Rows: {results['rows']:,} | labeled CSV {results['csv_file_mb']:.1f} MB | "
+          f"Parquet {results['parquet_file_mb']:.1f} MB")
+    for name, r in results["runs"].items():
+        peak = "n/a" if r["peak_rss_mb"] is None else f"{r['peak_rss_mb']:8.1f} MB"
+        print(f"{name:18s}: {r['load_s']:7.2f} s | peak RSS +{peak} | "
+              f"frame {r['frame_mb']:7.1f} MB ({r['columns']} cols)")
+
+    output_path = RESULT_DIR / "dataset_format_benchmark.json"
+    with open(output_path, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"Results saved to: {output_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+from config import TIME_SLOT_MAPPING
+from predict import AdvancedPredictor
+from weather import aggregate_forecast
+
+# ======================================================
+# Paths
+# ======================================================
+RESULT_DIR = Path("results")
+RESULT_DIR.mkdir(exist_ok=True)
+
+SAMPLE_INPUT = {
+    "Age": 26, "Gender": "Male", "Weight": 61, "Height": 161,
+    "Water_Intake_Last_4_Hours": 0.5,
+    "Exercise Time (minutes) in Last 4 Hours": 30,
+    "Physical_Activity_Level": "Moderate",
+    "Urinated (Last 4 Hours)": "Yes",
+    "Urine Color (Most Recent Urination)": 5,
+    "Thirsty (Right Now)": "Yes",
+    "Dizziness (Right Now)": "No",
+    "Fatigue / Tiredness (Right Now)": "No",
+    "Headache (Right Now)": "No",
+    "Sweating Level (Last 4 Hours)": "Heavy"
+}
+
+
+def synthetic_forecast():
+    # Diurnal curve: coolest before dawn, hottest mid-afternoon
+    hours = np.arange(24)
+    temps = 27 + 5 * np.sin((hours - 9) / 24 * 2 * np.pi)
+    hums = 80 - 15 * np.sin((hours - 9) / 24 * 2 * np.pi)
+    return {
+        "time": [f"2026-01-01T{h:02d}:00" for h in hours],
+        "temperature_2m": temps.round(1).tolist(),
+        "relative_humidity_2m": hums.round(1).tolist()
+    }
+
+
+def timed(fn, repeats):
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return float(np.median(times)) * 1000
+
+
+# ======================================================
+# Main
+# ======================================================
+def main():
+    parser = argparse.ArgumentParser(description="Day plan vs six single predictions")
+    parser.add_argument("--repeats", type=int, default=200)
+    args = parser.parse_args()
+
+    predictor = AdvancedPredictor()
+    predictor.load_models()
+
+    slot_weather = aggregate_forecast(synthetic_forecast())
+    slots = sorted(TIME_SLOT_MAPPING, key=TIME_SLOT_MAPPING.get)
+    singles = [
+        {**SAMPLE_INPUT, "Temperature_C": t, "Humidity_%": h,
+         "Time Slot (Select Your Current 4-Hour Window)": slot}
+        for slot, (t, h) in zip(slots, slot_weather)
+    ]
+
+    # Parity: each window must match a standalone prediction
+    plan = predictor.predict_day(SAMPLE_INPUT, slot_weather)
+    mismatches = 0
+    for row, single in zip(plan.to_dict(orient="records"), singles):
+        expected = predictor.predict_uncached(single)
+        hp = expected["hydration_prediction"]
+        if (row["recommended_water_liters_next_4h"] != hp["recommended_water_liters_next_4h"]
+                or row["hydration_risk_level"] != hp["hydration_risk_level"]
+                or row["recommendations"] != expected["recommendations"]
+                or any(row[k] != v for k, v in expected["disease_risk_profile"].items())):
+            mismatches += 1
+
+    results = {
+        "windows": len(plan),
+        "mismatches": mismatches,
+        "single_predict_ms": timed(lambda: predictor.predict_uncached(singles[0]), args.repeats),
+        "six_predicts_ms": timed(lambda: [predictor.predict_uncached(s) for s in singles], args.repeats),
+        "predict_day_ms": timed(lambda: predictor.predict_day(SAMPLE_INPUT, slot_weather), args.repeats)
+    }
+
+    print("\n" + "=" * 60)
+    print(" DAY PLAN BENCHMARK ".center(60))
+    print("=" * 60)
+    print(plan[["time_window", "temperature_celsius", "humidity_percent",
+                "recommended_water_liters_next_4h", "hydration_risk_level"]].to_string(index=False))
+    print(f"\nParity mismatches : {mismatches}")
+    print(f"Single predict    : {results['single_predict_ms']:8.3f} ms")
+    print(f"6 x predict       : {results['six_predicts_ms']:8.3f} ms")
+    print(f"predict_day       : {results['predict_day_ms']:8.3f} ms")
+
+    output_path = RESULT_DIR / "day_plan_benchmark.json"
+    with open(output_path, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"Results saved to: {output_path}")
+
+    if mismatches:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
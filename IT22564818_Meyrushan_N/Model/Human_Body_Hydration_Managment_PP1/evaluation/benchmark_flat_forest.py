@@ -0,0 +1,94 @@
+import json
+import time
+from pathlib import Path
+
+from config import MODEL_REG_PATH, MODEL_CLF_PATH, PREPROCESSOR_PATH
+from utils import load_pickle
+from dataLoad import load_data
+from preprocess import prepare_data
+from flat_forest import compile_model, verify_flat_forest
+
+# ======================================================
+# Paths
+# ======================================================
+RESULT_DIR = Path("results")
+RESULT_DIR.mkdir(exist_ok=True)
+
+BATCH_SIZES = [1, 8, 64]
+
+
+def time_call(fn, X, min_time_s=1.0, min_repeats=10):
+    # Repeat until enough wall time is collected for a stable mean
+    fn(X)
+    repeats, start = 0, time.perf_counter()
+    while repeats < min_repeats or time.perf_counter() - start < min_time_s:
+        fn(X)
+        repeats += 1
+    return (time.perf_counter() - start) / repeats * 1000
+
+
+# ======================================================
+# Main benchmark
+# ======================================================
+def main():
+    print("\n" + "=" * 72)
+    print(" FLAT FOREST EVALUATOR BENCHMARK ".center(72))
+    print("=" * 72)
+
+    regressor = load_pickle(MODEL_REG_PATH)
+    classifier = load_pickle(MODEL_CLF_PATH)
+    preprocessor = load_pickle(PREPROCESSOR_PATH)
+
+    df = load_data()
+    _, X_test, *_ = prepare_data(df)
+    X = preprocessor.transform(X_test)
+
+    results = {}
+
+    for name, model in [("regressor", regressor), ("classifier", classifier)]:
+        start = time.perf_counter()
+        flat = compile_model(model)
+        compile_ms = (time.perf_counter() - start) * 1000
+
+        # Raises if any prediction is not bit-identical
+        verify_flat_forest(model, flat, X)
+
+        timings = {}
+        for n in BATCH_SIZES:
+            batch = X[:n]
+            sk_ms = time_call(model.predict, batch)
+            flat_ms = time_call(flat.predict, batch)
+            timings[f"batch_{n}"] = {
+                "sklearn_ms": sk_ms,
+                "flat_ms": flat_ms,
+                "speedup": sk_ms / flat_ms
+            }
+
+        results[name] = {
+            "trees": flat.n_trees,
+            "nodes": int(len(flat.feature)),
+            "max_depth": flat.max_depth,
+            "compile_ms": compile_ms,
+            "bit_identical_rows": int(len(X)),
+            "latency": timings
+        }
+
+        print(f"\n--- {name.title()} ({flat.n_trees} trees, {len(flat.feature)} nodes) ---")
+        print(f"Parity    : bit-identical on {len(X)} test rows")
+        for key, t in timings.items():
+            print(
+                f"{key:9} : sklearn {t['sklearn_ms']:8.3f} ms | "
+                f"flat {t['flat_ms']:7.3f} ms | x{t['speedup']:.1f}"
+            )
+
+    output_path = RESULT_DIR / "flat_forest_benchmark.json"
+    with open(output_path, "w") as f:
+        json.dump(results, f, indent=2)
+
+    print("\n" + "=" * 72)
+    print(f" Results saved to: {output_path}".center(72))
+    print("=" * 72)
+
+
+if __name__ == "__main__":
+    main()
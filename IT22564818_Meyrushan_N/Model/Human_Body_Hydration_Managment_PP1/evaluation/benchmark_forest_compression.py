@@ -0,0 +1,115 @@
+import argparse
+import json
+import multiprocessing
+import time
+from pathlib import Path
+
+import numpy as np
+
+from config import BUNDLE_DIR, COMPACT_BUNDLE_DIR, COMPRESSION_REPORT_PATH, TARGET_COLS
+from dataLoad import load_data
+from predict import AdvancedPredictor, RAW_REQUIRED_FIELDS
+from utils import proc_status_mb, reset_peak_rss
+
+# ======================================================
+# Paths
+# ======================================================
+RESULT_DIR = Path("results")
+RESULT_DIR.mkdir(exist_ok=True)
+
+
+def _load_and_serve(compact, inputs, repeats):
+    # Fresh process per variant: RSS and peak are measured from here on
+    peak_reset = reset_peak_rss()
+    baseline = proc_status_mb("VmRSS")
+
+    start = time.perf_counter()
+    predictor = AdvancedPredictor(compact=compact)
+    predictor.load_models()
+    load_s = time.perf_counter() - start
+
+    X = np.vstack([predictor.preprocess_input(row) for row in inputs])
+    trees = predictor.regressor_engine.n_trees + predictor.classifier_engine.n_trees
+
+    # Single rows go through the flat engines, as predict() serves them
+    timings = np.empty(repeats)
+    for i in range(repeats):
+        row = X[i % len(X)][np.newaxis, :]
+        t0 = time.perf_counter()
+        predictor.regressor_engine.predict(row)
+        predictor.classifier_engine.predict(row)
+        timings[i] = time.perf_counter() - t0
+    loaded = proc_status_mb("VmRSS")
+
+    # Large batches use the sklearn models (loaded lazily on first batch)
+    regressor, classifier = predictor.batch_models(len(X))
+    regressor.predict(X)
+    start = time.perf_counter()
+    regressor.predict(X)
+    classifier.predict(X)
+    batch_s = time.perf_counter() - start
+
+    peak = proc_status_mb("VmHWM")
+    return {
+        "trees": trees,
+        "load_s": load_s,
+        "rss_after_load_mb": None if loaded is None or baseline is None else loaded - baseline,
+        "peak_rss_mb": None if not peak_reset or peak is None else peak - baseline,
+        "single_row_ms": float(np.median(timings) * 1000),
+        "batch_us_per_row": batch_s / len(X) * 1e6
+    }
+
+
+# ======================================================
+# Main
+# ======================================================
+def main():
+    parser = argparse.ArgumentParser(description="Full vs compressed forests at serving time")
+    parser.add_argument("--repeats", type=int, default=1000)
+    args = parser.parse_args()
+
+    if not COMPRESSION_REPORT_PATH.exists():
+        raise FileNotFoundError(f"{COMPRESSION_REPORT_PATH} missing; run forest_compression.py first")
+    with open(COMPRESSION_REPORT_PATH) as f:
+        report = json.load(f)
+
+    df = load_data().drop(columns=TARGET_COLS, errors="ignore")
+    inputs = df.dropna(subset=RAW_REQUIRED_FIELDS).to_dict("records")
+
+    ctx = multiprocessing.get_context("spawn")
+    results = {"runs": {}}
+    for name, compact, bundle_dir in [("full", False, BUNDLE_DIR), ("compact", True, COMPACT_BUNDLE_DIR)]:
+        with ctx.Pool(1) as pool:
+            run = pool.apply(_load_and_serve, (compact, inputs, args.repeats))
+        run["bundle_mb"] = sum(p.stat().st_size for p in bundle_dir.rglob("*.npy")) / 1024 ** 2
+        results["runs"][name] = run
+
+    results["test_metrics"] = {
+        "regressor_r2": {k: report["regressor"]["test"][k]["r2"] for k in ["full", "compact"]},
+        "classifier_accuracy": {k: report["classifier"]["test"][k]["accuracy"] for k in ["full", "compact"]}
+    }
+    results["chosen"] = {role: report[role]["chosen"] for role in ["regressor", "classifier"]}
+
+    print("\n" + "=" * 78)
+    print(" FOREST COMPRESSION BENCHMARK ".center(78))
+    print("=" * 78)
+    print(f"Chosen: {results['chosen']}")
+    for name, r in results["runs"].items():
+        rss, peak = (
+            "n/a" if v is None else f"+{v:6.1f}" for v in [r["rss_after_load_mb"], r["peak_rss_mb"]]
+        )
+        print(f"{name:8s}: {r['trees']:4d} trees | bundle {r['bundle_mb']:6.2f} MB | "
+              f"load {r['load_s'] * 1000:7.1f} ms | RSS {rss} MB "
+              f"(peak {peak}) | 1 row {r['single_row_ms']:.3f} ms | "
+              f"batch {r['batch_us_per_row']:.2f} us/row")
+    for metric, values in results["test_metrics"].items():
+        print(f"{metric:20s}: full {values['full']:.4f} | compact {values['compact']:.4f}")
+
+    output_path = RESULT_DIR / "forest_compression_benchmark.json"
+    with open(output_path, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"Results saved to: {output_path}")
+
+
+if __name__ == "__main__":
+    main()
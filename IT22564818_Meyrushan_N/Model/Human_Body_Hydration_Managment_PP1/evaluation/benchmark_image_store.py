@@ -0,0 +1,92 @@
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+from torch.utils.data import DataLoader
+from torchvision import datasets
+
+from config import DATA_DIR
+from config_images import BATCH_SIZE
+from preprocess_images import get_transforms, get_tensor_transforms
+from lip_image_store import ingest_images, ShardedImageDataset
+
+# ======================================================
+# Paths
+# ======================================================
+RESULT_DIR = Path("results")
+RESULT_DIR.mkdir(exist_ok=True)
+
+
+def images_per_s(dataset, epochs):
+    loader = DataLoader(dataset, batch_size=BATCH_SIZE, shuffle=True)
+    start = time.perf_counter()
+    seen = 0
+    for _ in range(epochs):
+        for images, _ in loader:
+            seen += images.shape[0]
+    return seen / (time.perf_counter() - start)
+
+
+# ======================================================
+# Main
+# ======================================================
+def main():
+    parser = argparse.ArgumentParser(description="ImageFolder vs sharded uint8 store")
+    parser.add_argument("--epochs", type=int, default=3)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    ingest_images()
+    ingest_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    ingest_images()
+    incremental_s = time.perf_counter() - start
+
+    # Eval view must be identical: same PIL resize, same /255 + normalize
+    folder_eval = datasets.ImageFolder(DATA_DIR, transform=get_transforms(train=False))
+    store_eval = ShardedImageDataset(transform=get_tensor_transforms(train=False))
+    max_diff = max(
+        (folder_eval[i][0] - store_eval[i][0]).abs().max().item()
+        for i in range(len(folder_eval))
+    )
+
+    results = {
+        "images": len(store_eval),
+        "ingest_s": ingest_s,
+        "incremental_noop_s": incremental_s,
+        "eval_max_abs_diff": max_diff,
+        "imagefolder_train_img_per_s": images_per_s(
+            datasets.ImageFolder(DATA_DIR, transform=get_transforms(train=True)), args.epochs),
+        "store_train_img_per_s": images_per_s(
+            ShardedImageDataset(transform=get_tensor_transforms(train=True)), args.epochs),
+        "imagefolder_eval_img_per_s": images_per_s(folder_eval, args.epochs),
+        "store_eval_img_per_s": images_per_s(store_eval, args.epochs)
+    }
+
+    print("\n" + "=" * 60)
+    print(" LIP IMAGE STORE BENCHMARK ".center(60))
+    print("=" * 60)
+    print(f"Images            : {results['images']}")
+    print(f"Ingest (current)  : {ingest_s:.2f} s | no-op re-ingest {incremental_s:.3f} s")
+    print(f"Eval parity       : max abs diff {max_diff:.2e}")
+    for split in ["train", "eval"]:
+        folder = results[f"imagefolder_{split}_img_per_s"]
+        store = results[f"store_{split}_img_per_s"]
+        print(f"{split:5s} img/s       : ImageFolder {folder:8.1f} | store {store:8.1f} "
+              f"({store / folder:.1f}x)")
+
+    output_path = RESULT_DIR / "image_store_benchmark.json"
+    with open(output_path, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"Results saved to: {output_path}")
+
+    if max_diff > 1e-6:
+        print("FAILED: store eval tensors differ from ImageFolder")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+import argparse
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import numpy as np
+
+# ======================================================
+# Paths
+# ======================================================
+BASE_DIR = Path(__file__).resolve().parent.parent
+RESULT_DIR = Path("results")
+RESULT_DIR.mkdir(exist_ok=True)
+
+# Libraries that must never load on the form-prediction path
+FORBIDDEN_MODULES = ["torch", "torchvision", "matplotlib", "requests"]
+
+# Cold start: import + model load, in a fresh interpreter
+PROBE = f"""
+import json, sys, time
+start = time.perf_counter()
+import predict
+imported = time.perf_counter()
+predictor = predict.AdvancedPredictor()
+predictor.load_models()
+loaded = time.perf_counter()
+print(json.dumps({{
+    "import_s": imported - start,
+    "load_s": loaded - imported,
+    "total_s": loaded - start,
+    "forbidden_loaded": [m for m in {FORBIDDEN_MODULES!r} if m in sys.modules]
+}}))
+"""
+
+
+def run_probe():
+    out = subprocess.run(
+        [sys.executable, "-c", PROBE],
+        cwd=BASE_DIR, capture_output=True, text=True, check=True
+    )
+    # setup_logging also prints to stdout; the JSON is the last line
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+# ======================================================
+# Main
+# ======================================================
+def main():
+    parser = argparse.ArgumentParser(description="Cold-start guard for tabular prediction")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget-s", type=float, default=3.0,
+                        help="Fail if median cold start exceeds this")
+    args = parser.parse_args()
+
+    runs = [run_probe() for _ in range(args.runs)]
+
+    results = {
+        key: float(np.median([r[key] for r in runs]))
+        for key in ["import_s", "load_s", "total_s"]
+    }
+    results["runs"] = args.runs
+    results["budget_s"] = args.budget_s
+    results["forbidden_loaded"] = sorted({m for r in runs for m in r["forbidden_loaded"]})
+
+    print("\n" + "=" * 60)
+    print(" FORM PREDICTION COLD-START BENCHMARK ".center(60))
+    print("=" * 60)
+    print(f"Import predict : {results['import_s'] * 1000:8.1f} ms (median)")
+    print(f"Load models    : {results['load_s'] * 1000:8.1f} ms (median)")
+    print(f"Total          : {results['total_s'] * 1000:8.1f} ms (budget {args.budget_s:.1f} s)")
+    print(f"Heavy modules  : {results['forbidden_loaded'] or 'none'}")
+
+    output_path = RESULT_DIR / "import_time_benchmark.json"
+    with open(output_path, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"Results saved to: {output_path}")
+
+    failures = []
+    if results["forbidden_loaded"]:
+        failures.append(f"heavy modules imported: {results['forbidden_loaded']}")
+    if results["total_s"] > args.budget_s:
+        failures.append(f"cold start {results['total_s']:.2f}s over budget")
+    if failures:
+        print("FAILED: " + "; ".join(failures))
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
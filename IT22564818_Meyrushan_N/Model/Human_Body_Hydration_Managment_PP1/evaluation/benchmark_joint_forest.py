@@ -0,0 +1,157 @@
+import argparse
+import json
+import time
+from pathlib import Path
+
+import numpy as np
+
+from config import (
+    MODEL_REG_PATH,
+    MODEL_CLF_PATH,
+    PREPROCESSOR_PATH,
+    JOINT_MODEL_PATH,
+    JOINT_FOREST_PARAMS,
+    RF_REGRESSOR_PARAMS
+)
+from utils import load_pickle, calculate_model_metrics
+from joint_forest import JointForest
+from dataLoad import load_data
+from preprocess import prepare_data
+from flat_forest import compile_model, verify_flat_forest
+
+# ======================================================
+# Paths
+# ======================================================
+RESULT_DIR = Path("results")
+RESULT_DIR.mkdir(exist_ok=True)
+
+# Tree-shape settings copied from the separate forests for the same-params run
+TREE_SHAPE_KEYS = ["n_estimators", "max_depth", "min_samples_split", "min_samples_leaf"]
+
+
+def single_row_ms(predict, X, repeats):
+    rows = [X[i % len(X)][np.newaxis, :] for i in range(repeats)]
+    predict(rows[0])
+    timings = np.empty(repeats)
+    for i, row in enumerate(rows):
+        start = time.perf_counter()
+        predict(row)
+        timings[i] = time.perf_counter() - start
+    return float(np.median(timings) * 1000)
+
+
+def batch_us_per_row(predict, X, repeats=5):
+    predict(X)
+    start = time.perf_counter()
+    for _ in range(repeats):
+        predict(X)
+    return (time.perf_counter() - start) / repeats / len(X) * 1e6
+
+
+def flat_stats(flats):
+    return {
+        "trees": sum(f.n_trees for f in flats),
+        "nodes": int(sum(len(f.feature) for f in flats)),
+        "bytes": int(sum(a.nbytes for f in flats for a in f.to_arrays().values()))
+    }
+
+
+# ======================================================
+# Main
+# ======================================================
+def main():
+    parser = argparse.ArgumentParser(description="Joint forest vs separate regressor + classifier")
+    parser.add_argument("--repeats", type=int, default=1000,
+                        help="Single-row predictions timed per variant")
+    parser.add_argument("--batch-rows", type=int, default=10_000)
+    args = parser.parse_args()
+
+    if not JOINT_MODEL_PATH.exists():
+        raise FileNotFoundError(f"{JOINT_MODEL_PATH} missing; run joint_forest.py first")
+
+    regressor = load_pickle(MODEL_REG_PATH)
+    classifier = load_pickle(MODEL_CLF_PATH)
+    joint = load_pickle(JOINT_MODEL_PATH)
+    preprocessor = load_pickle(PREPROCESSOR_PATH)
+
+    X_train, X_test, y_reg, y_reg_test, y_clf, y_clf_test, _ = prepare_data(load_data())
+    X = preprocessor.transform(X_test)
+    X_batch = np.resize(X, (args.batch_rows, X.shape[1]))
+    y_reg_test, y_clf_test = np.asarray(y_reg_test), np.asarray(y_clf_test)
+
+    flat_reg, flat_clf = compile_model(regressor), compile_model(classifier)
+    # Same tree settings as the separate forests, so only the shared splits differ
+    same_params = {**JOINT_FOREST_PARAMS, **{k: RF_REGRESSOR_PARAMS[k] for k in TREE_SHAPE_KEYS}}
+    joint_same = JointForest.fit(preprocessor.transform(X_train), y_reg, y_clf, same_params)
+
+    flat_joint, flat_joint_same = joint.compiled(), joint_same.compiled()
+    # Raises if the flat walk is not bit-identical to sklearn
+    for model, flat in [
+        (regressor, flat_reg), (classifier, flat_clf),
+        (joint.forest, flat_joint.forest), (joint_same.forest, flat_joint_same.forest)
+    ]:
+        verify_flat_forest(model, flat, X)
+
+    def separate_flat(rows):
+        return flat_reg.predict(rows), flat_clf.predict(rows)
+
+    def separate_sklearn(rows):
+        return regressor.predict(rows), classifier.predict(rows)
+
+    results = {
+        "test_rows": int(len(X)),
+        "params": {"joint": JOINT_FOREST_PARAMS, "joint_same_params": same_params},
+        "variants": {}
+    }
+    for name, flat_predict, sk_predict, flats in [
+        ("separate", separate_flat, separate_sklearn, [flat_reg, flat_clf]),
+        ("joint", flat_joint.predict_targets, joint.predict_targets, [flat_joint.forest]),
+        ("joint_same_params", flat_joint_same.predict_targets, joint_same.predict_targets,
+         [flat_joint_same.forest])
+    ]:
+        water, risk = sk_predict(X)
+        reg = calculate_model_metrics(y_reg_test, water, "regression")
+        clf = calculate_model_metrics(y_clf_test, risk, "classification")
+        results["variants"][name] = {
+            "accuracy": {
+                "regressor_rmse": reg["rmse"],
+                "regressor_r2": reg["r2"],
+                "classifier_accuracy": clf["accuracy"],
+                "classifier_f1": clf["f1"]
+            },
+            "size": flat_stats(flats),
+            "latency": {
+                "single_row_flat_ms": single_row_ms(flat_predict, X, args.repeats),
+                "batch_sklearn_us_per_row": batch_us_per_row(sk_predict, X_batch)
+            }
+        }
+
+    sep = results["variants"]["separate"]["latency"]["single_row_flat_ms"]
+    results["single_row_speedup"] = {
+        name: sep / results["variants"][name]["latency"]["single_row_flat_ms"]
+        for name in ["joint", "joint_same_params"]
+    }
+
+    print("\n" + "=" * 78)
+    print(" JOINT FOREST BENCHMARK ".center(78))
+    print("=" * 78)
+    for name, r in results["variants"].items():
+        a, s, lat = r["accuracy"], r["size"], r["latency"]
+        print(f"\n--- {name} ---")
+        print(f"Accuracy : R2 {a['regressor_r2']:.4f} | RMSE {a['regressor_rmse']:.4f} | "
+              f"acc {a['classifier_accuracy']:.4f} | F1 {a['classifier_f1']:.4f}")
+        print(f"Size     : {s['trees']} trees | {s['nodes']} nodes | {s['bytes'] / 1024 ** 2:.2f} MB")
+        print(f"Latency  : 1 row flat {lat['single_row_flat_ms']:.3f} ms | "
+              f"batch {lat['batch_sklearn_us_per_row']:.2f} us/row")
+    print("\nSingle-row speedup over separate: " + " | ".join(
+        f"{name} x{speedup:.2f}" for name, speedup in results["single_row_speedup"].items()
+    ))
+
+    output_path = RESULT_DIR / "joint_forest_benchmark.json"
+    with open(output_path, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"Results saved to: {output_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,211 @@
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from config import DATA_PATH, RANDOM_STATE, TIME_SLOT_MAPPING, ACTIVITY_MAPPING, SWEATING_MAPPING
+from dataLoad import (
+    clean_and_prepare_data,
+    calculate_water_recommendation,
+    assess_hydration_risk
+)
+from feature_eng import apply_feature_engineering
+
+# ======================================================
+# Paths
+# ======================================================
+RESULT_DIR = Path("results")
+RESULT_DIR.mkdir(exist_ok=True)
+
+# The row-wise engine is only timed up to this size
+LEGACY_MAX_ROWS = 100_000
+
+
+# ======================================================
+# Reference: the previous row-wise implementation
+# ======================================================
+def legacy_water_recommendation(df):
+    base = (df["Weight"] * 0.03) / 6
+    activity_map = {"Sedentary": 1.0, "Light": 1.2, "Moderate": 1.5,
+                    "Heavy": 2.0, "Very Heavy": 2.5, "Unknown": 1.2}
+    activity = df["Physical_Activity_Level"].map(activity_map).fillna(1.2)
+    temp_adj = np.maximum(0, (df["Temperature_C"] - 25) / 5) * 0.5
+    exercise_adj = df["Exercise Time (minutes) in Last 4 Hours"].fillna(0) * 0.01
+    sweat_map = {"None": 0, "Light": 0.2, "Moderate": 0.5,
+                 "Heavy": 0.8, "Very Heavy": 1.2, "Unknown": 0.3}
+    sweat_adj = df["Sweating Level (Last 4 Hours)"].map(sweat_map).fillna(0.3)
+    water = base * activity + temp_adj + exercise_adj + sweat_adj
+    return water.clip(0.2, 3.0).round(2)
+
+
+def legacy_hydration_risk(df):
+    risks = []
+    for _, r in df.iterrows():
+        score = 0
+        if r["Urine Color (Most Recent Urination)"] >= 6:
+            score += 3
+        symptoms = sum([
+            str(r.get("Thirsty (Right Now)", "No")).lower() == "yes",
+            str(r.get("Dizziness (Right Now)", "No")).lower() == "yes",
+            str(r.get("Fatigue / Tiredness (Right Now)", "No")).lower() == "yes",
+            str(r.get("Headache (Right Now)", "No")).lower() == "yes"
+        ])
+        score += symptoms * 2
+        if str(r.get("Urinated (Last 4 Hours)", "Yes")).lower() == "no":
+            score += 2
+        expected = (r["Weight"] * 0.03) / 6
+        ratio = r["Water_Intake_Last_4_Hours"] / expected if expected > 0 else 1
+        if ratio < 0.5:
+            score += 3
+        elif ratio < 0.8:
+            score += 1
+        if r["Temperature_C"] > 30:
+            score += 1
+        if score >= 8:
+            risks.append("High")
+        elif score >= 5:
+            risks.append("Moderate")
+        elif score >= 3:
+            risks.append("Low")
+        else:
+            risks.append("Very Low")
+    return pd.Series(risks, index=df.index)
+
+
+def legacy_text_features(df):
+    # feature_eng's text mappings before they went through utils.map_distinct
+    symptom_cols = ["Thirsty (Right Now)", "Dizziness (Right Now)",
+                    "Fatigue / Tiredness (Right Now)", "Headache (Right Now)"]
+    return pd.DataFrame({
+        "Time_Slot_Encoded": df["Time Slot (Select Your Current 4-Hour Window)"].map(
+            lambda v: TIME_SLOT_MAPPING.get(str(v).strip(), 2)),
+        "Activity_Factor": df["Physical_Activity_Level"].map(
+            lambda v: ACTIVITY_MAPPING.get(str(v).strip(), 1.2)),
+        "Sweating_Factor": df["Sweating Level (Last 4 Hours)"].map(
+            lambda v: SWEATING_MAPPING.get(str(v).strip(), 1)),
+        "Total_Symptom_Score": sum(
+            df[col].astype(str).str.lower().eq("yes").astype(int) for col in symptom_cols
+        ),
+        "Medical_Risk_Flag": (
+            ~df["Existing Diseases / Medical Conditions"].astype(str).str.lower()
+            .isin(["none", "unknown", ""])
+        ).astype(int)
+    })
+
+
+# ======================================================
+# Synthetic rows (cleaned schema, edge cases included)
+# ======================================================
+def synthetic_frame(n, rng):
+    def numeric(low, high, nan_rate=0.02):
+        values = rng.uniform(low, high, n).round(1)
+        values[rng.random(n) < nan_rate] = np.nan
+        return values
+
+    def answers(choices):
+        return np.array(choices, dtype=object)[rng.integers(0, len(choices), n)]
+
+    # None and NaN are both missing but stringify differently ("none" vs "nan")
+    yes_no = ["Yes", "No", "yes", "NO", "Unknown", np.nan, None]
+    levels = ["Sedentary", "Light", "Moderate", "Heavy", "Very Heavy", "Unknown", "Low", np.nan, None]
+    conditions = ["None", "Diabetes", "Hypertension", "unknown", "", np.nan, None]
+
+    weight = numeric(-5, 120, nan_rate=0)
+    weight[rng.random(n) < 0.01] = 0
+    return pd.DataFrame({
+        "Weight": weight,
+        "Water_Intake_Last_4_Hours": numeric(0, 1.2),
+        "Temperature_C": numeric(15, 40),
+        "Exercise Time (minutes) in Last 4 Hours": numeric(0, 120),
+        "Urine Color (Most Recent Urination)": rng.integers(1, 9, n).astype(float),
+        "Physical_Activity_Level": answers(levels),
+        "Sweating Level (Last 4 Hours)": answers(["None"] + levels),
+        "Urinated (Last 4 Hours)": answers(yes_no),
+        "Thirsty (Right Now)": answers(yes_no),
+        "Dizziness (Right Now)": answers(yes_no),
+        "Fatigue / Tiredness (Right Now)": answers(yes_no),
+        "Headache (Right Now)": answers(yes_no),
+        "Height": numeric(140, 200, nan_rate=0),
+        "Humidity_%": numeric(20, 95),
+        "Time Slot (Select Your Current 4-Hour Window)": answers(list(TIME_SLOT_MAPPING) + [np.nan, None]),
+        "Existing Diseases / Medical Conditions": answers(conditions)
+    })
+
+
+def timed(fn, df):
+    start = time.perf_counter()
+    out = fn(df)
+    return out, time.perf_counter() - start
+
+
+def compare(df, results, name, legacy=True):
+    water, water_s = timed(calculate_water_recommendation, df)
+    risk, risk_s = timed(assess_hydration_risk, df)
+    row = {"rows": len(df), "water_s": water_s, "risk_s": risk_s}
+
+    if legacy:
+        legacy_water, row["legacy_water_s"] = timed(legacy_water_recommendation, df)
+        legacy_risk, row["legacy_risk_s"] = timed(legacy_hydration_risk, df)
+        row["water_identical"] = bool(
+            np.array_equal(water.to_numpy(), legacy_water.to_numpy(), equal_nan=True)
+        )
+        row["risk_identical"] = bool((risk == legacy_risk).all())
+        row["risk_speedup"] = row["legacy_risk_s"] / risk_s
+
+        features = apply_feature_engineering(df)
+        legacy_features = legacy_text_features(df)
+        row["text_features_identical"] = bool(all(
+            np.array_equal(features[col].to_numpy(), legacy_features[col].to_numpy())
+            for col in legacy_features.columns
+        ))
+
+    results[name] = row
+    line = f"{name:14s}: risk {risk_s:8.3f} s | water {water_s:7.3f} s"
+    if legacy:
+        line += (f" | legacy risk {row['legacy_risk_s']:8.2f} s ({row['risk_speedup']:,.0f}x)"
+                 f" | identical risk={row['risk_identical']} water={row['water_identical']}"
+                 f" text features={row['text_features_identical']}")
+    print(line)
+    return row
+
+
+# ======================================================
+# Main
+# ======================================================
+def main():
+    parser = argparse.ArgumentParser(description="Row-wise vs compiled rule-table labeling")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 100_000, 10_000_000])
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(RANDOM_STATE)
+    results = {}
+
+    print("\n" + "=" * 72)
+    print(" HYDRATION LABELING BENCHMARK ".center(72))
+    print("=" * 72)
+
+    compare(clean_and_prepare_data(pd.read_csv(DATA_PATH)), results, "dataset")
+    for n in args.sizes:
+        compare(synthetic_frame(n, rng), results, f"synth_{n}", legacy=n <= LEGACY_MAX_ROWS)
+
+    output_path = RESULT_DIR / "labeling_benchmark.json"
+    with open(output_path, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"Results saved to: {output_path}")
+
+    mismatched = [
+        name for name, row in results.items()
+        if not all(row.get(k, True) for k in
+                   ["risk_identical", "water_identical", "text_features_identical"])
+    ]
+    if mismatched:
+        print(f"FAILED: labels differ from the row-wise engine for {mismatched}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+import argparse
+import json
+import time
+from pathlib import Path
+
+import numpy as np
+import torch
+
+from config_images import DEVICE, IMG_SIZE, LIP_CLASS_NAMES, MODEL_OUT, LIP_QUANTIZED_OUT
+from ImagePredict import build_model, load_eager_model, export_is_current
+from lip_export import freeze_model, verify_frozen_model
+
+# ======================================================
+# Paths
+# ======================================================
+RESULT_DIR = Path("results")
+RESULT_DIR.mkdir(exist_ok=True)
+
+
+def load_baseline(class_names):
+    # Original serving path: contiguous eager model under no_grad
+    model = build_model(class_names)
+    model.load_state_dict(torch.load(MODEL_OUT, map_location=DEVICE))
+    return model.to(DEVICE).eval()
+
+
+def measure(model, batch_size, iters, channels_last, context):
+    x = torch.randn(batch_size, 3, IMG_SIZE, IMG_SIZE, device=DEVICE)
+    if channels_last:
+        x = x.contiguous(memory_format=torch.channels_last)
+
+    with context():
+        for _ in range(3):
+            model(x)
+
+        latencies = []
+        for _ in range(iters):
+            start = time.perf_counter()
+            model(x)
+            latencies.append(time.perf_counter() - start)
+
+    latencies = np.array(latencies) * 1000
+    return {
+        "latency_ms_p50": float(np.percentile(latencies, 50)),
+        "latency_ms_p99": float(np.percentile(latencies, 99)),
+        "images_per_s": float(batch_size * 1000 / latencies.mean())
+    }
+
+
+# ======================================================
+# Main
+# ======================================================
+def main():
+    parser = argparse.ArgumentParser(description="Eager vs frozen lip model on CPU")
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 8, 16])
+    parser.add_argument("--iters", type=int, default=20)
+    args = parser.parse_args()
+
+    baseline = load_baseline(LIP_CLASS_NAMES)
+    eager = load_eager_model(LIP_CLASS_NAMES)
+    frozen = freeze_model(eager)
+    max_diff = verify_frozen_model(eager, frozen)
+
+    variants = {
+        "eager_no_grad": (baseline, False, torch.no_grad),
+        "eager_channels_last_inference_mode": (eager, True, torch.inference_mode),
+        "frozen_channels_last_inference_mode": (frozen, True, torch.inference_mode)
+    }
+    if export_is_current(LIP_QUANTIZED_OUT):
+        # Published by `lip_export.py --quantize`, so it already passed the accuracy gate
+        int8 = torch.jit.load(str(LIP_QUANTIZED_OUT), map_location=DEVICE)
+        variants["int8_frozen_channels_last_inference_mode"] = (int8, True, torch.inference_mode)
+
+    print("\n" + "=" * 72)
+    print(" LIP MODEL CPU INFERENCE BENCHMARK ".center(72))
+    print("=" * 72)
+    print(f"Threads: {torch.get_num_threads()} | Frozen vs eager max abs diff: {max_diff:.2e}")
+
+    results = {"threads": torch.get_num_threads(), "max_abs_diff": max_diff, "runs": {}}
+    for bs in args.batch_sizes:
+        print(f"\n--- batch size {bs} ---")
+        for name, (model, channels_last, context) in variants.items():
+            r = measure(model, bs, args.iters, channels_last, context)
+            results["runs"][f"{name}_bs{bs}"] = r
+            print(
+                f"{name:42s}: p50 {r['latency_ms_p50']:8.1f} ms | "
+                f"p99 {r['latency_ms_p99']:8.1f} ms | {r['images_per_s']:7.1f} img/s"
+            )
+
+    output_path = RESULT_DIR / "lip_inference_benchmark.json"
+    with open(output_path, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"\nResults saved to: {output_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+import argparse
+import json
+import shutil
+from pathlib import Path
+
+import torch
+from sklearn.metrics import accuracy_score
+
+from config import RANDOM_STATE
+from config_images import EPOCHS, LIP_EMBEDDING_CACHE_DIR
+import Train_Images
+
+# ======================================================
+# Paths
+# ======================================================
+RESULT_DIR = Path("results")
+RESULT_DIR.mkdir(exist_ok=True)
+
+
+def run(mode, epochs, pretrained):
+    # Same split, head init and (with --no-pretrained) backbone in every run
+    torch.manual_seed(RANDOM_STATE)
+    out = Train_Images.main(mode=mode, epochs=epochs, pretrained=pretrained, save=False)
+    return {
+        "train_s": out["train_s"],
+        "test_accuracy": float(accuracy_score(out["y_true"], out["y_pred"]))
+    }
+
+
+# ======================================================
+# Main
+# ======================================================
+def main():
+    parser = argparse.ArgumentParser(description="Full vs cached-embedding lip training")
+    parser.add_argument("--epochs", type=int, default=EPOCHS)
+    parser.add_argument("--no-pretrained", action="store_true",
+                        help="Random backbone (offline machines without ImageNet weights)")
+    args = parser.parse_args()
+    pretrained = not args.no_pretrained
+
+    # The embedding cache is derived data; start the cold run from scratch
+    shutil.rmtree(LIP_EMBEDDING_CACHE_DIR, ignore_errors=True)
+
+    results = {
+        "epochs": args.epochs,
+        "pretrained": pretrained,
+        "full": run("full", args.epochs, pretrained),
+        "cached_cold": run("cached", args.epochs, pretrained),
+        "cached_warm": run("cached", args.epochs, pretrained)
+    }
+
+    print("\n" + "=" * 60)
+    print(" LIP TRAINING TIME BENCHMARK ".center(60))
+    print("=" * 60)
+    for name in ["full", "cached_cold", "cached_warm"]:
+        r = results[name]
+        print(f"{name:12s}: {r['train_s']:8.2f} s | test accuracy {r['test_accuracy']:.3f}")
+
+    output_path = RESULT_DIR / "lip_training_benchmark.json"
+    with open(output_path, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"Results saved to: {output_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+import argparse
+import json
+import multiprocessing as mp
+import time
+from pathlib import Path
+
+import numpy as np
+
+# ======================================================
+# Paths
+# ======================================================
+RESULT_DIR = Path("results")
+RESULT_DIR.mkdir(exist_ok=True)
+
+
+def read_memory_kb():
+    # smaps_rollup separates pages shared with other workers (Linux only)
+    stats = {}
+    with open("/proc/self/smaps_rollup") as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) >= 2 and parts[1].isdigit():
+                stats[parts[0].rstrip(":")] = int(parts[1])
+    return {
+        "rss_kb": stats.get("Rss", 0),
+        "pss_kb": stats.get("Pss", 0),
+        "private_kb": stats.get("Private_Clean", 0) + stats.get("Private_Dirty", 0)
+    }
+
+
+# ======================================================
+# Worker process
+# ======================================================
+def worker(mode, barrier, queue):
+    from config import MODEL_REG_PATH, MODEL_CLF_PATH, PREPROCESSOR_PATH, ENCODER_PATH
+    from utils import load_pickle
+    from feature_plan import FeaturePlan
+    from model_bundle import load_bundle
+
+    before = read_memory_kb()
+    start = time.perf_counter()
+
+    if mode == "pickles":
+        regressor = load_pickle(MODEL_REG_PATH)
+        classifier = load_pickle(MODEL_CLF_PATH)
+        preprocessor = load_pickle(PREPROCESSOR_PATH)
+        load_pickle(ENCODER_PATH)
+        plan = FeaturePlan.from_preprocessor(preprocessor)
+    else:
+        bundle = load_bundle()
+        regressor, classifier = bundle.regressor, bundle.classifier
+        plan = bundle.feature_plan
+
+    load_s = time.perf_counter() - start
+
+    # Touch every tree once, like a first request would
+    X = np.zeros((1, plan.n_features))
+    regressor.predict(X)
+    classifier.predict(X)
+
+    # Measure while all workers are alive so shared pages are split
+    barrier.wait()
+    after = read_memory_kb()
+    queue.put({
+        "load_s": load_s,
+        **{k: after[k] - before[k] for k in after},
+        **{f"total_{k}": v for k, v in after.items()}
+    })
+    barrier.wait()
+
+
+def run_mode(mode, n_workers):
+    ctx = mp.get_context("spawn")
+    barrier = ctx.Barrier(n_workers)
+    queue = ctx.Queue()
+    procs = [ctx.Process(target=worker, args=(mode, barrier, queue)) for _ in range(n_workers)]
+    for p in procs:
+        p.start()
+    results = [queue.get() for _ in procs]
+    for p in procs:
+        p.join()
+
+    def mean(key):
+        return float(np.mean([r[key] for r in results]))
+
+    return {
+        "workers": n_workers,
+        "load_s_mean": mean("load_s"),
+        "model_rss_mb_per_worker": mean("rss_kb") / 1024,
+        "model_pss_mb_per_worker": mean("pss_kb") / 1024,
+        "model_private_mb_per_worker": mean("private_kb") / 1024
+    }
+
+
+# ======================================================
+# Main
+# ======================================================
+def main():
+    parser = argparse.ArgumentParser(description="Pickles vs memory-mapped bundle")
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args()
+
+    print("\n" + "=" * 72)
+    print(" MODEL BUNDLE LOAD / MEMORY BENCHMARK ".center(72))
+    print("=" * 72)
+
+    results = {mode: run_mode(mode, args.workers) for mode in ["pickles", "bundle"]}
+
+    for mode, r in results.items():
+        print(f"\n--- {mode} ({r['workers']} workers) ---")
+        print(f"Load time        : {r['load_s_mean'] * 1000:8.1f} ms")
+        print(f"Model RSS/worker : {r['model_rss_mb_per_worker']:8.1f} MB")
+        print(f"Model PSS/worker : {r['model_pss_mb_per_worker']:8.1f} MB")
+        print(f"Private/worker   : {r['model_private_mb_per_worker']:8.1f} MB")
+
+    output_path = RESULT_DIR / "model_bundle_benchmark.json"
+    with open(output_path, "w") as f:
+        json.dump(results, f, indent=2)
+
+    print("\n" + "=" * 72)
+    print(f" Results saved to: {output_path}".center(72))
+    print("=" * 72)
+
+
+if __name__ == "__main__":
+    main()
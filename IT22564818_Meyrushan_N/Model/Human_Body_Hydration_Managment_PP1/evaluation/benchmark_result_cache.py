@@ -0,0 +1,123 @@
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+from config import TARGET_COLS
+from dataLoad import load_data
+from predict import AdvancedPredictor, RAW_REQUIRED_FIELDS
+
+# ======================================================
+# Paths
+# ======================================================
+RESULT_DIR = Path("results")
+RESULT_DIR.mkdir(exist_ok=True)
+
+
+def build_workload(inputs, n_requests, seed=42):
+    # Repeat submissions from a pool of users, with sensor-level noise
+    rng = np.random.default_rng(seed)
+    picks = rng.integers(0, len(inputs), size=n_requests)
+    workload = []
+    for i in picks:
+        row = dict(inputs[i])
+        row["Temperature_C"] = float(row["Temperature_C"]) + rng.choice([-0.1, 0.0, 0.1])
+        row["Humidity_%"] = float(row["Humidity_%"]) + rng.choice([-0.2, 0.0, 0.2])
+        workload.append(row)
+    return workload
+
+
+# ======================================================
+# Main
+# ======================================================
+def main():
+    parser = argparse.ArgumentParser(description="Form prediction result cache")
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--requests", type=int, default=2000)
+    args = parser.parse_args()
+
+    df = load_data().drop(columns=TARGET_COLS, errors="ignore")
+    inputs = df.dropna(subset=RAW_REQUIRED_FIELDS).to_dict("records")[:args.users]
+    workload = build_workload(inputs, args.requests)
+
+    predictor = AdvancedPredictor()
+    predictor.load_models()
+    predictor.result_cache.clear()
+
+    start = time.perf_counter()
+    for row in workload:
+        predictor.predict_uncached(row)
+    uncached_ms = (time.perf_counter() - start) / len(workload) * 1000
+
+    start = time.perf_counter()
+    cached = [predictor.predict(row) for row in workload]
+    cached_ms = (time.perf_counter() - start) / len(workload) * 1000
+    stats = predictor.result_cache.stats()
+
+    # A miss must score the input as sent, exactly like the batch path
+    batch = predictor.predict_batch(inputs)
+    mismatches = 0
+    for row, (_, expected) in zip(inputs, batch.iterrows()):
+        predictor.result_cache.clear()
+        prediction = predictor.predict(row)["hydration_prediction"]
+        mismatches += (
+            prediction["recommended_water_liters_next_4h"] != expected["recommended_water_liters_next_4h"]
+            or prediction["hydration_risk_level"] != expected["hydration_risk_level"]
+        )
+
+    # Hits reuse the model output of a nearby input; everything else is the caller's
+    fresh = [predictor.predict_uncached(row) for row in workload]
+    context_mismatches = sum(
+        {k: v for k, v in result.items() if k != "hydration_prediction"}
+        != {k: v for k, v in expected.items() if k != "hydration_prediction"}
+        for result, expected in zip(cached, fresh)
+    )
+    hit_drift = sum(
+        result["hydration_prediction"] != expected["hydration_prediction"]
+        for result, expected in zip(cached, fresh)
+    )
+
+    # A new model version must never see the previous version's entries
+    hits_before = predictor.result_cache.counters["hits"]
+    predictor.model_version = "retrained"
+    predictor.predict(workload[0])
+    invalidated = predictor.result_cache.counters["hits"] == hits_before
+
+    results = {
+        "users": len(inputs),
+        "requests": len(workload),
+        "uncached_ms_per_request": uncached_ms,
+        "cached_ms_per_request": cached_ms,
+        "speedup": uncached_ms / cached_ms,
+        "mismatches": int(mismatches),
+        "context_mismatches": int(context_mismatches),
+        "hit_drift": int(hit_drift),
+        "invalidated_on_new_version": invalidated,
+        "cache": stats
+    }
+
+    print("\n" + "=" * 60)
+    print(" FORM RESULT CACHE BENCHMARK ".center(60))
+    print("=" * 60)
+    print(f"Requests        : {len(workload)} from {len(inputs)} users")
+    print(f"Hit ratio       : {stats['hit_ratio']:.3f} ({stats['entries']} entries)")
+    print(f"Uncached        : {uncached_ms:8.3f} ms / request")
+    print(f"Cached          : {cached_ms:8.3f} ms / request ({results['speedup']:.1f}x)")
+    print(f"Mismatches      : {mismatches} (miss vs batch) | {context_mismatches} (response context)")
+    print(f"Hit drift       : {hit_drift} hits served a nearby input's model output")
+    print(f"Version bound   : {invalidated}")
+
+    output_path = RESULT_DIR / "result_cache_benchmark.json"
+    with open(output_path, "w") as f:
+        json.dump(results, f, indent=2, default=str)
+    print(f"Results saved to: {output_path}")
+
+    if mismatches or context_mismatches or not invalidated:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
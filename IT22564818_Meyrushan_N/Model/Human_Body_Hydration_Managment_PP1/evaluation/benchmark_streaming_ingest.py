@@ -0,0 +1,104 @@
+import argparse
+import json
+import multiprocessing
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import pandas as pd
+
+from config import DATA_PATH
+from dataLoad import iter_labeled_chunks, labeling_fingerprint
+from tabular_store import DatasetWriter, read_dataset
+from utils import proc_status_mb, reset_peak_rss
+
+# ======================================================
+# Paths
+# ======================================================
+RESULT_DIR = Path("results")
+RESULT_DIR.mkdir(exist_ok=True)
+
+
+def _ingest(source, out_path, chunk_rows):
+    # Fresh process per run: peak RSS is reset after imports
+    peak_reset = reset_peak_rss()
+    baseline = proc_status_mb("VmRSS")
+    start = time.perf_counter()
+
+    with DatasetWriter(out_path, labeling_fingerprint(source)) as writer:
+        for chunk in iter_labeled_chunks(source, chunk_rows):
+            writer.write(chunk)
+
+    peak = proc_status_mb("VmHWM")
+    return {
+        "ingest_s": time.perf_counter() - start,
+        "peak_rss_mb": None if not peak_reset or peak is None else peak - baseline,
+        "chunks": writer.chunks
+    }
+
+
+# ======================================================
+# Main
+# ======================================================
+def main():
+    parser = argparse.ArgumentParser(description="In-memory vs chunked labeled-dataset ingestion")
+    parser.add_argument("--scales", type=int, nargs="+", default=[25, 100, 400],
+                        help="Replicate dataset.csv this many times")
+    parser.add_argument("--chunk-rows", type=int, default=50_000)
+    args = parser.parse_args()
+
+    raw = pd.read_csv(DATA_PATH)
+    ctx = multiprocessing.get_context("spawn")
+    results = {"chunk_rows": args.chunk_rows, "runs": {}}
+    failures = []
+
+    print("\n" + "=" * 78)
+    print(" STREAMING INGESTION BENCHMARK ".center(78))
+    print("=" * 78)
+
+    for scale in args.scales:
+        work = Path(tempfile.mkdtemp(prefix="hydration_ingest_"))
+        try:
+            source = work / "dataset.csv"
+            pd.concat([raw] * scale, ignore_index=True).to_csv(source, index=False)
+
+            run = {"rows": len(raw) * scale}
+            for name, chunk_rows in [("in_memory", None), ("streaming", args.chunk_rows)]:
+                with ctx.Pool(1) as pool:
+                    run[name] = pool.apply(
+                        _ingest, (source, work / f"{name}.parquet", chunk_rows)
+                    )
+
+            # Same rows, index, values and dtypes either way
+            full = read_dataset(work / "in_memory.parquet")
+            streamed = read_dataset(work / "streaming.parquet")
+            run["identical"] = bool(full.equals(streamed) and (full.dtypes == streamed.dtypes).all())
+            del full, streamed
+        finally:
+            shutil.rmtree(work, ignore_errors=True)
+
+        results["runs"][f"x{scale}"] = run
+        if not run["identical"]:
+            failures.append(scale)
+
+        for name in ["in_memory", "streaming"]:
+            r = run[name]
+            peak = "n/a" if r["peak_rss_mb"] is None else f"+{r['peak_rss_mb']:7.1f} MB"
+            print(f"{run['rows']:>9,} rows | {name:9s}: {r['ingest_s']:6.2f} s | "
+                  f"peak RSS {peak} | chunks {r['chunks']}")
+        print(f"{'':>14} identical={run['identical']}")
+
+    output_path = RESULT_DIR / "streaming_ingest_benchmark.json"
+    with open(output_path, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"Results saved to: {output_path}")
+
+    if failures:
+        print(f"FAILED: streaming output differs at scales {failures}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+import argparse
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+from sklearn.ensemble import RandomForestRegressor, RandomForestClassifier
+from sklearn.model_selection import cross_val_score
+
+from config import RF_REGRESSOR_PARAMS, RF_CLASSIFIER_PARAMS, TRAINING_CV_FOLDS
+from dataLoad import load_data
+from train import AdvancedModelTrainer
+from train_orchestrator import TrainingOrchestrator, FitTask, cv_fold_tasks
+
+# ======================================================
+# Paths
+# ======================================================
+RESULT_DIR = Path("results")
+RESULT_DIR.mkdir(exist_ok=True)
+
+
+def sequential_fits(X, y_reg, y_clf):
+    # The previous train_pipeline: regressor, classifier, cross_val_score
+    start = time.perf_counter()
+    regressor = RandomForestRegressor(**RF_REGRESSOR_PARAMS).fit(X, y_reg)
+    classifier = RandomForestClassifier(**RF_CLASSIFIER_PARAMS).fit(X, y_clf)
+    cv_scores = cross_val_score(
+        RandomForestClassifier(**RF_CLASSIFIER_PARAMS), X, y_clf,
+        cv=TRAINING_CV_FOLDS, scoring="accuracy"
+    )
+    return regressor, classifier, cv_scores, time.perf_counter() - start
+
+
+def orchestrated_fits(X, y_reg, y_clf, workers):
+    classifier = RandomForestClassifier(**RF_CLASSIFIER_PARAMS)
+    tasks = [
+        FitTask("regressor", RandomForestRegressor(**RF_REGRESSOR_PARAMS), y_reg),
+        FitTask("classifier", classifier, y_clf)
+    ] + cv_fold_tasks(classifier, X, y_clf, TRAINING_CV_FOLDS)
+
+    orchestrator = TrainingOrchestrator(workers)
+    results = orchestrator.run(tasks, X)
+    cv_scores = np.array([results[task.name] for task in tasks[2:]])
+    return results["regressor"], results["classifier"], cv_scores, orchestrator.last_run
+
+
+# ======================================================
+# Main
+# ======================================================
+def main():
+    parser = argparse.ArgumentParser(description="Sequential vs orchestrated training fits")
+    parser.add_argument("--workers", type=int, nargs="+",
+                        default=sorted({1, os.cpu_count() or 1}))
+    args = parser.parse_args()
+
+    trainer = AdvancedModelTrainer()
+    X_train, X_test, y_reg, _, y_clf, _ = trainer.prepare_features(load_data())
+
+    regressor, classifier, cv_scores, seq_s = sequential_fits(X_train, y_reg, y_clf)
+    results = {"cpus": os.cpu_count(), "rows": len(X_train), "sequential_s": seq_s, "runs": {}}
+
+    print("\n" + "=" * 72)
+    print(" TRAINING ORCHESTRATOR BENCHMARK ".center(72))
+    print("=" * 72)
+    print(f"sequential    : {seq_s:6.2f} s")
+
+    failures = []
+    for workers in args.workers:
+        reg, clf, scores, run = orchestrated_fits(X_train, y_reg, y_clf, workers)
+        run["speedup"] = seq_s / run["wall_s"]
+        run["identical"] = bool(
+            np.array_equal(reg.predict(X_test), regressor.predict(X_test))
+            and np.array_equal(clf.predict_proba(X_test), classifier.predict_proba(X_test))
+            and np.array_equal(scores, cv_scores)
+        )
+        results["runs"][f"workers_{workers}"] = run
+        if not run["identical"]:
+            failures.append(workers)
+        print(f"budget {workers:3d}    : {run['wall_s']:6.2f} s ({run['speedup']:.2f}x) | "
+              f"{run['concurrent_fits']} concurrent x {run['jobs_per_fit']} jobs | "
+              f"identical={run['identical']}")
+
+    output_path = RESULT_DIR / "training_orchestrator_benchmark.json"
+    with open(output_path, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"Results saved to: {output_path}")
+
+    if failures:
+        print(f"FAILED: orchestrated fits differ at budgets {failures}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+import asyncio
+import json
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+
+from weather import WeatherProvider
+
+# ======================================================
+# Paths
+# ======================================================
+RESULT_DIR = Path("results")
+RESULT_DIR.mkdir(exist_ok=True)
+
+
+# ======================================================
+# Local open-meteo stub (no real network needed)
+# ======================================================
+class StubState:
+    mode = "ok"        # "ok" or "fail"
+    delay_s = 0.0
+    requests = 0
+    lock = threading.Lock()
+
+
+class StubHandler(BaseHTTPRequestHandler):
+
+    def do_GET(self):
+        with StubState.lock:
+            StubState.requests += 1
+        time.sleep(StubState.delay_s)
+
+        if StubState.mode == "fail":
+            self.send_response(503)
+            self.end_headers()
+            return
+
+        query = parse_qs(urlparse(self.path).query)
+        lat = float(query["latitude"][0])
+        body = json.dumps({
+            "current": {"temperature_2m": 20.0 + lat, "relative_humidity_2m": 60.0}
+        }).encode()
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def start_stub():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_port}/v1/forecast"
+
+
+# ======================================================
+# Scenarios
+# ======================================================
+async def run_checks(url):
+    results = []
+
+    def check(name, condition):
+        results.append((name, bool(condition)))
+        print(f"{'PASS' if condition else 'FAIL'} | {name}")
+
+    provider = WeatherProvider(
+        base_url=url, ttl_s=0.5, timeout_s=1.0,
+        failure_threshold=2, reset_after_s=0.5
+    )
+
+    # Concurrent lookups for one cell share a single upstream call
+    StubState.delay_s, StubState.requests = 0.2, 0
+    readings = await asyncio.gather(*[
+        provider.get(6.9271 + i * 1e-4, 79.8612) for i in range(50)
+    ])
+    check("50 concurrent lookups -> 1 upstream call", StubState.requests == 1)
+    check("all coalesced callers get the same reading", len(set(readings)) == 1)
+
+    # Cached within TTL
+    StubState.delay_s = 0.0
+    await provider.get(6.93, 79.86)
+    check("repeat lookup served from cache", StubState.requests == 1)
+
+    # Expired after TTL
+    await asyncio.sleep(0.6)
+    await provider.get(6.93, 79.86)
+    check("lookup after TTL refreshes upstream", StubState.requests == 2)
+
+    # Failures open the circuit; stale reading is preferred over default
+    StubState.mode = "fail"
+    await asyncio.sleep(0.6)
+    stale = await provider.get(6.93, 79.86)
+    fresh_cell = await provider.get(40.0, -74.0)
+    check("failed refresh falls back to stale reading", stale == readings[0])
+    check("unknown cell falls back to default", fresh_cell == provider.fallback)
+    check("circuit opens after threshold", provider.breaker.state == "open")
+
+    before = StubState.requests
+    await provider.get(41.0, -74.0)
+    check("open circuit skips upstream", StubState.requests == before)
+
+    # Half-open trial closes the circuit once upstream recovers
+    StubState.mode = "ok"
+    await asyncio.sleep(0.6)
+    await provider.get(42.0, -74.0)
+    check("half-open trial closes circuit", provider.breaker.state == "closed")
+
+    # A cancelled leader must not fail the callers coalesced onto it
+    StubState.delay_s, StubState.requests = 0.3, 0
+    leader = asyncio.ensure_future(provider.get(50.0, 10.0))
+    await asyncio.sleep(0.05)
+    waiters = [asyncio.ensure_future(provider.get(50.0, 10.0)) for _ in range(5)]
+    await asyncio.sleep(0.05)
+    leader.cancel()
+    waited = await asyncio.gather(*waiters, return_exceptions=True)
+    check("cancelled leader leaves waiters served",
+          all(r == (70.0, 60.0) for r in waited) and StubState.requests == 1)
+
+    # A cancelled half-open trial must not wedge the circuit
+    breaker_provider = WeatherProvider(
+        base_url=url, ttl_s=0.5, timeout_s=1.0,
+        failure_threshold=1, reset_after_s=0.5
+    )
+    StubState.mode, StubState.delay_s = "fail", 0.0
+    await breaker_provider.get(51.0, 10.0)
+    StubState.mode, StubState.delay_s = "ok", 0.3
+    await asyncio.sleep(0.6)
+    trial = asyncio.ensure_future(breaker_provider.get(52.0, 10.0))
+    await asyncio.sleep(0.05)
+    trial.cancel()
+    await asyncio.sleep(0.4)
+    StubState.delay_s, before = 0.0, StubState.requests
+    await breaker_provider.get(53.0, 10.0)
+    check("cancelled half-open trial does not wedge the circuit",
+          breaker_provider.breaker.state == "closed" and StubState.requests == before + 1)
+
+    # Blocking wrapper (predict.get_current_weather) keeps the timeout and fallback
+    sync_provider = WeatherProvider(
+        base_url=url, ttl_s=0.5, timeout_s=0.2,
+        failure_threshold=2, reset_after_s=0.5
+    )
+    StubState.mode, StubState.delay_s = "ok", 0.0
+    reading = await asyncio.to_thread(sync_provider.get_sync, 5.0, 10.0)
+    StubState.delay_s = 1.0
+    started = time.perf_counter()
+    slow = await asyncio.to_thread(sync_provider.get_sync, 60.0, 10.0)
+    elapsed = time.perf_counter() - started
+    check("sync lookup returns the upstream reading", reading == (25.0, 60.0))
+    check("sync lookup times out to the fallback",
+          slow == sync_provider.fallback and elapsed < 0.9)
+    StubState.delay_s = 0.0
+
+    stats = provider.stats()
+    print("\nCounters:", json.dumps(stats, indent=2))
+
+    output_path = RESULT_DIR / "weather_provider_check.json"
+    with open(output_path, "w") as f:
+        json.dump({"checks": dict(results), "stats": stats}, f, indent=2)
+    print(f"Results saved to: {output_path}")
+
+    return all(ok for _, ok in results)
+
+
+def main():
+    server, url = start_stub()
+    try:
+        ok = asyncio.run(run_checks(url))
+    finally:
+        server.shutdown()
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
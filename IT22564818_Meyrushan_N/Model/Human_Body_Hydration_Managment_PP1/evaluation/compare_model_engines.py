@@ -0,0 +1,164 @@
+import argparse
+import json
+import pickle
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+from dataLoad import load_data
+from train import AdvancedModelTrainer
+from model_engines import engine_names
+from model_bundle import save_bundle, load_bundle
+from feature_plan import FeaturePlan
+from flat_forest import compile_model, verify_flat_forest
+from utils import calculate_model_metrics
+
+# ======================================================
+# Paths
+# ======================================================
+RESULT_DIR = Path("results")
+RESULT_DIR.mkdir(exist_ok=True)
+
+
+def single_row_ms(predict, X, repeats):
+    rows = [X[i % len(X)][np.newaxis, :] for i in range(repeats)]
+    predict(rows[0])
+    timings = np.empty(repeats)
+    for i, row in enumerate(rows):
+        start = time.perf_counter()
+        predict(row)
+        timings[i] = time.perf_counter() - start
+    return float(np.median(timings) * 1000)
+
+
+def batch_us_per_row(predict, X, repeats=5):
+    predict(X)
+    start = time.perf_counter()
+    for _ in range(repeats):
+        predict(X)
+    return (time.perf_counter() - start) / repeats / len(X) * 1e6
+
+
+def bundle_round_trip(trainer, X):
+    # Save and reload through model_bundle, as predict.AdvancedPredictor does
+    work = Path(tempfile.mkdtemp(prefix="hydration_engine_"))
+    try:
+        bundle_dir = work / "bundle"
+        save_bundle(
+            trainer.regressor, trainer.classifier, trainer.preprocessor,
+            trainer.label_encoder, FeaturePlan.from_preprocessor(trainer.preprocessor),
+            bundle_dir
+        )
+        bundle = load_bundle(bundle_dir)
+        bundle_bytes = sum(p.stat().st_size for p in bundle_dir.rglob("*.npy"))
+        identical = bool(
+            np.array_equal(bundle.regressor.predict(X), trainer.regressor.predict(X))
+            and np.array_equal(bundle.classifier.predict(X), trainer.classifier.predict(X))
+        )
+        return bundle.manifest["engines"], bundle_bytes, identical
+    finally:
+        shutil.rmtree(work, ignore_errors=True)
+
+
+# ======================================================
+# Main
+# ======================================================
+def main():
+    parser = argparse.ArgumentParser(description="Random forest vs histogram gradient boosting")
+    parser.add_argument("--engines", nargs="+", choices=engine_names(), default=engine_names())
+    parser.add_argument("--repeats", type=int, default=500,
+                        help="Single-row predictions timed per model")
+    parser.add_argument("--batch-rows", type=int, default=10_000)
+    args = parser.parse_args()
+
+    df = load_data()
+    results = {"rows": len(df), "engines": {}}
+    failures = []
+
+    for engine in args.engines:
+        trainer = AdvancedModelTrainer(engine=engine)
+        X_train, X_test, y_reg, y_reg_test, y_clf, y_clf_test = trainer.prepare_features(df)
+        X_batch = np.resize(X_test, (args.batch_rows, X_test.shape[1]))
+
+        start = time.perf_counter()
+        trainer.regressor, trainer.classifier, cv_scores = trainer.fit_models(
+            X_train, y_reg, y_clf
+        )
+        fit = trainer.timings["fit"]
+        row = {
+            "train_s": {
+                "regressor": fit["fit_s"]["regressor"],
+                "classifier": fit["fit_s"]["classifier"],
+                "with_cv_wall": time.perf_counter() - start
+            }
+        }
+
+        reg_metrics = calculate_model_metrics(y_reg_test, trainer.regressor.predict(X_test), "regression")
+        clf_metrics = calculate_model_metrics(y_clf_test, trainer.classifier.predict(X_test), "classification")
+        row["accuracy"] = {
+            "regressor_rmse": reg_metrics["rmse"],
+            "regressor_r2": reg_metrics["r2"],
+            "classifier_accuracy": clf_metrics["accuracy"],
+            "classifier_f1": clf_metrics["f1"],
+            "classifier_cv_accuracy": float(cv_scores.mean())
+        }
+
+        engines, bundle_bytes, identical = bundle_round_trip(trainer, X_test)
+        row["size_mb"] = {
+            "pickles": sum(
+                len(pickle.dumps(m, protocol=pickle.HIGHEST_PROTOCOL))
+                for m in [trainer.regressor, trainer.classifier]
+            ) / 1024 ** 2,
+            "bundle_arrays": bundle_bytes / 1024 ** 2
+        }
+        row["bundle_engines"] = engines
+        row["bundle_identical"] = identical
+
+        row["latency"] = {}
+        for role, model in [("regressor", trainer.regressor), ("classifier", trainer.classifier)]:
+            flat = compile_model(model)
+            verify_flat_forest(model, flat, X_test)
+            row["latency"][role] = {
+                "single_row_flat_ms": single_row_ms(flat.predict, X_test, args.repeats),
+                "single_row_sklearn_ms": single_row_ms(model.predict, X_test, args.repeats),
+                "batch_sklearn_us_per_row": batch_us_per_row(model.predict, X_batch)
+            }
+
+        results["engines"][engine] = row
+        if not identical:
+            failures.append(engine)
+
+    print("\n" + "=" * 78)
+    print(" MODEL ENGINE COMPARISON ".center(78))
+    print("=" * 78)
+    for engine, r in results["engines"].items():
+        a, s, t = r["accuracy"], r["size_mb"], r["train_s"]
+        print(f"\n--- {engine} ---")
+        print(f"Accuracy  : R2 {a['regressor_r2']:.4f} | RMSE {a['regressor_rmse']:.4f} | "
+              f"acc {a['classifier_accuracy']:.4f} | F1 {a['classifier_f1']:.4f} | "
+              f"CV {a['classifier_cv_accuracy']:.4f}")
+        print(f"Size      : pickles {s['pickles']:.2f} MB | bundle arrays {s['bundle_arrays']:.2f} MB")
+        print(f"Training  : regressor {t['regressor']:.2f} s | classifier {t['classifier']:.2f} s | "
+              f"with {len(cv_scores)}-fold CV {t['with_cv_wall']:.2f} s")
+        for role, lat in r["latency"].items():
+            print(f"{role:10}: 1 row flat {lat['single_row_flat_ms']:.3f} ms | "
+                  f"sklearn {lat['single_row_sklearn_ms']:.3f} ms | "
+                  f"batch {lat['batch_sklearn_us_per_row']:.2f} us/row")
+        print(f"Bundle    : {r['bundle_engines']} | identical={r['bundle_identical']}")
+
+    output_path = RESULT_DIR / "model_engine_comparison.json"
+    with open(output_path, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"\nResults saved to: {output_path}")
+
+    if failures:
+        print(f"FAILED: bundle predictions differ for {failures}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
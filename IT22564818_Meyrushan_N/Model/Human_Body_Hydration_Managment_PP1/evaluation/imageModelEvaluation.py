@@ -1,19 +1,10 @@
-import torch
-import torch.nn as nn
-from torchvision import models
-from sklearn.metrics import (
-    accuracy_score,
-    precision_score,
-    recall_score,
-    f1_score,
-    classification_report,
-    confusion_matrix
-)
 import json
 from pathlib import Path
 
-from config import DEVICE, MODEL_OUT
+from config_images import LIP_USE_BF16
 from dataLoad_images import load_data_images   # SAFE image loader
+from ImagePredict import load_model, bf16_supported   # INT8 / frozen export when available
+from lip_export import evaluate_lip_model, compare_bf16
 
 
 # ======================================================
@@ -24,30 +15,10 @@ RESULT_DIR.mkdir(exist_ok=True)
 RESULT_FILE = RESULT_DIR / "image_model_evaluation.json"
 
 
-# ======================================================
-# LOAD TRAINED MODEL
-# ======================================================
-def load_model(class_names):
-    model = models.resnet18(pretrained=False)
-
-    num_ftrs = model.fc.in_features
-    model.fc = nn.Sequential(
-        nn.Linear(num_ftrs, 256),
-        nn.ReLU(),
-        nn.Dropout(0.3),
-        nn.Linear(256, len(class_names))
-    )
-
-    model.load_state_dict(torch.load(MODEL_OUT, map_location=DEVICE))
-    model.to(DEVICE)
-    model.eval()
-    return model
-
-
 # ======================================================
 # MAIN EVALUATION
 # ======================================================
-def main():
+def main(bf16=LIP_USE_BF16):
     print("\n" + "=" * 70)
     print(" IMAGE-BASED HYDRATION MODEL EVALUATION ".center(70))
     print("=" * 70)
@@ -67,30 +38,12 @@ def main():
     model = load_model(class_names)
 
     # --------------------------------------------------
-    # Evaluation
-    # --------------------------------------------------
-    y_true, y_pred = [], []
-
-    with torch.no_grad():
-        for images, labels in test_loader:
-            images = images.to(DEVICE)
-            outputs = model(images)
-            preds = torch.argmax(outputs, dim=1)
-
-            y_true.extend(labels.numpy())
-            y_pred.extend(preds.cpu().numpy())
-
-    # --------------------------------------------------
-    # Metrics
+    # Evaluation + metrics
     # --------------------------------------------------
-    acc = accuracy_score(y_true, y_pred)
-    prec = precision_score(y_true, y_pred, average="weighted", zero_division=0)
-    rec = recall_score(y_true, y_pred, average="weighted", zero_division=0)
-    f1 = f1_score(y_true, y_pred, average="weighted", zero_division=0)
-    cm = confusion_matrix(y_true, y_pred).tolist()
-    report = classification_report(
-        y_true, y_pred, target_names=class_names, output_dict=True
-    )
+    metrics = evaluate_lip_model(model, test_loader, class_names, bf16=bf16)
+    acc, prec = metrics["accuracy"], metrics["precision"]
+    rec, f1 = metrics["recall"], metrics["f1_score"]
+    cm = metrics["confusion_matrix"]
 
     # --------------------------------------------------
     # Print (Viva Friendly)
@@ -105,18 +58,35 @@ def main():
     for row in cm:
         print(row)
 
+    # --------------------------------------------------
+    # bfloat16 vs FP32 (eager model, same test split)
+    # --------------------------------------------------
+    print("\n▶ Comparing bfloat16 autocast with FP32...")
+    precision_comparison = compare_bf16(test_loader, class_names)
+    if precision_comparison["bf16_supported"]:
+        delta = precision_comparison["delta"]
+        print(f"Accuracy delta   : {delta['accuracy'] * 100:+.2f} pts")
+        print(f"F1 delta         : {delta['f1_score']:+.3f}")
+        print(f"Throughput       : {delta['throughput_ratio']:.2f}x FP32")
+        if delta["peak_memory_mb"] is not None:
+            print(f"Peak memory delta: {delta['peak_memory_mb']:+.1f} MB")
+    else:
+        print("bfloat16 not supported on this CPU; FP32 only")
+
     # --------------------------------------------------
     # Save results
     # --------------------------------------------------
     results = {
         "model": "ResNet-18 (Lip Hydration Classification)",
         "classes": class_names,
+        "bf16_autocast": bool(bf16 and bf16_supported()),
         "accuracy": acc,
         "precision": prec,
         "recall": rec,
         "f1_score": f1,
         "confusion_matrix": cm,
-        "classification_report": report
+        "classification_report": metrics["classification_report"],
+        "precision_comparison": precision_comparison
     }
 
     with open(RESULT_FILE, "w") as f:
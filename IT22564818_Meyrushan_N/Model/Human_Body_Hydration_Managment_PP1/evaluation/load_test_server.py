@@ -0,0 +1,163 @@
+import argparse
+import asyncio
+import base64
+import json
+import time
+from pathlib import Path
+
+import numpy as np
+
+# ======================================================
+# Paths
+# ======================================================
+BASE_DIR = Path(__file__).resolve().parent.parent
+RESULT_DIR = Path("results")
+RESULT_DIR.mkdir(exist_ok=True)
+
+SAMPLE_IMAGE = BASE_DIR / "Test_01.png"
+
+# Same shape as the Flutter form payload (form_screen.dart)
+FORM_PAYLOAD = {
+    "Age": 26,
+    "Gender": "Male",
+    "Weight": 61.0,
+    "Height": 161.0,
+    "Water_Intake_Last_4_Hours": 0.5,
+    "Exercise_Time_Last_4_Hours": 30.0,
+    "Physical_Activity_Level": "Moderate",
+    "Urinated_Last_4_Hours": "Yes",
+    "Urine_Color": 5,
+    "Thirsty": "Yes",
+    "Dizziness": "No",
+    "Fatigue": "No",
+    "Headache": "No",
+    "Sweating_Level": "Heavy",
+    "Temperature_C": 31.0,
+    "Humidity_%": 75.0
+}
+
+
+def build_body(endpoint: str) -> bytes:
+    if endpoint == "/predict/form":
+        return json.dumps(FORM_PAYLOAD).encode()
+    if endpoint == "/predict/lip/web":
+        encoded = base64.b64encode(SAMPLE_IMAGE.read_bytes()).decode()
+        return json.dumps({"image_base64": encoded}).encode()
+    raise ValueError(f"Unsupported endpoint: {endpoint}")
+
+
+# ======================================================
+# Minimal keep-alive HTTP/1.1 client (stdlib only)
+# ======================================================
+async def post(reader, writer, host, endpoint, body) -> int:
+    writer.write(
+        (
+            f"POST {endpoint} HTTP/1.1\r\n"
+            f"Host: {host}\r\n"
+            "Content-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            "Connection: keep-alive\r\n\r\n"
+        ).encode() + body
+    )
+    await writer.drain()
+
+    status_line = await reader.readline()
+    status = int(status_line.split()[1])
+
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b""):
+            break
+        name, _, value = line.decode().partition(":")
+        if name.lower() == "content-length":
+            length = int(value.strip())
+
+    await reader.readexactly(length)
+    return status
+
+
+async def client(host, port, endpoint, body, n_requests, latencies, errors):
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        for _ in range(n_requests):
+            start = time.perf_counter()
+            status = await post(reader, writer, host, endpoint, body)
+            latencies.append(time.perf_counter() - start)
+            if status != 200:
+                errors.append(status)
+    finally:
+        writer.close()
+        await writer.wait_closed()
+
+
+async def run_load_test(host, port, endpoint, concurrency, total_requests):
+    body = build_body(endpoint)
+    per_client = max(1, total_requests // concurrency)
+
+    latencies, errors = [], []
+
+    # Warm-up request so model loading does not skew results
+    await client(host, port, endpoint, body, 1, [], [])
+
+    start = time.perf_counter()
+    await asyncio.gather(*[
+        client(host, port, endpoint, body, per_client, latencies, errors)
+        for _ in range(concurrency)
+    ])
+    elapsed = time.perf_counter() - start
+
+    lat_ms = np.array(latencies) * 1000
+    return {
+        "endpoint": endpoint,
+        "concurrency": concurrency,
+        "requests": len(latencies),
+        "errors": len(errors),
+        "elapsed_s": elapsed,
+        "throughput_rps": len(latencies) / elapsed,
+        "latency_ms": {
+            "mean": float(lat_ms.mean()),
+            "p50": float(np.percentile(lat_ms, 50)),
+            "p95": float(np.percentile(lat_ms, 95)),
+            "p99": float(np.percentile(lat_ms, 99))
+        }
+    }
+
+
+# ======================================================
+# Main
+# ======================================================
+def main():
+    parser = argparse.ArgumentParser(description="Local load test for server.py")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--endpoint", default="/predict/form",
+                        choices=["/predict/form", "/predict/lip/web"])
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--requests", type=int, default=1000)
+    args = parser.parse_args()
+
+    results = asyncio.run(run_load_test(
+        args.host, args.port, args.endpoint, args.concurrency, args.requests
+    ))
+
+    lat = results["latency_ms"]
+    print("\n" + "=" * 60)
+    print(" INFERENCE SERVICE LOAD TEST ".center(60))
+    print("=" * 60)
+    print(f"Endpoint    : {results['endpoint']}")
+    print(f"Concurrency : {results['concurrency']}")
+    print(f"Requests    : {results['requests']} ({results['errors']} errors)")
+    print(f"Throughput  : {results['throughput_rps']:.1f} req/s")
+    print(f"Latency p50 : {lat['p50']:.1f} ms")
+    print(f"Latency p99 : {lat['p99']:.1f} ms")
+
+    name = args.endpoint.strip("/").replace("/", "_")
+    output_path = RESULT_DIR / f"load_test_{name}.json"
+    with open(output_path, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"Results saved to: {output_path}")
+
+
+if __name__ == "__main__":
+    main()
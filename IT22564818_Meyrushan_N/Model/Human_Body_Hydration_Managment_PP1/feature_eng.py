@@ -4,7 +4,7 @@ from sklearn.base import BaseEstimator, TransformerMixin
 from typing import List
 
 from config import TIME_SLOT_MAPPING, ACTIVITY_MAPPING, SWEATING_MAPPING
-from utils import setup_logging
+from utils import setup_logging, map_distinct
 
 LOG = setup_logging()
 
@@ -34,9 +34,10 @@ class AdvancedFeatureEngineer(BaseEstimator, TransformerMixin):
         # TIME WINDOW → CIRCADIAN FACTOR (CORE LOGIC)
         # --------------------------------------------------
         if "Time Slot (Select Your Current 4-Hour Window)" in X.columns:
-            X["Time_Slot_Encoded"] = X[
-                "Time Slot (Select Your Current 4-Hour Window)"
-            ].map(lambda v: TIME_SLOT_MAPPING.get(str(v).strip(), 2))
+            X["Time_Slot_Encoded"] = map_distinct(
+                X["Time Slot (Select Your Current 4-Hour Window)"],
+                lambda v: TIME_SLOT_MAPPING.get(str(v).strip(), 2)
+            )
         else:
             # Prediction-safe default (daytime)
             X["Time_Slot_Encoded"] = 2
@@ -66,11 +67,14 @@ class AdvancedFeatureEngineer(BaseEstimator, TransformerMixin):
         # --------------------------------------------------
         # ACTIVITY & SWEATING FACTORS
         # --------------------------------------------------
-        X["Activity_Factor"] = X["Physical_Activity_Level"].map(
+        # Text columns (object or categorical) are mapped once per distinct value
+        X["Activity_Factor"] = map_distinct(
+            X["Physical_Activity_Level"],
             lambda v: ACTIVITY_MAPPING.get(str(v).strip(), 1.2)
         )
 
-        X["Sweating_Factor"] = X["Sweating Level (Last 4 Hours)"].map(
+        X["Sweating_Factor"] = map_distinct(
+            X["Sweating Level (Last 4 Hours)"],
             lambda v: SWEATING_MAPPING.get(str(v).strip(), 1)
         )
 
@@ -91,7 +95,7 @@ class AdvancedFeatureEngineer(BaseEstimator, TransformerMixin):
         ]
 
         X["Total_Symptom_Score"] = sum(
-            X[col].astype(str).str.lower().eq("yes").astype(int)
+            map_distinct(X[col], lambda v: str(v).lower() == "yes").astype(int)
             for col in symptom_cols if col in X.columns
         )
 
@@ -99,11 +103,9 @@ class AdvancedFeatureEngineer(BaseEstimator, TransformerMixin):
         # MEDICAL RISK FLAG (OPTIONAL – SAFE)
         # --------------------------------------------------
         if "Existing Diseases / Medical Conditions" in X.columns:
-            X["Medical_Risk_Flag"] = (
-                ~X["Existing Diseases / Medical Conditions"]
-                .astype(str)
-                .str.lower()
-                .isin(["none", "unknown", ""])
+            X["Medical_Risk_Flag"] = map_distinct(
+                X["Existing Diseases / Medical Conditions"],
+                lambda v: str(v).lower() not in ["none", "unknown", ""]
             ).astype(int)
         else:
             # Prediction-time default
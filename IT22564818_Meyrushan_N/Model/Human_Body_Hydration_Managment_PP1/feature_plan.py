@@ -0,0 +1,268 @@
+import numpy as np
+import pandas as pd
+from typing import Any, Callable, Dict, List
+
+from config import TIME_SLOT_MAPPING, ACTIVITY_MAPPING, SWEATING_MAPPING
+from feature_eng import apply_feature_engineering
+
+TIME_SLOT_FIELD = "Time Slot (Select Your Current 4-Hour Window)"
+
+# Raw columns coerced with pd.to_numeric in AdvancedFeatureEngineer
+RAW_NUMERIC_COLS = [
+    "Age", "Weight", "Height",
+    "Exercise Time (minutes) in Last 4 Hours",
+    "Water_Intake_Last_4_Hours",
+    "Temperature_C", "Humidity_%",
+    "Urine Color (Most Recent Urination)"
+]
+
+SYMPTOM_COLS = [
+    "Thirsty (Right Now)",
+    "Dizziness (Right Now)",
+    "Fatigue / Tiredness (Right Now)",
+    "Headache (Right Now)"
+]
+
+
+# ======================================================
+# SCALAR COERCION (MIRRORS pd.to_numeric / isna)
+# ======================================================
+def _to_float(value: Any) -> np.float64:
+    # np.float64 keeps pandas semantics for inf/nan arithmetic
+    try:
+        return np.float64(value)
+    except (TypeError, ValueError):
+        return np.float64(np.nan)
+
+
+def _is_missing(value: Any) -> bool:
+    # SimpleImputer only imputes NaN; None reaches the one-hot encoder as
+    # an unknown category (all zeros), so it must not be filled here
+    return isinstance(value, float) and value != value
+
+
+# ======================================================
+# ENGINEERED FEATURE FORMULAS
+# (SCALAR FORM OF feature_eng.AdvancedFeatureEngineer)
+# ======================================================
+def _time_slot(r):
+    if TIME_SLOT_FIELD not in r:
+        return 2
+    return TIME_SLOT_MAPPING.get(str(r[TIME_SLOT_FIELD]).strip(), 2)
+
+
+def _circadian(r):
+    slot = r["Time_Slot_Encoded"]
+    if slot in (1, 2):
+        return 1.1
+    if slot == 3:
+        return 1.3
+    if slot == 4:
+        return 1.0
+    if slot in (0, 5):
+        return 0.8
+    return 1.0
+
+
+def _urine_health(r):
+    urine = min(max(r["Urine Color (Most Recent Urination)"], 1), 8)
+    return 10 - urine if urine <= 3 else 0
+
+
+def _symptoms(r):
+    return sum(
+        str(r[col]).lower() == "yes" for col in SYMPTOM_COLS if col in r
+    )
+
+
+def _medical_flag(r):
+    value = r.get("Existing Diseases / Medical Conditions")
+    if value is None:
+        return 0
+    return int(str(value).lower() not in ["none", "unknown", ""])
+
+
+def _heat_index(r):
+    temp = r["Temperature_C"]
+    return 0.5 * (temp + 61 + ((temp - 68) * 1.2) + (r["Humidity_%"] * 0.094))
+
+
+def _water_deficit(r):
+    expected = (r["Weight"] * 0.03) / 6
+    return max(expected - r["Water_Intake_Last_4_Hours"], 0)
+
+
+def _composite(r):
+    return (
+        r["Hydration_Index"] * 0.25 +
+        r["Urine_Health_Score"] * 0.20 +
+        (4 - min(max(r["Total_Symptom_Score"], 0), 4)) * 0.20 +
+        r["Activity_Factor"] * 0.15 +
+        (1 - r["Medical_Risk_Flag"]) * 0.10 +
+        r["Circadian_Factor"] * 0.10
+    )
+
+
+# Evaluated in order; later formulas may use earlier results
+ENGINEERED_FEATURES: Dict[str, Callable[[Dict[str, Any]], float]] = {
+    "Time_Slot_Encoded": _time_slot,
+    "Circadian_Factor": _circadian,
+    "BMI": lambda r: r["Weight"] / ((r["Height"] / 100) ** 2),
+    "BSA": lambda r: np.sqrt((r["Height"] * r["Weight"]) / 3600),
+    "Hydration_Index": lambda r: (r["Water_Intake_Last_4_Hours"] * 1000) / r["Weight"],
+    "Activity_Factor": lambda r: ACTIVITY_MAPPING.get(
+        str(r["Physical_Activity_Level"]).strip(), 1.2
+    ),
+    "Sweating_Factor": lambda r: SWEATING_MAPPING.get(
+        str(r["Sweating Level (Last 4 Hours)"]).strip(), 1
+    ),
+    "Urine_Health_Score": _urine_health,
+    "Total_Symptom_Score": _symptoms,
+    "Medical_Risk_Flag": _medical_flag,
+    "Heat_Index": _heat_index,
+    "Water_Deficit": _water_deficit,
+    "Composite_Hydration_Score": _composite
+}
+
+
+FORMULA_DEPENDENCIES = {
+    "Circadian_Factor": ["Time_Slot_Encoded"],
+    "Composite_Hydration_Score": [
+        "Hydration_Index", "Urine_Health_Score", "Total_Symptom_Score",
+        "Activity_Factor", "Medical_Risk_Flag", "Circadian_Factor"
+    ]
+}
+
+
+def _with_dependencies(names) -> set:
+    needed, stack = set(), list(names)
+    while stack:
+        name = stack.pop()
+        if name not in needed:
+            needed.add(name)
+            stack.extend(FORMULA_DEPENDENCIES.get(name, []))
+    return needed
+
+
+# ======================================================
+# FITTED FEATURE PLAN
+# ======================================================
+class FeaturePlan:
+    """
+    Precompiled copy of the fitted preprocessing pipeline.
+
+    Holds the numeric imputation medians, scaler mean/scale arrays and
+    one-hot index tables taken from ``AdvancedPreprocessor``, so a raw
+    input dict becomes the final float vector without building a
+    DataFrame.
+    """
+
+    def __init__(self, numeric_cols: List[str], numeric_fill, mean, scale,
+                 categorical_cols: List[str], categorical_fill: List[Any],
+                 onehot_tables: List[Dict[Any, int]], n_features: int):
+        self.numeric_cols = numeric_cols
+        self.numeric_fill = numeric_fill
+        self.mean = mean
+        self.scale = scale
+        self.categorical_cols = categorical_cols
+        self.categorical_fill = categorical_fill
+        self.onehot_tables = onehot_tables
+        self.n_features = n_features
+
+        # Only compute the engineered features the model actually consumes
+        # (names only, so the plan pickles without the formula lambdas)
+        needed = _with_dependencies(numeric_cols)
+        self.engineered = [name for name in ENGINEERED_FEATURES if name in needed]
+
+    @classmethod
+    def from_preprocessor(cls, preprocessor) -> "FeaturePlan":
+        ct = preprocessor.preprocessor
+        if ct is None:
+            raise ValueError("Preprocessor not fitted")
+
+        transformers = {name: cols for name, _, cols in ct.transformers_}
+        numeric_cols = list(transformers["num"])
+        categorical_cols = list(transformers["cat"])
+
+        num = ct.named_transformers_["num"]
+        imputer = num.named_steps["imputer"]
+        scaler = num.named_steps["scaler"]
+
+        cat = ct.named_transformers_["cat"]
+        cat_imputer = cat.named_steps["imputer"]
+        onehot = cat.named_steps["onehot"]
+
+        drop_idx = onehot.drop_idx_
+        tables, offset = [], len(numeric_cols)
+        for i, categories in enumerate(onehot.categories_):
+            kept = [
+                c for j, c in enumerate(categories)
+                if drop_idx is None or drop_idx[i] is None or j != drop_idx[i]
+            ]
+            tables.append({c: offset + k for k, c in enumerate(kept)})
+            offset += len(kept)
+
+        return cls(
+            numeric_cols=numeric_cols,
+            numeric_fill=np.asarray(imputer.statistics_, dtype=np.float64),
+            mean=np.asarray(scaler.mean_, dtype=np.float64),
+            scale=np.asarray(scaler.scale_, dtype=np.float64),
+            categorical_cols=categorical_cols,
+            categorical_fill=list(cat_imputer.statistics_),
+            onehot_tables=tables,
+            n_features=offset
+        )
+
+    # --------------------------------------------------
+    # RAW DICT → FEATURE VECTOR
+    # --------------------------------------------------
+    def transform_one(self, user_input: Dict[str, Any]) -> np.ndarray:
+        row = dict(user_input)
+        for col in RAW_NUMERIC_COLS:
+            if col in row:
+                row[col] = _to_float(row[col])
+        for name in self.engineered:
+            row[name] = ENGINEERED_FEATURES[name](row)
+
+        out = np.zeros((1, self.n_features), dtype=np.float64)
+
+        numeric = np.array(
+            [_to_float(row[c]) for c in self.numeric_cols], dtype=np.float64
+        )
+        missing = np.isnan(numeric)
+        numeric[missing] = self.numeric_fill[missing]
+        out[0, :len(numeric)] = (numeric - self.mean) / self.scale
+
+        for col, fill, table in zip(
+            self.categorical_cols, self.categorical_fill, self.onehot_tables
+        ):
+            value = row.get(col)
+            if _is_missing(value):
+                value = fill
+            idx = table.get(value) if isinstance(value, str) else None
+            if idx is not None:
+                out[0, idx] = 1.0
+
+        return out
+
+
+# ======================================================
+# PARITY CHECK AGAINST THE PANDAS PIPELINE
+# ======================================================
+def missing_value_cases(user_input: Dict[str, Any]) -> List[Dict[str, Any]]:
+    # Every field blanked as None and as NaN, which the pipeline treats differently
+    return [{**user_input, field: blank} for field in user_input for blank in (None, np.nan)]
+
+
+def verify_feature_plan(plan: FeaturePlan, preprocessor, inputs: List[Dict[str, Any]]) -> None:
+    cases = list(inputs) + (missing_value_cases(inputs[0]) if inputs else [])
+    for i, user_input in enumerate(cases):
+        expected = preprocessor.transform(
+            apply_feature_engineering(pd.DataFrame([user_input]))
+        )
+        actual = plan.transform_one(user_input)
+        if not np.array_equal(expected, actual):
+            raise AssertionError(
+                f"Feature plan differs from pipeline on input {i}: "
+                f"max abs diff {np.nanmax(np.abs(expected - actual))}"
+            )
@@ -0,0 +1,395 @@
+import numpy as np
+from typing import Dict, Optional
+
+
+# ======================================================
+# FLAT ARRAY-BACKED FOREST
+# (ALL TREES IN CONTIGUOUS NODE ARRAYS)
+# ======================================================
+class FlatForest:
+    """
+    Compiled, read-only copy of a fitted sklearn random forest.
+
+    Every tree is concatenated into shared node arrays. Leaves point to
+    themselves, so all trees can be walked in lock-step for ``max_depth``
+    steps with a handful of NumPy operations and no per-call validation.
+    Predictions match ``model.predict`` bit for bit (same float32 input
+    cast, same per-leaf values, same tree-order accumulation).
+    """
+
+    def __init__(self, feature, threshold, left, right, value, roots,
+                 max_depth: int, n_features: int,
+                 classes: Optional[np.ndarray] = None):
+        self.feature = feature
+        self.threshold = threshold
+        self.left = left
+        self.right = right
+        self.value = value
+        self.roots = roots
+        self.max_depth = int(max_depth)
+        self.n_features = int(n_features)
+        self.classes = classes
+
+    @property
+    def is_classifier(self) -> bool:
+        return self.classes is not None
+
+    @property
+    def n_trees(self) -> int:
+        return len(self.roots)
+
+    # --------------------------------------------------
+    # COMPILE
+    # --------------------------------------------------
+    @classmethod
+    def from_sklearn(cls, model) -> "FlatForest":
+        from sklearn.ensemble import RandomForestClassifier, RandomForestRegressor
+
+        if not isinstance(model, (RandomForestRegressor, RandomForestClassifier)):
+            raise TypeError(f"Unsupported model type: {type(model).__name__}")
+
+        is_clf = isinstance(model, RandomForestClassifier)
+        multi_output = getattr(model, "n_outputs_", 1) != 1
+        if is_clf and multi_output:
+            raise ValueError("Only single-output classifiers are supported")
+
+        features, thresholds, lefts, rights, values, roots = [], [], [], [], [], []
+        offset = 0
+        max_depth = 0
+
+        for est in model.estimators_:
+            tree = est.tree_
+            n = tree.node_count
+            idx = np.arange(n, dtype=np.int32)
+            is_leaf = tree.children_left == -1
+
+            left = np.where(is_leaf, idx, tree.children_left).astype(np.int32) + offset
+            right = np.where(is_leaf, idx, tree.children_right).astype(np.int32) + offset
+
+            if is_clf:
+                # Same normalisation as DecisionTreeClassifier.predict_proba
+                value = tree.value[:, 0, :].copy()
+                normalizer = value.sum(axis=1)[:, np.newaxis]
+                normalizer[normalizer == 0.0] = 1.0
+                value /= normalizer
+            elif multi_output:
+                # (nodes, outputs): every output is averaged in the same walk
+                value = tree.value[:, :, 0].copy()
+            else:
+                value = tree.value[:, 0, 0].copy()
+
+            features.append(np.where(is_leaf, 0, tree.feature).astype(np.int32))
+            thresholds.append(tree.threshold.astype(np.float64))
+            lefts.append(left)
+            rights.append(right)
+            values.append(value)
+            roots.append(offset)
+
+            offset += n
+            max_depth = max(max_depth, tree.max_depth)
+
+        return cls(
+            feature=np.ascontiguousarray(np.concatenate(features)),
+            threshold=np.ascontiguousarray(np.concatenate(thresholds)),
+            left=np.ascontiguousarray(np.concatenate(lefts)),
+            right=np.ascontiguousarray(np.concatenate(rights)),
+            value=np.ascontiguousarray(np.concatenate(values)),
+            roots=np.asarray(roots, dtype=np.int32),
+            max_depth=max_depth,
+            n_features=model.n_features_in_,
+            classes=model.classes_.copy() if is_clf else None
+        )
+
+    # --------------------------------------------------
+    # TRAVERSAL
+    # --------------------------------------------------
+    def apply(self, X) -> np.ndarray:
+        # sklearn trees compare float32 inputs against float64 thresholds
+        X = np.asarray(X, dtype=np.float32)
+        if X.ndim == 1:
+            X = X[np.newaxis, :]
+        if X.shape[1] != self.n_features:
+            raise ValueError(
+                f"X has {X.shape[1]} features, forest expects {self.n_features}"
+            )
+
+        rows = np.arange(X.shape[0])[:, np.newaxis]
+        node = np.broadcast_to(self.roots, (X.shape[0], self.n_trees))
+
+        for _ in range(self.max_depth):
+            go_left = X[rows, self.feature[node]] <= self.threshold[node]
+            node = np.where(go_left, self.left[node], self.right[node])
+
+        return node
+
+    def _accumulate(self, X) -> np.ndarray:
+        leaf_values = self.value[self.apply(X)]
+        # cumsum adds trees strictly in order, like the sklearn accumulator
+        return np.cumsum(leaf_values, axis=1)[:, -1] / self.n_trees
+
+    def predict_proba(self, X) -> np.ndarray:
+        if not self.is_classifier:
+            raise AttributeError("predict_proba is only available for classifiers")
+        return self._accumulate(X)
+
+    def predict(self, X) -> np.ndarray:
+        if self.is_classifier:
+            return self.classes.take(np.argmax(self._accumulate(X), axis=1), axis=0)
+        return self._accumulate(X)
+
+    # --------------------------------------------------
+    # ARRAY EXPORT (FOR MEMORY-MAPPED BUNDLES)
+    # --------------------------------------------------
+    def to_arrays(self) -> Dict[str, np.ndarray]:
+        arrays = {
+            "feature": self.feature,
+            "threshold": self.threshold,
+            "left": self.left,
+            "right": self.right,
+            "value": self.value,
+            "roots": self.roots,
+            "meta": np.array([self.max_depth, self.n_features], dtype=np.int64)
+        }
+        if self.is_classifier:
+            arrays["classes"] = self.classes
+        return arrays
+
+    @classmethod
+    def from_arrays(cls, arrays: Dict[str, np.ndarray]) -> "FlatForest":
+        # np.asarray drops the memmap subclass but keeps the shared buffer
+        arrays = {k: np.asarray(v) for k, v in arrays.items()}
+        max_depth, n_features = (int(v) for v in arrays["meta"])
+        return cls(
+            feature=arrays["feature"],
+            threshold=arrays["threshold"],
+            left=arrays["left"],
+            right=arrays["right"],
+            value=arrays["value"],
+            roots=arrays["roots"],
+            max_depth=max_depth,
+            n_features=n_features,
+            classes=arrays.get("classes")
+        )
+
+
+# ======================================================
+# FLAT GRADIENT-BOOSTED TREES
+# (HISTGRADIENTBOOSTING IN THE SAME NODE LAYOUT)
+# ======================================================
+class FlatBoosting:
+    """
+    Compiled, read-only copy of a fitted HistGradientBoosting model.
+
+    Uses the FlatForest node layout (self-looping leaves, lock-step walk)
+    with float64 inputs and NaN routing as sklearn does. Raw scores add
+    the baseline and then every tree in iteration order, exactly like
+    ``_raw_predict``; classifiers apply the same softmax / sigmoid.
+    """
+
+    def __init__(self, feature, threshold, missing_left, left, right, value,
+                 roots, baseline, max_depth: int, n_features: int,
+                 classes: Optional[np.ndarray] = None):
+        self.feature = feature
+        self.threshold = threshold
+        self.missing_left = missing_left
+        self.left = left
+        self.right = right
+        self.value = value
+        self.roots = roots
+        self.baseline = baseline
+        self.max_depth = int(max_depth)
+        self.n_features = int(n_features)
+        self.classes = classes
+
+    @property
+    def is_classifier(self) -> bool:
+        return self.classes is not None
+
+    @property
+    def n_trees(self) -> int:
+        return len(self.roots)
+
+    @property
+    def trees_per_iteration(self) -> int:
+        return len(self.baseline)
+
+    # --------------------------------------------------
+    # COMPILE
+    # --------------------------------------------------
+    @classmethod
+    def from_sklearn(cls, model) -> "FlatBoosting":
+        from sklearn.ensemble import (
+            HistGradientBoostingClassifier, HistGradientBoostingRegressor
+        )
+
+        if not isinstance(model, (HistGradientBoostingRegressor, HistGradientBoostingClassifier)):
+            raise TypeError(f"Unsupported model type: {type(model).__name__}")
+        is_clf = isinstance(model, HistGradientBoostingClassifier)
+        if is_clf and len(model.classes_) < 2:
+            raise ValueError("Single-class boosting models are not supported")
+
+        features, thresholds, missing, lefts, rights, values, roots = [], [], [], [], [], [], []
+        offset = 0
+        max_depth = 0
+
+        for iteration in model._predictors:
+            for predictor in iteration:
+                nodes = predictor.nodes
+                if nodes["is_categorical"].any():
+                    raise ValueError("Categorical splits are not supported")
+                n = len(nodes)
+                idx = np.arange(n, dtype=np.int32)
+                is_leaf = nodes["is_leaf"].astype(bool)
+
+                features.append(np.where(is_leaf, 0, nodes["feature_idx"]).astype(np.int32))
+                thresholds.append(nodes["num_threshold"].astype(np.float64))
+                missing.append(nodes["missing_go_to_left"].astype(bool))
+                lefts.append(np.where(is_leaf, idx, nodes["left"]).astype(np.int32) + offset)
+                rights.append(np.where(is_leaf, idx, nodes["right"]).astype(np.int32) + offset)
+                values.append(nodes["value"].astype(np.float64))
+                roots.append(offset)
+
+                offset += n
+                max_depth = max(max_depth, int(nodes["depth"].max()))
+
+        return cls(
+            feature=np.ascontiguousarray(np.concatenate(features)),
+            threshold=np.ascontiguousarray(np.concatenate(thresholds)),
+            missing_left=np.ascontiguousarray(np.concatenate(missing)),
+            left=np.ascontiguousarray(np.concatenate(lefts)),
+            right=np.ascontiguousarray(np.concatenate(rights)),
+            value=np.ascontiguousarray(np.concatenate(values)),
+            roots=np.asarray(roots, dtype=np.int32),
+            baseline=np.asarray(model._baseline_prediction, dtype=np.float64).ravel(),
+            max_depth=max_depth,
+            n_features=model.n_features_in_,
+            classes=model.classes_.copy() if is_clf else None
+        )
+
+    # --------------------------------------------------
+    # TRAVERSAL
+    # --------------------------------------------------
+    def apply(self, X) -> np.ndarray:
+        X = np.asarray(X, dtype=np.float64)
+        if X.ndim == 1:
+            X = X[np.newaxis, :]
+        if X.shape[1] != self.n_features:
+            raise ValueError(
+                f"X has {X.shape[1]} features, model expects {self.n_features}"
+            )
+
+        rows = np.arange(X.shape[0])[:, np.newaxis]
+        node = np.broadcast_to(self.roots, (X.shape[0], self.n_trees))
+
+        for _ in range(self.max_depth):
+            x = X[rows, self.feature[node]]
+            go_left = np.where(np.isnan(x), self.missing_left[node], x <= self.threshold[node])
+            node = np.where(go_left, self.left[node], self.right[node])
+
+        return node
+
+    def raw_predict(self, X) -> np.ndarray:
+        leaf_values = self.value[self.apply(X)]
+        n, k = leaf_values.shape[0], self.trees_per_iteration
+        steps = np.concatenate([
+            np.broadcast_to(self.baseline, (n, 1, k)),
+            leaf_values.reshape(n, -1, k)
+        ], axis=1)
+        # cumsum adds baseline, then iterations strictly in order
+        return np.cumsum(steps, axis=1)[:, -1, :]
+
+    def predict_proba(self, X) -> np.ndarray:
+        if not self.is_classifier:
+            raise AttributeError("predict_proba is only available for classifiers")
+        raw = self.raw_predict(X)
+        if raw.shape[1] == 1:
+            from scipy.special import expit
+            proba = expit(raw[:, 0])
+            return np.column_stack([1.0 - proba, proba])
+        proba = np.exp(raw - raw.max(axis=1, keepdims=True))
+        return proba / proba.sum(axis=1, keepdims=True)
+
+    def predict(self, X) -> np.ndarray:
+        if self.is_classifier:
+            return self.classes.take(np.argmax(self.predict_proba(X), axis=1), axis=0)
+        return self.raw_predict(X)[:, 0]
+
+    # --------------------------------------------------
+    # ARRAY EXPORT (FOR MEMORY-MAPPED BUNDLES)
+    # --------------------------------------------------
+    def to_arrays(self) -> Dict[str, np.ndarray]:
+        arrays = {
+            "feature": self.feature,
+            "threshold": self.threshold,
+            "missing_left": self.missing_left,
+            "left": self.left,
+            "right": self.right,
+            "value": self.value,
+            "roots": self.roots,
+            "baseline": self.baseline,
+            "meta": np.array([self.max_depth, self.n_features], dtype=np.int64)
+        }
+        if self.is_classifier:
+            arrays["classes"] = self.classes
+        return arrays
+
+    @classmethod
+    def from_arrays(cls, arrays: Dict[str, np.ndarray]) -> "FlatBoosting":
+        arrays = {k: np.asarray(v) for k, v in arrays.items()}
+        max_depth, n_features = (int(v) for v in arrays["meta"])
+        return cls(
+            feature=arrays["feature"],
+            threshold=arrays["threshold"],
+            missing_left=arrays["missing_left"],
+            left=arrays["left"],
+            right=arrays["right"],
+            value=arrays["value"],
+            roots=arrays["roots"],
+            baseline=arrays["baseline"],
+            max_depth=max_depth,
+            n_features=n_features,
+            classes=arrays.get("classes")
+        )
+
+
+# ======================================================
+# ENGINE DISPATCH
+# ======================================================
+FLAT_KINDS = {"flat_forest": FlatForest, "flat_boosting": FlatBoosting}
+
+
+def flat_kind(model) -> str:
+    """Name of the flat evaluator that serves ``model``."""
+    if isinstance(model, (FlatForest, FlatBoosting)):
+        return next(k for k, c in FLAT_KINDS.items() if isinstance(model, c))
+    name = type(model).__name__
+    if name.startswith("RandomForest"):
+        return "flat_forest"
+    if name.startswith("HistGradientBoosting"):
+        return "flat_boosting"
+    raise TypeError(f"Unsupported model type: {name}")
+
+
+def compile_model(model):
+    """Flat evaluator for a fitted forest or boosting model (flat models pass through)."""
+    if isinstance(model, (FlatForest, FlatBoosting)):
+        return model
+    return FLAT_KINDS[flat_kind(model)].from_sklearn(model)
+
+
+# ======================================================
+# PARITY CHECK
+# ======================================================
+def verify_flat_forest(model, flat, X) -> None:
+    expected = model.predict(X)
+    actual = flat.predict(X)
+    if not np.array_equal(expected, actual):
+        n_bad = int(np.sum(expected != actual))
+        raise AssertionError(
+            f"Flat forest differs from {type(model).__name__}.predict on {n_bad} rows"
+        )
+
+    if flat.is_classifier and not np.array_equal(
+        model.predict_proba(X), flat.predict_proba(X)
+    ):
+        raise AssertionError("Flat forest probabilities differ from predict_proba")
@@ -0,0 +1,297 @@
+import copy
+import json
+from datetime import datetime
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+from sklearn.ensemble import RandomForestRegressor, RandomForestClassifier
+from sklearn.ensemble._forest import _generate_unsampled_indices, _get_n_samples_bootstrap
+from sklearn.model_selection import train_test_split
+
+from config import (
+    RANDOM_STATE,
+    MODEL_REG_PATH,
+    MODEL_CLF_PATH,
+    PREPROCESSOR_PATH,
+    ENCODER_PATH,
+    FEATURE_PLAN_PATH,
+    COMPRESSION_TOLERANCE,
+    COMPRESSION_MIN_OOB_COVERAGE,
+    COMPRESSION_STUDENTS,
+    COMPACT_BUNDLE_DIR,
+    COMPACT_REG_PATH,
+    COMPACT_CLF_PATH,
+    COMPRESSION_REPORT_PATH
+)
+from utils import setup_logging, load_pickle, save_pickle, calculate_model_metrics
+from dataLoad import load_data
+from preprocess import prepare_data
+from feature_plan import FeaturePlan
+from flat_forest import compile_model
+from model_bundle import save_bundle
+
+LOG = setup_logging()
+
+
+# ======================================================
+# OUT-OF-BAG BOOKKEEPING
+# ======================================================
+def oob_mask(model, n_samples: int) -> np.ndarray:
+    """(trees, rows) mask of the rows each tree never saw in its bootstrap."""
+    if not model.bootstrap:
+        raise ValueError("Out-of-bag selection needs a forest fitted with bootstrap=True")
+    n_bootstrap = _get_n_samples_bootstrap(n_samples, model.max_samples)
+    mask = np.zeros((len(model.estimators_), n_samples), dtype=bool)
+    for t, tree in enumerate(model.estimators_):
+        mask[t, _generate_unsampled_indices(tree.random_state, n_samples, n_bootstrap)] = True
+    return mask
+
+
+def tree_predictions(model, X) -> np.ndarray:
+    # (trees, rows) for regressors, (trees, rows, classes) for classifiers
+    X = np.asarray(X, dtype=np.float32)
+    if isinstance(model, RandomForestClassifier):
+        return np.stack([tree.predict_proba(X) for tree in model.estimators_])
+    return np.stack([tree.predict(X) for tree in model.estimators_])
+
+
+def oob_contributions(model, X, n_samples: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Per-tree predictions zeroed where the row was in-bag, plus the out-of-bag mask."""
+    preds = tree_predictions(model, X)
+    mask = oob_mask(model, n_samples)
+    return preds * (mask[..., None] if preds.ndim == 3 else mask), mask
+
+
+def _masked_scores(sums, counts, y, classes) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Score of every candidate row-set at once: R² (regression) or accuracy
+    (classification) over the rows each candidate covers out-of-bag.
+    """
+    covered = counts > 0
+    n_covered = covered.sum(axis=-1)
+    denom = np.maximum(counts, 1)
+
+    if classes is None:
+        pred = sums / denom
+        y_mean = (covered * y).sum(axis=-1, keepdims=True) / np.maximum(n_covered, 1)[..., None]
+        sse = (covered * (y - pred) ** 2).sum(axis=-1)
+        sst = (covered * (y - y_mean) ** 2).sum(axis=-1)
+        scores = 1.0 - sse / np.where(sst > 0, sst, 1.0)
+    else:
+        pred = classes.take(np.argmax(sums / denom[..., None], axis=-1))
+        scores = (covered & (pred == y)).sum(axis=-1) / np.maximum(n_covered, 1)
+
+    return scores, n_covered / y.shape[-1]
+
+
+def _score(y, pred, classes) -> float:
+    if classes is None:
+        return float(calculate_model_metrics(y, pred, "regression")["r2"])
+    return float(np.mean(y == pred))
+
+
+# ======================================================
+# TREE SUBSET SELECTION
+# ======================================================
+def select_trees(model, X, y, tolerance: float = COMPRESSION_TOLERANCE,
+                 min_coverage: float = COMPRESSION_MIN_OOB_COVERAGE) -> Dict[str, Any]:
+    """
+    Greedy forward selection of trees on out-of-bag predictions.
+
+    Rows are split in half: each step adds the tree that most improves the
+    out-of-bag score on the selection half, and selection stops at the
+    first subset whose out-of-bag score on the other half is within
+    ``tolerance`` of the full forest there (with ``min_coverage`` of those
+    rows covered). Out-of-bag scores of small subsets average fewer trees
+    per row than the subset itself does, so the stop is conservative.
+    """
+    y = np.asarray(y)
+    classes = getattr(model, "classes_", None)
+    weighted, mask = oob_contributions(model, X, len(y))
+
+    pick_rows, check_rows = train_test_split(
+        np.arange(len(y)), test_size=0.5, random_state=RANDOM_STATE,
+        stratify=y if classes is not None else None
+    )
+    pick_w, check_w = weighted[:, pick_rows], weighted[:, check_rows]
+    pick_m, check_m = mask[:, pick_rows], mask[:, check_rows]
+    y_pick, y_check = y[pick_rows], y[check_rows]
+
+    full_score, _ = _masked_scores(check_w.sum(axis=0), check_m.sum(axis=0), y_check, classes)
+    target = float(full_score) - tolerance
+
+    pick_sums, check_sums = np.zeros_like(pick_w[0]), np.zeros_like(check_w[0])
+    pick_counts, check_counts = np.zeros(len(y_pick)), np.zeros(len(y_check))
+    remaining = list(range(len(weighted)))
+    selected, curve = [], []
+
+    while remaining:
+        scores, _ = _masked_scores(
+            pick_sums + pick_w[remaining], pick_counts + pick_m[remaining], y_pick, classes
+        )
+        tree = remaining.pop(int(np.argmax(scores)))
+        selected.append(tree)
+        pick_sums += pick_w[tree]
+        pick_counts += pick_m[tree]
+        check_sums += check_w[tree]
+        check_counts += check_m[tree]
+
+        score, coverage = _masked_scores(check_sums, check_counts, y_check, classes)
+        curve.append(float(score))
+        if coverage >= min_coverage and score >= target:
+            break
+
+    return {
+        "indices": sorted(selected),
+        "oob_score": curve[-1],
+        "full_oob_score": float(full_score),
+        "curve": curve
+    }
+
+
+def subset_forest(model, indices: List[int]):
+    """Shallow copy of ``model`` that keeps only the trees in ``indices``."""
+    compact = copy.copy(model)
+    compact.estimators_ = [model.estimators_[i] for i in indices]
+    compact.n_estimators = len(indices)
+    return compact
+
+
+# ======================================================
+# DISTILLATION INTO A SHALLOW FOREST
+# ======================================================
+def distill_forest(teacher, X, y, students: List[Dict[str, Any]] = COMPRESSION_STUDENTS,
+                   tolerance: float = COMPRESSION_TOLERANCE) -> Dict[str, Any]:
+    """
+    Fit shallow student forests on the teacher's predictions, smallest
+    first. A student is accepted when its score on held-out rows is within
+    ``tolerance`` of the teacher's out-of-bag score on the same rows; the
+    accepted configuration is then refitted on every row.
+    """
+    y = np.asarray(y)
+    classes = getattr(teacher, "classes_", None)
+    rows = np.arange(len(y))
+    fit_rows, val_rows = train_test_split(
+        rows, test_size=0.2, random_state=RANDOM_STATE,
+        stratify=y if classes is not None else None
+    )
+
+    weighted, mask = oob_contributions(teacher, X, len(y))
+    reference, _ = _masked_scores(
+        weighted.sum(axis=0)[val_rows], mask.sum(axis=0)[val_rows], y[val_rows], classes
+    )
+    reference = float(reference)
+
+    targets = teacher.predict(X)
+    base = teacher.get_params()
+    tried, chosen = [], None
+    for params in students:
+        student = type(teacher)(**{**base, **params, "n_jobs": None})
+        student.fit(X[fit_rows], targets[fit_rows])
+        score = _score(y[val_rows], student.predict(X[val_rows]), classes)
+        tried.append({"params": params, "val_score": score})
+        if score >= reference - tolerance:
+            chosen = params
+            break
+
+    model = None
+    if chosen is not None:
+        model = type(teacher)(**{**base, **chosen}).fit(X, targets)
+    return {"model": model, "params": chosen, "reference_score": reference, "tried": tried}
+
+
+# ======================================================
+# COMPRESSION STEP
+# ======================================================
+def flat_size(model) -> Dict[str, int]:
+    flat = compile_model(model)
+    return {
+        "trees": flat.n_trees,
+        "nodes": int(len(flat.feature)),
+        "bytes": int(sum(a.nbytes for a in flat.to_arrays().values()))
+    }
+
+
+def compress_forest(model, X, y) -> Tuple[Any, Dict[str, Any]]:
+    """
+    Smallest of (tree subset, distilled student) that stays within the
+    tolerance; the full forest is kept when neither does.
+    """
+    if not isinstance(model, (RandomForestRegressor, RandomForestClassifier)):
+        raise TypeError(f"Only random forests can be compressed, got {type(model).__name__}")
+
+    selection = select_trees(model, X, y)
+    subset = subset_forest(model, selection["indices"])
+    distilled = distill_forest(model, X, y)
+
+    candidates = [("full", model)]
+    if selection["oob_score"] >= selection["full_oob_score"] - COMPRESSION_TOLERANCE:
+        candidates.append(("tree_subset", subset))
+    if distilled["model"] is not None:
+        candidates.append(("distilled", distilled["model"]))
+
+    sizes = {name: flat_size(m) for name, m in candidates}
+    chosen, compact = min(candidates, key=lambda c: sizes[c[0]]["bytes"])
+
+    report = {
+        "chosen": chosen,
+        "sizes": sizes,
+        "tree_subset": {k: v for k, v in selection.items() if k != "indices"},
+        "tree_subset_indices": selection["indices"],
+        "distilled": {k: v for k, v in distilled.items() if k != "model"}
+    }
+    return compact, report
+
+
+def main():
+    LOG.info("=" * 60)
+    LOG.info("FOREST COMPRESSION")
+    LOG.info("=" * 60)
+
+    regressor = load_pickle(MODEL_REG_PATH)
+    classifier = load_pickle(MODEL_CLF_PATH)
+    preprocessor = load_pickle(PREPROCESSOR_PATH)
+    label_encoder = load_pickle(ENCODER_PATH)
+    if FEATURE_PLAN_PATH.exists():
+        feature_plan = load_pickle(FEATURE_PLAN_PATH)
+    else:
+        feature_plan = FeaturePlan.from_preprocessor(preprocessor)
+
+    # Same split train.py used, so bootstrap rows line up with the trees
+    X_train, X_test, y_reg_train, y_reg_test, y_clf_train, y_clf_test, _ = prepare_data(load_data())
+    X = preprocessor.transform(X_train)
+    X_test = preprocessor.transform(X_test)
+
+    report = {"created": datetime.now().isoformat(timespec="seconds"), "tolerance": COMPRESSION_TOLERANCE}
+    compact = {}
+    for role, model, y, y_test, kind in [
+        ("regressor", regressor, y_reg_train, y_reg_test, "regression"),
+        ("classifier", classifier, y_clf_train, y_clf_test, "classification")
+    ]:
+        compact[role], report[role] = compress_forest(model, X, y)
+        report[role]["test"] = {
+            name: calculate_model_metrics(np.asarray(y_test), m.predict(X_test), kind)
+            for name, m in [("full", model), ("compact", compact[role])]
+        }
+        sizes = report[role]["sizes"]
+        LOG.info(
+            f"{role}: {report[role]['chosen']} | "
+            f"{sizes['full']['bytes'] / 1024 ** 2:.2f} MB -> "
+            f"{sizes[report[role]['chosen']]['bytes'] / 1024 ** 2:.2f} MB"
+        )
+
+    save_pickle(compact["regressor"], COMPACT_REG_PATH)
+    save_pickle(compact["classifier"], COMPACT_CLF_PATH)
+    report["bundle_version"] = save_bundle(
+        compact["regressor"], compact["classifier"], preprocessor,
+        label_encoder, feature_plan, COMPACT_BUNDLE_DIR
+    )
+
+    with open(COMPRESSION_REPORT_PATH, "w") as f:
+        json.dump(report, f, indent=2, default=float)
+    LOG.info(f"Compression report saved to {COMPRESSION_REPORT_PATH}")
+    return report
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,182 @@
+import json
+from typing import Dict, Tuple
+
+import numpy as np
+
+from config import (
+    JOINT_FOREST_PARAMS,
+    JOINT_WATER_WEIGHT,
+    JOINT_MODEL_PATH,
+    JOINT_BUNDLE_DIR,
+    MODEL_DIR,
+    MODEL_REG_PATH,
+    MODEL_CLF_PATH,
+    PREPROCESSOR_PATH,
+    ENCODER_PATH,
+    FEATURE_PLAN_PATH
+)
+from utils import setup_logging, load_pickle, save_pickle, calculate_model_metrics
+from flat_forest import FlatForest
+
+LOG = setup_logging()
+
+
+# ======================================================
+# JOINT FOREST (WATER VOLUME + RISK CLASS)
+# ======================================================
+class JointForest:
+    """
+    Water volume and risk class from one multi-output random forest.
+
+    The targets are the standardised water volume (times ``water_weight``)
+    and the one-hot risk class, so the summed-MSE criterion picks every
+    split for both outputs and each leaf stores the mean water volume and
+    the class proportions. One walk over the trees yields both answers.
+    ``forest`` is the fitted sklearn regressor or its FlatForest
+    compilation; both decode the same way.
+    """
+
+    def __init__(self, forest, water_mean: float, water_scale: float, classes: np.ndarray):
+        self.forest = forest
+        self.water_mean = float(water_mean)
+        self.water_scale = float(water_scale)
+        self.classes = np.asarray(classes)
+
+    @property
+    def n_trees(self) -> int:
+        if isinstance(self.forest, FlatForest):
+            return self.forest.n_trees
+        return len(self.forest.estimators_)
+
+    # --------------------------------------------------
+    # FIT
+    # --------------------------------------------------
+    @classmethod
+    def fit(cls, X, y_reg, y_clf, params: Dict = JOINT_FOREST_PARAMS,
+            water_weight: float = JOINT_WATER_WEIGHT) -> "JointForest":
+        from sklearn.ensemble import RandomForestRegressor
+
+        y_reg = np.asarray(y_reg, dtype=np.float64)
+        y_clf = np.asarray(y_clf)
+        classes = np.unique(y_clf)
+
+        water_mean = y_reg.mean()
+        water_scale = y_reg.std() / water_weight
+        targets = np.column_stack([
+            (y_reg - water_mean) / water_scale,
+            (y_clf[:, np.newaxis] == classes).astype(np.float64)
+        ])
+
+        forest = RandomForestRegressor(**params).fit(X, targets)
+        return cls(forest, water_mean, water_scale, classes)
+
+    # --------------------------------------------------
+    # PREDICT
+    # --------------------------------------------------
+    def predict_joint(self, X) -> Tuple[np.ndarray, np.ndarray]:
+        """(water volume, class proportions) from a single traversal."""
+        raw = self.forest.predict(X)
+        return raw[:, 0] * self.water_scale + self.water_mean, raw[:, 1:]
+
+    def predict_targets(self, X) -> Tuple[np.ndarray, np.ndarray]:
+        water, proba = self.predict_joint(X)
+        return water, self.classes.take(np.argmax(proba, axis=1), axis=0)
+
+    def predict_water(self, X) -> np.ndarray:
+        return self.predict_joint(X)[0]
+
+    def predict_proba(self, X) -> np.ndarray:
+        return self.predict_joint(X)[1]
+
+    def predict(self, X) -> np.ndarray:
+        return self.predict_targets(X)[1]
+
+    # --------------------------------------------------
+    # FLAT COMPILATION + BUNDLE ARRAYS
+    # --------------------------------------------------
+    def compiled(self) -> "JointForest":
+        if isinstance(self.forest, FlatForest):
+            return self
+        return JointForest(FlatForest.from_sklearn(self.forest),
+                           self.water_mean, self.water_scale, self.classes)
+
+    def to_arrays(self) -> Dict[str, np.ndarray]:
+        return {
+            **self.compiled().forest.to_arrays(),
+            "joint_decode": np.array([self.water_mean, self.water_scale]),
+            "joint_classes": self.classes
+        }
+
+    @classmethod
+    def from_arrays(cls, arrays: Dict[str, np.ndarray]) -> "JointForest":
+        water_mean, water_scale = (float(v) for v in arrays["joint_decode"])
+        forest = FlatForest.from_arrays({
+            k: v for k, v in arrays.items() if not k.startswith("joint_")
+        })
+        return cls(forest, water_mean, water_scale, np.asarray(arrays["joint_classes"]))
+
+
+# ======================================================
+# MAIN
+# ======================================================
+def main():
+    from dataLoad import load_data
+    from preprocess import prepare_data
+    from feature_plan import FeaturePlan
+    from model_bundle import save_bundle
+
+    LOG.info("=" * 60)
+    LOG.info("JOINT FOREST TRAINING (WATER + RISK, ONE TRAVERSAL)")
+    LOG.info("=" * 60)
+
+    # Reuse train.py's preprocessor and split so the separate models compare directly
+    preprocessor = load_pickle(PREPROCESSOR_PATH)
+    label_encoder = load_pickle(ENCODER_PATH)
+    if FEATURE_PLAN_PATH.exists():
+        feature_plan = load_pickle(FEATURE_PLAN_PATH)
+    else:
+        feature_plan = FeaturePlan.from_preprocessor(preprocessor)
+
+    X_train, X_test, y_reg_train, y_reg_test, y_clf_train, y_clf_test, _ = prepare_data(load_data())
+    X_train = preprocessor.transform(X_train)
+    X_test = preprocessor.transform(X_test)
+
+    joint = JointForest.fit(X_train, y_reg_train, y_clf_train)
+    water, risk = joint.predict_targets(X_test)
+
+    metrics = {
+        "joint": {
+            "regression": calculate_model_metrics(np.asarray(y_reg_test), water, "regression"),
+            "classification": calculate_model_metrics(np.asarray(y_clf_test), risk, "classification")
+        }
+    }
+    if MODEL_REG_PATH.exists() and MODEL_CLF_PATH.exists():
+        metrics["separate"] = {
+            "regression": calculate_model_metrics(
+                np.asarray(y_reg_test), load_pickle(MODEL_REG_PATH).predict(X_test), "regression"
+            ),
+            "classification": calculate_model_metrics(
+                np.asarray(y_clf_test), load_pickle(MODEL_CLF_PATH).predict(X_test), "classification"
+            )
+        }
+
+    for name, m in metrics.items():
+        LOG.info(
+            f"{name:8s} | RMSE={m['regression']['rmse']:.4f}, R²={m['regression']['r2']:.4f} | "
+            f"Accuracy={m['classification']['accuracy']:.4f}, F1={m['classification']['f1']:.4f}"
+        )
+
+    save_pickle(joint, JOINT_MODEL_PATH)
+    metrics["bundle_version"] = save_bundle(
+        None, None, preprocessor, label_encoder, feature_plan, JOINT_BUNDLE_DIR, joint=joint
+    )
+    with open(MODEL_DIR / "joint_metrics.json", "w") as f:
+        json.dump(metrics, f, indent=2)
+    LOG.info("Joint forest saved")
+    return metrics
+
+
+if __name__ == "__main__":
+    # Through the module, so the pickle refers to joint_forest.JointForest
+    import joint_forest
+    joint_forest.main()
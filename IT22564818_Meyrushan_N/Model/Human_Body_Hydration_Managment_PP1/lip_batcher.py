@@ -0,0 +1,149 @@
+import asyncio
+import time
+from collections import Counter, deque
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+
+from config_images import LIP_MAX_BATCH_SIZE, LIP_MAX_WAIT_MS
+from utils import setup_logging
+from ImagePredict import classify_batch
+
+LOG = setup_logging()
+
+
+# ======================================================
+# BATCHING METRICS
+# ======================================================
+class BatchMetrics:
+
+    def __init__(self, window: int = 10000):
+        self.batches = 0
+        self.requests = 0
+        self.batch_sizes = Counter()
+        self.queue_delays_ms = deque(maxlen=window)
+        self.inference_ms = deque(maxlen=window)
+
+    def record(self, batch_size: int, delays_ms: List[float], inference_ms: float):
+        self.batches += 1
+        self.requests += batch_size
+        self.batch_sizes[batch_size] += 1
+        self.queue_delays_ms.extend(delays_ms)
+        self.inference_ms.append(inference_ms)
+
+    @staticmethod
+    def _summary(values) -> Dict[str, float]:
+        if not values:
+            return {"mean": 0.0, "p50": 0.0, "p99": 0.0}
+        arr = np.fromiter(values, dtype=float)
+        return {
+            "mean": float(arr.mean()),
+            "p50": float(np.percentile(arr, 50)),
+            "p99": float(np.percentile(arr, 99))
+        }
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "batches": self.batches,
+            "requests": self.requests,
+            "mean_batch_size": self.requests / self.batches if self.batches else 0.0,
+            "batch_size_histogram": dict(sorted(self.batch_sizes.items())),
+            "queue_delay_ms": self._summary(self.queue_delays_ms),
+            "inference_ms": self._summary(self.inference_ms)
+        }
+
+
+# ======================================================
+# DYNAMIC MICRO-BATCHING SCHEDULER
+# ======================================================
+class LipBatchScheduler:
+    """
+    Groups concurrent lip-image requests into a single forward pass.
+
+    A batch is dispatched as soon as it reaches ``max_batch_size`` or the
+    oldest queued request has waited ``max_wait_ms``.
+    """
+
+    def __init__(self, model, class_names, executor=None,
+                 max_batch_size: int = LIP_MAX_BATCH_SIZE,
+                 max_wait_ms: float = LIP_MAX_WAIT_MS):
+        self.model = model
+        self.class_names = class_names
+        self.executor = executor
+        self.max_batch_size = max_batch_size
+        self.max_wait_s = max_wait_ms / 1000
+        self.metrics = BatchMetrics()
+        self._queue: asyncio.Queue = None
+        self._worker: asyncio.Task = None
+
+    def start(self):
+        self._queue = asyncio.Queue()
+        self._worker = asyncio.create_task(self._run())
+        LOG.info(
+            f"Lip batch scheduler started | max_batch_size={self.max_batch_size}, "
+            f"max_wait_ms={self.max_wait_s * 1000:.0f}"
+        )
+
+    async def stop(self):
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+
+    async def submit(self, image) -> Tuple[str, int, float]:
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((image, future, time.perf_counter()))
+        return await future
+
+    # --------------------------------------------------
+    # BATCH COLLECTION
+    # --------------------------------------------------
+    async def _collect(self) -> List[tuple]:
+        batch = [await self._queue.get()]
+        deadline = batch[0][2] + self.max_wait_s
+
+        while len(batch) < self.max_batch_size:
+            timeout = deadline - time.perf_counter()
+            if timeout <= 0:
+                # Still drain anything already waiting, without blocking
+                while len(batch) < self.max_batch_size and not self._queue.empty():
+                    batch.append(self._queue.get_nowait())
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+
+        return batch
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+
+        while True:
+            batch = await self._collect()
+            images = [item[0] for item in batch]
+
+            dispatched = time.perf_counter()
+            delays_ms = [(dispatched - item[2]) * 1000 for item in batch]
+
+            try:
+                results = await loop.run_in_executor(
+                    self.executor, classify_batch,
+                    images, self.model, self.class_names
+                )
+            except Exception as e:
+                LOG.error(f"Lip batch inference failed: {e}")
+                for _, future, _ in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            inference_ms = (time.perf_counter() - dispatched) * 1000
+            self.metrics.record(len(batch), delays_ms, inference_ms)
+
+            for (_, future, _), result in zip(batch, results):
+                if not future.done():
+                    future.set_result(result)
@@ -0,0 +1,196 @@
+import hashlib
+import json
+import os
+import shutil
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+import numpy as np
+import torch
+import torch.nn as nn
+from PIL import Image
+from torchvision import datasets
+
+from config import DATA_DIR, RANDOM_STATE
+from config_images import (
+    DEVICE,
+    IMG_SIZE,
+    LIP_EMBEDDING_CACHE_DIR,
+    LIP_EMBED_AUG_SEEDS,
+    LIP_AUGMENT_MODE
+)
+from preprocess_images import get_transforms, get_batch_sample_transform, BatchAugment
+from utils import setup_logging
+
+LOG = setup_logging()
+
+EMBED_BATCH_SIZE = 32
+
+
+# ======================================================
+# CACHE KEY (IMAGES + BACKBONE + PREPROCESSING)
+# ======================================================
+def images_fingerprint(samples: List[Tuple[str, int]]) -> str:
+    h = hashlib.sha256()
+    for path, label in samples:
+        st = os.stat(path)
+        h.update(f"{Path(path).name}:{label}:{st.st_size}:{st.st_mtime_ns};".encode())
+    return h.hexdigest()
+
+
+def backbone_fingerprint(model: nn.Module) -> str:
+    # The trainable fc head does not affect the embeddings
+    h = hashlib.sha256()
+    for name, tensor in model.state_dict().items():
+        if name.startswith("fc."):
+            continue
+        h.update(name.encode())
+        h.update(tensor.detach().cpu().contiguous().numpy().tobytes())
+    return h.hexdigest()
+
+
+def cache_key(samples, model, n_seeds: int, augment_mode: str) -> str:
+    h = hashlib.sha256()
+    for part in [
+        images_fingerprint(samples),
+        backbone_fingerprint(model),
+        augment_mode,
+        *map(repr, train_augmentation(augment_mode)),
+        repr(get_transforms(train=False)),
+        f"{IMG_SIZE}:{n_seeds}:{RANDOM_STATE}"
+    ]:
+        h.update(part.encode())
+    return h.hexdigest()[:16]
+
+
+# ======================================================
+# FROZEN BACKBONE FORWARD
+# ======================================================
+def backbone_of(model: nn.Module) -> nn.Module:
+    # Everything up to (and including) global average pooling → 512-d
+    return nn.Sequential(*list(model.children())[:-1], nn.Flatten()).eval()
+
+
+def augmentation_seed(seed_index: int, image_index: int, n_images: int) -> int:
+    return RANDOM_STATE + seed_index * n_images + image_index
+
+
+def train_augmentation(augment_mode: str):
+    """
+    ``(per-image transform, batch augment or None)``: the same training
+    augmentation ``dataLoad_images`` uses for ``augment_mode``.
+    """
+    if augment_mode == "batch":
+        return get_batch_sample_transform(store=False), BatchAugment()
+    if augment_mode == "sample":
+        return get_transforms(train=True), None
+    raise ValueError(f"Unknown augment mode: {augment_mode}")
+
+
+def _embed_all(backbone, samples, n_seeds, eval_out, aug_out, augment_mode):
+    train_tf, batch_augment = train_augmentation(augment_mode)
+    eval_tf = get_transforms(train=False)
+    n = len(samples)
+
+    def flush(tensors, targets):
+        x = torch.stack(tensors).to(DEVICE).contiguous(memory_format=torch.channels_last)
+        with torch.inference_mode():
+            emb = backbone(x).float().cpu().numpy()
+        for (array, row), vec in zip(targets, emb):
+            array[row] = vec
+
+    # Seeding per view must not disturb the caller's RNG stream
+    rng_state = torch.get_rng_state()
+    tensors, targets = [], []
+    for i, (path, _) in enumerate(samples):
+        # Decode once, then derive the eval view and every augmented view
+        image = Image.open(path).convert("RGB")
+        tensors.append(eval_tf(image))
+        targets.append((eval_out, i))
+
+        if batch_augment is not None:
+            # One uint8 copy per seed; BatchAugment draws each row's own params
+            torch.manual_seed(augmentation_seed(0, i, n))
+            raw = train_tf(image).unsqueeze(0).expand(n_seeds, -1, -1, -1)
+            for s, view in enumerate(batch_augment(raw)):
+                tensors.append(view)
+                targets.append((aug_out[s], i))
+        else:
+            for s in range(n_seeds):
+                torch.manual_seed(augmentation_seed(s, i, n))
+                tensors.append(train_tf(image))
+                targets.append((aug_out[s], i))
+
+        if len(tensors) >= EMBED_BATCH_SIZE:
+            flush(tensors, targets)
+            tensors, targets = [], []
+
+    if tensors:
+        flush(tensors, targets)
+    torch.set_rng_state(rng_state)
+
+
+# ======================================================
+# BUILD / LOAD
+# ======================================================
+def load_embedding_cache(model: nn.Module, n_seeds: int = LIP_EMBED_AUG_SEEDS,
+                         cache_dir: Path = LIP_EMBEDDING_CACHE_DIR,
+                         data_dir: Path = DATA_DIR,
+                         augment_mode: str = LIP_AUGMENT_MODE) -> Dict[str, np.ndarray]:
+    """
+    Return memory-mapped backbone embeddings for every image in
+    ``data_dir`` (ImageFolder order): ``eval`` (N, 512) without
+    augmentation and ``train_aug`` (n_seeds, N, 512), one deterministic
+    augmentation per seed, drawn like ``augment_mode`` training does.
+    Rebuilt whenever the images, backbone weights or transforms change.
+    """
+    samples = datasets.ImageFolder(data_dir).samples
+    key = cache_key(samples, model, n_seeds, augment_mode)
+    path = cache_dir / key
+
+    if not (path / "meta.json").exists():
+        _build(model, samples, n_seeds, key, cache_dir, augment_mode)
+    else:
+        LOG.info(f"Lip embedding cache hit | Key: {key}")
+
+    return {
+        "key": key,
+        "eval": np.load(path / "eval.npy", mmap_mode="r"),
+        "train_aug": np.load(path / "train_aug.npy", mmap_mode="r"),
+        "labels": np.load(path / "labels.npy")
+    }
+
+
+def _build(model, samples, n_seeds, key, cache_dir, augment_mode):
+    backbone = backbone_of(model).to(DEVICE)
+    with torch.inference_mode():
+        dim = backbone(torch.zeros(1, 3, IMG_SIZE, IMG_SIZE, device=DEVICE)).shape[1]
+    n = len(samples)
+
+    LOG.info(f"Building lip embedding cache | Images: {n} | Seeds: {n_seeds} | Key: {key}")
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    tmp = cache_dir / f".{key}.tmp"
+    shutil.rmtree(tmp, ignore_errors=True)
+    tmp.mkdir()
+
+    eval_out = np.lib.format.open_memmap(
+        tmp / "eval.npy", mode="w+", dtype=np.float32, shape=(n, dim)
+    )
+    aug_out = np.lib.format.open_memmap(
+        tmp / "train_aug.npy", mode="w+", dtype=np.float32, shape=(n_seeds, n, dim)
+    )
+    _embed_all(backbone, samples, n_seeds, eval_out, aug_out, augment_mode)
+    eval_out.flush()
+    aug_out.flush()
+    del eval_out, aug_out
+
+    np.save(tmp / "labels.npy", np.array([label for _, label in samples], dtype=np.int64))
+    with open(tmp / "meta.json", "w") as f:
+        json.dump({"key": key, "images": n, "seeds": n_seeds, "dim": int(dim),
+                   "augment_mode": augment_mode}, f, indent=2)
+
+    # Publish, then drop caches for older images/weights
+    os.replace(tmp, cache_dir / key)
+    for stale in cache_dir.iterdir():
+        if stale.is_dir() and stale.name != key:
+            shutil.rmtree(stale, ignore_errors=True)
@@ -0,0 +1,354 @@
+import argparse
+import io
+import json
+import multiprocessing
+import os
+import time
+
+import numpy as np
+import torch
+import torch.nn as nn
+from sklearn.metrics import (
+    accuracy_score,
+    precision_score,
+    recall_score,
+    f1_score,
+    classification_report,
+    confusion_matrix
+)
+from torch.utils.data import DataLoader, Subset
+from torchvision import datasets
+
+from config import DATA_DIR
+from config_images import (
+    BATCH_SIZE,
+    DEVICE,
+    IMG_SIZE,
+    MODEL_OUT,
+    LIP_CLASS_NAMES,
+    LIP_SCRIPTED_OUT,
+    LIP_QUANTIZED_OUT,
+    LIP_QUANT_REPORT,
+    LIP_QUANT_MODE,
+    LIP_QUANT_BACKEND,
+    LIP_QUANT_CALIBRATION_BATCHES,
+    LIP_QUANT_MAX_ACCURACY_DROP,
+    LIP_QUANT_MAX_F1_DROP
+)
+from utils import setup_logging, proc_status_mb, reset_peak_rss
+from ImagePredict import load_eager_model, to_model_input, lip_autocast, bf16_supported
+from preprocess_images import get_transforms
+
+LOG = setup_logging()
+
+
+def example_input(batch_size: int = 1):
+    x = torch.randn(batch_size, 3, IMG_SIZE, IMG_SIZE, device=DEVICE)
+    return x.contiguous(memory_format=torch.channels_last)
+
+
+# ======================================================
+# EXPORT: TRACE → FREEZE (CONV+BN FOLDED) → SAVE
+# ======================================================
+def freeze_model(model, batch_size: int = 1):
+    """
+    Trace an eager lip model on a channels-last example and freeze it.
+
+    Freezing inlines the weights as constants, which lets TorchScript fold
+    every BatchNorm into its preceding convolution and drop the Dropout.
+    """
+    example = example_input(batch_size)
+
+    with torch.no_grad():
+        traced = torch.jit.trace(model, example)
+        frozen = torch.jit.freeze(traced.eval())
+
+        # Run twice so the profiling executor settles on the optimized graph
+        frozen(example)
+        frozen(example)
+
+    return frozen
+
+
+def verify_frozen_model(eager, frozen, batch_size: int = 8, atol: float = 1e-4) -> float:
+    x = example_input(batch_size)
+
+    with torch.inference_mode():
+        diff = (eager(x) - frozen(x)).abs().max().item()
+
+    if diff > atol:
+        raise AssertionError(
+            f"Frozen lip model differs from eager model: max abs diff {diff:.2e}"
+        )
+    return diff
+
+
+def save_scripted(model, out_path):
+    # Write then rename, so a loader never sees a half-written file
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = out_path.with_suffix(out_path.suffix + ".tmp")
+    torch.jit.save(model, str(tmp_path))
+    os.replace(tmp_path, out_path)
+
+
+def export_frozen_model(class_names=LIP_CLASS_NAMES, out_path=LIP_SCRIPTED_OUT):
+    eager = load_eager_model(class_names)
+    frozen = freeze_model(eager)
+    diff = verify_frozen_model(eager, frozen)
+
+    save_scripted(frozen, out_path)
+    LOG.info(f"Frozen lip model saved | Max abs diff: {diff:.2e} | Path: {out_path}")
+    return out_path
+
+
+# ======================================================
+# EVALUATION (SAME METRICS AS imageModelEvaluation)
+# ======================================================
+def evaluate_lip_model(model, test_loader, class_names, bf16: bool = False):
+    y_true, y_pred = [], []
+
+    with torch.inference_mode(), lip_autocast(bf16):
+        for images, labels in test_loader:
+            outputs = model(to_model_input(images))
+            preds = torch.argmax(outputs, dim=1)
+
+            y_true.extend(labels.numpy())
+            y_pred.extend(preds.cpu().numpy())
+
+    return {
+        "accuracy": float(accuracy_score(y_true, y_pred)),
+        "precision": float(precision_score(y_true, y_pred, average="weighted", zero_division=0)),
+        "recall": float(recall_score(y_true, y_pred, average="weighted", zero_division=0)),
+        "f1_score": float(f1_score(y_true, y_pred, average="weighted", zero_division=0)),
+        "confusion_matrix": confusion_matrix(y_true, y_pred).tolist(),
+        "classification_report": classification_report(
+            y_true, y_pred, target_names=class_names, output_dict=True, zero_division=0
+        )
+    }
+
+
+def measure_latency(model, batch_size: int, iters: int = 20, bf16: bool = False):
+    x = example_input(batch_size)
+
+    with torch.inference_mode(), lip_autocast(bf16):
+        for _ in range(3):
+            model(x)
+
+        latencies = []
+        for _ in range(iters):
+            start = time.perf_counter()
+            model(x)
+            latencies.append(time.perf_counter() - start)
+
+    latencies = np.array(latencies) * 1000
+    return {
+        "latency_ms_p50": float(np.percentile(latencies, 50)),
+        "latency_ms_p99": float(np.percentile(latencies, 99)),
+        "images_per_s": float(batch_size * 1000 / latencies.mean())
+    }
+
+
+def serialized_size_mb(scripted) -> float:
+    buffer = io.BytesIO()
+    torch.jit.save(scripted, buffer)
+    return buffer.tell() / 1024 ** 2
+
+
+# ======================================================
+# BFLOAT16 VS FP32
+# ======================================================
+def _inference_peak_rss_mb(class_names, batch_size, bf16):
+    # Runs in a fresh process so the allocator holds no freed blocks;
+    # the peak is reset after the model load
+    model = load_eager_model(class_names)
+    x = example_input(batch_size)
+    if not reset_peak_rss():
+        # The peak would still include the model load
+        return None
+    baseline = proc_status_mb("VmRSS")
+    with torch.inference_mode(), lip_autocast(bf16):
+        model(x)
+    peak = proc_status_mb("VmHWM")
+    return None if peak is None or baseline is None else peak - baseline
+
+
+def inference_peak_memory_mb(class_names, batch_size: int = BATCH_SIZE, bf16: bool = False):
+    """Forward-pass peak RSS over the loaded model (Linux only, else None)."""
+    if not os.path.exists("/proc/self/clear_refs"):
+        return None
+    ctx = multiprocessing.get_context("spawn")
+    with ctx.Pool(1) as pool:
+        return pool.apply(_inference_peak_rss_mb, (class_names, batch_size, bf16))
+
+
+def compare_bf16(test_loader, class_names, latency_iters: int = 20):
+    """
+    Evaluate the eager lip model in FP32 and under bf16 autocast: test
+    metrics, batch latency/throughput and forward-pass peak memory, plus
+    bf16-minus-FP32 deltas. Only reports support when the CPU lacks bf16.
+    """
+    if not bf16_supported():
+        return {"bf16_supported": False}
+
+    model = load_eager_model(class_names)
+    runs = {}
+    for name, bf16 in [("fp32", False), ("bf16", True)]:
+        metrics = evaluate_lip_model(model, test_loader, class_names, bf16=bf16)
+        runs[name] = {
+            "accuracy": metrics["accuracy"],
+            "f1_score": metrics["f1_score"],
+            **measure_latency(model, BATCH_SIZE, latency_iters, bf16=bf16),
+            "peak_memory_mb": inference_peak_memory_mb(class_names, BATCH_SIZE, bf16)
+        }
+
+    fp32, bf16 = runs["fp32"], runs["bf16"]
+    return {
+        "bf16_supported": True,
+        "batch_size": BATCH_SIZE,
+        **runs,
+        "delta": {
+            "accuracy": bf16["accuracy"] - fp32["accuracy"],
+            "f1_score": bf16["f1_score"] - fp32["f1_score"],
+            "throughput_ratio": bf16["images_per_s"] / fp32["images_per_s"],
+            "peak_memory_mb": (
+                None if fp32["peak_memory_mb"] is None or bf16["peak_memory_mb"] is None
+                else bf16["peak_memory_mb"] - fp32["peak_memory_mb"]
+            )
+        }
+    }
+
+
+# ======================================================
+# INT8 POST-TRAINING QUANTIZATION
+# ======================================================
+def calibration_loader(train_dataset):
+    # Training-split images with eval transforms; test images stay unseen
+    dataset = datasets.ImageFolder(DATA_DIR, transform=get_transforms(train=False))
+    return DataLoader(
+        Subset(dataset, train_dataset.indices), batch_size=BATCH_SIZE, shuffle=False
+    )
+
+
+def quantize_static(model, calib_loader, n_batches: int = LIP_QUANT_CALIBRATION_BATCHES):
+    """
+    FX graph-mode static quantization: conv+bn+relu are fused, observers
+    record activation ranges on calibration images, then every conv and
+    linear runs as an INT8 kernel (residual adds included).
+    """
+    from torch.ao.quantization import get_default_qconfig_mapping
+    from torch.ao.quantization.quantize_fx import prepare_fx, convert_fx
+
+    torch.backends.quantized.engine = LIP_QUANT_BACKEND
+    prepared = prepare_fx(
+        model.cpu().eval(), get_default_qconfig_mapping(LIP_QUANT_BACKEND), (example_input(),)
+    )
+
+    with torch.inference_mode():
+        for i, (images, _) in enumerate(calib_loader):
+            if i >= n_batches:
+                break
+            prepared(to_model_input(images))
+
+    return convert_fx(prepared)
+
+
+def quantize_dynamic(model):
+    # Weights-only INT8 for the Linear head; convolutions stay FP32
+    torch.backends.quantized.engine = LIP_QUANT_BACKEND
+    return torch.ao.quantization.quantize_dynamic(
+        model.cpu().eval(), {nn.Linear}, dtype=torch.qint8
+    )
+
+
+def export_quantized_model(mode: str = LIP_QUANT_MODE, class_names=None,
+                           out_path=LIP_QUANTIZED_OUT, latency_iters: int = 20):
+    """
+    Quantize the trained lip model, gate it on test-split accuracy/F1
+    against FP32, and only publish the INT8 artifact if the gate passes.
+    A report with metrics, latency, throughput and size is always written.
+    """
+    from dataLoad_images import load_data_images
+
+    if DEVICE.type != "cpu":
+        raise RuntimeError("INT8 lip model export requires a CPU device")
+
+    _, test_loader, detected_classes, train_dataset = load_data_images()
+    class_names = class_names or detected_classes
+
+    fp32 = freeze_model(load_eager_model(class_names))
+
+    if mode == "static":
+        quantized = quantize_static(
+            load_eager_model(class_names), calibration_loader(train_dataset)
+        )
+    elif mode == "dynamic":
+        quantized = quantize_dynamic(load_eager_model(class_names))
+    else:
+        raise ValueError(f"Unknown quantization mode: {mode}")
+    int8 = freeze_model(quantized)
+
+    metrics = {
+        "fp32": evaluate_lip_model(fp32, test_loader, class_names),
+        "int8": evaluate_lip_model(int8, test_loader, class_names)
+    }
+    accuracy_drop = metrics["fp32"]["accuracy"] - metrics["int8"]["accuracy"]
+    f1_drop = metrics["fp32"]["f1_score"] - metrics["int8"]["f1_score"]
+    passed = (
+        accuracy_drop <= LIP_QUANT_MAX_ACCURACY_DROP
+        and f1_drop <= LIP_QUANT_MAX_F1_DROP
+    )
+
+    performance = {
+        name: {
+            "size_mb": serialized_size_mb(model),
+            **{
+                f"bs{bs}": measure_latency(model, bs, latency_iters)
+                for bs in (1, BATCH_SIZE)
+            }
+        }
+        for name, model in [("fp32", fp32), ("int8", int8)]
+    }
+
+    report = {
+        "mode": mode,
+        "backend": LIP_QUANT_BACKEND,
+        "threads": torch.get_num_threads(),
+        "source_model": str(MODEL_OUT),
+        "metrics": metrics,
+        "accuracy_drop": accuracy_drop,
+        "f1_drop": f1_drop,
+        "max_accuracy_drop": LIP_QUANT_MAX_ACCURACY_DROP,
+        "max_f1_drop": LIP_QUANT_MAX_F1_DROP,
+        "passed": passed,
+        "published": str(out_path) if passed else None,
+        "performance": performance
+    }
+
+    with open(LIP_QUANT_REPORT, "w") as f:
+        json.dump(report, f, indent=2)
+
+    if not passed:
+        LOG.warning(
+            f"INT8 lip model rejected | Accuracy drop: {accuracy_drop:.4f} "
+            f"| F1 drop: {f1_drop:.4f} | Report: {LIP_QUANT_REPORT}"
+        )
+        return report
+
+    save_scripted(int8, out_path)
+    LOG.info(
+        f"INT8 lip model saved ({mode}) | Accuracy drop: {accuracy_drop:.4f} "
+        f"| F1 drop: {f1_drop:.4f} | Path: {out_path}"
+    )
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Export serving artifacts for the lip model")
+    parser.add_argument("--quantize", choices=["static", "dynamic"],
+                        help="Also build a gated INT8 model")
+    args = parser.parse_args()
+
+    export_frozen_model()
+    if args.quantize:
+        report = export_quantized_model(args.quantize)
+        raise SystemExit(0 if report["passed"] else 1)
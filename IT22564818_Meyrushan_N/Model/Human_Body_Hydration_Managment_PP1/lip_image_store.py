@@ -0,0 +1,188 @@
+import argparse
+import json
+import os
+import shutil
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import numpy as np
+import torch
+from PIL import Image
+from torch.utils.data import Dataset
+from torchvision import datasets
+
+from config import DATA_DIR
+from config_images import IMG_SIZE, LIP_IMAGE_STORE_DIR, LIP_STORE_SHARD_SIZE
+from utils import setup_logging
+
+LOG = setup_logging()
+
+MANIFEST_NAME = "manifest.json"
+STORE_FORMAT_VERSION = 1
+
+
+# ======================================================
+# MANIFEST
+# ======================================================
+def _file_state(path: Path) -> Dict[str, int]:
+    st = path.stat()
+    return {"size": st.st_size, "mtime_ns": st.st_mtime_ns}
+
+
+def load_manifest(store_dir: Path = LIP_IMAGE_STORE_DIR) -> Optional[Dict[str, Any]]:
+    path = store_dir / MANIFEST_NAME
+    if not path.exists():
+        return None
+    with open(path) as f:
+        manifest = json.load(f)
+    if (manifest.get("format_version") != STORE_FORMAT_VERSION
+            or manifest.get("img_size") != IMG_SIZE):
+        return None
+    return manifest
+
+
+def _write_manifest(manifest: Dict[str, Any], store_dir: Path):
+    tmp = store_dir / (MANIFEST_NAME + ".tmp")
+    with open(tmp, "w") as f:
+        json.dump(manifest, f, indent=1)
+    os.replace(tmp, store_dir / MANIFEST_NAME)
+
+
+# ======================================================
+# INGESTION (DECODE + RESIZE ONCE)
+# ======================================================
+def decode_resized(path: Path) -> np.ndarray:
+    # Same resample as transforms.Resize((IMG_SIZE, IMG_SIZE)) on a PIL image
+    image = Image.open(path).convert("RGB")
+    image = image.resize((IMG_SIZE, IMG_SIZE), Image.BILINEAR)
+    return np.asarray(image, dtype=np.uint8)
+
+
+def ingest_images(data_dir: Path = DATA_DIR, store_dir: Path = LIP_IMAGE_STORE_DIR,
+                  rebuild: bool = False) -> Dict[str, Any]:
+    """
+    Convert the class folders under ``data_dir`` into uint8 shards of
+    shape (n, IMG_SIZE, IMG_SIZE, 3) plus a JSON manifest of
+    (path, label, shard, row). Incremental: unchanged files keep their
+    rows, new or modified files go into fresh shards, deleted files are
+    dropped. Shards left with no live rows are removed.
+    """
+    folder = datasets.ImageFolder(data_dir)
+    manifest = None if rebuild else load_manifest(store_dir)
+
+    if manifest is None or manifest["classes"] != folder.classes:
+        shutil.rmtree(store_dir, ignore_errors=True)
+        manifest = {
+            "format_version": STORE_FORMAT_VERSION,
+            "img_size": IMG_SIZE,
+            "classes": folder.classes,
+            "next_shard": 0,
+            "entries": []
+        }
+    store_dir.mkdir(parents=True, exist_ok=True)
+
+    known = {e["path"]: e for e in manifest["entries"]}
+    entries, pending = [], []
+    for path, label in folder.samples:
+        rel = os.path.relpath(path, data_dir)
+        state = _file_state(Path(path))
+        old = known.get(rel)
+        if old is not None and old["label"] == label and all(old[k] == v for k, v in state.items()):
+            entries.append(old)
+        else:
+            pending.append((rel, label, state))
+
+    for start in range(0, len(pending), LIP_STORE_SHARD_SIZE):
+        chunk = pending[start:start + LIP_STORE_SHARD_SIZE]
+        shard_id = manifest["next_shard"]
+        shard_name = f"shard_{shard_id:05d}.npy"
+
+        array = np.lib.format.open_memmap(
+            store_dir / (shard_name + ".tmp"), mode="w+", dtype=np.uint8,
+            shape=(len(chunk), IMG_SIZE, IMG_SIZE, 3)
+        )
+        for row, (rel, label, state) in enumerate(chunk):
+            array[row] = decode_resized(data_dir / rel)
+            entries.append({"path": rel, "label": label, **state,
+                            "shard": shard_name, "row": row})
+        array.flush()
+        del array
+        os.replace(store_dir / (shard_name + ".tmp"), store_dir / shard_name)
+        manifest["next_shard"] = shard_id + 1
+
+    # Keep ImageFolder order so index-based splits stay meaningful
+    order = {os.path.relpath(p, data_dir): i for i, (p, _) in enumerate(folder.samples)}
+    entries.sort(key=lambda e: order[e["path"]])
+    manifest["entries"] = entries
+    _write_manifest(manifest, store_dir)
+
+    live = {e["shard"] for e in entries}
+    for shard in store_dir.glob("shard_*.npy"):
+        if shard.name not in live:
+            shard.unlink()
+
+    LOG.info(
+        f"Lip image store up to date | Images: {len(entries)} | "
+        f"Ingested: {len(pending)} | Shards: {len(live)}"
+    )
+    return manifest
+
+
+# ======================================================
+# MEMORY-MAPPED DATASET
+# ======================================================
+class ShardedImageDataset(Dataset):
+    """
+    ImageFolder-compatible view over the uint8 shard store.
+
+    Items are (CHW uint8 tensor, label). Shards are memory-mapped
+    copy-on-write, so ``torch.from_numpy`` wraps the mapped pages without
+    copying; ``transform`` (see preprocess_images.get_tensor_transforms)
+    handles augmentation, float conversion and normalization.
+    """
+
+    def __init__(self, store_dir: Path = LIP_IMAGE_STORE_DIR, transform=None):
+        manifest = load_manifest(store_dir)
+        if manifest is None:
+            raise FileNotFoundError(f"No lip image store at {store_dir}; run ingest_images()")
+
+        self.store_dir = store_dir
+        self.transform = transform
+        self.classes = manifest["classes"]
+        self.class_to_idx = {c: i for i, c in enumerate(self.classes)}
+        self.entries = manifest["entries"]
+        self.targets = [e["label"] for e in self.entries]
+        self.samples = [(str(DATA_DIR / e["path"]), e["label"]) for e in self.entries]
+        self._shards: Dict[str, np.ndarray] = {}
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def _shard(self, name: str) -> np.ndarray:
+        # Opened lazily so each DataLoader worker maps its own view
+        shard = self._shards.get(name)
+        if shard is None:
+            shard = np.load(self.store_dir / name, mmap_mode="c")
+            self._shards[name] = shard
+        return shard
+
+    def __getitem__(self, index: int):
+        entry = self.entries[index]
+        image = torch.from_numpy(self._shard(entry["shard"])[entry["row"]]).permute(2, 0, 1)
+        if self.transform is not None:
+            image = self.transform(image)
+        return image, entry["label"]
+
+    def __getstate__(self):
+        # Memory maps are not picklable; workers reopen them
+        state = self.__dict__.copy()
+        state["_shards"] = {}
+        return state
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build the sharded lip image store")
+    parser.add_argument("--rebuild", action="store_true")
+    args = parser.parse_args()
+
+    ingest_images(rebuild=args.rebuild)
@@ -0,0 +1,171 @@
+import hashlib
+import json
+import pickle
+import shutil
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict
+
+import numpy as np
+import sklearn
+
+from config import BUNDLE_DIR, BUNDLE_FORMAT_VERSION, BUNDLE_VERIFY_CHECKSUMS
+from utils import setup_logging, ensure_dir
+from flat_forest import FLAT_KINDS, compile_model, flat_kind
+from joint_forest import JointForest
+
+LOG = setup_logging()
+
+MANIFEST_NAME = "manifest.json"
+OBJECTS_NAME = "objects.pkl"
+FOREST_NAMES = ["regressor", "classifier"]
+BUNDLE_KINDS = {**FLAT_KINDS, "flat_joint": JointForest}
+
+
+# ======================================================
+# HELPERS
+# ======================================================
+def _sha256(path: Path, chunk_size: int = 1 << 20) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ModelBundle:
+
+    def __init__(self, manifest: Dict[str, Any], objects: Dict[str, Any],
+                 regressor, classifier, joint=None):
+        self.manifest = manifest
+        self.regressor = regressor
+        self.classifier = classifier
+        self.joint = joint
+        self.preprocessor = objects["preprocessor"]
+        self.label_encoder = objects["label_encoder"]
+        self.feature_plan = objects["feature_plan"]
+
+    @property
+    def version(self) -> str:
+        return self.manifest["bundle_version"]
+
+
+# ======================================================
+# SAVE
+# ======================================================
+def save_bundle(regressor, classifier, preprocessor, label_encoder,
+                feature_plan, bundle_dir: Path = BUNDLE_DIR, joint: JointForest = None) -> str:
+    """
+    Write one versioned bundle directory.
+
+    Forest node arrays (random forest or gradient boosting, see
+    ``flat_forest.compile_model``) are stored as raw ``.npy`` files so they
+    can be memory-mapped read-only and shared between worker processes; the
+    small fitted objects go into a single pickle. The bundle version is
+    derived from the file checksums, so identical models give identical
+    versions. A ``joint`` forest is stored on its own and may replace the
+    regressor / classifier pair (pass None for those).
+    """
+    tmp_dir = bundle_dir.with_name(bundle_dir.name + ".tmp")
+    if tmp_dir.exists():
+        shutil.rmtree(tmp_dir)
+    ensure_dir(tmp_dir)
+
+    engines = {}
+    for name, model in [("regressor", regressor), ("classifier", classifier), ("joint", joint)]:
+        if model is None:
+            continue
+        if name == "joint":
+            flat, engines[name] = model.compiled(), "flat_joint"
+        else:
+            flat = compile_model(model)
+            engines[name] = flat_kind(flat)
+        forest_dir = ensure_dir(tmp_dir / name)
+        for key, array in flat.to_arrays().items():
+            np.save(forest_dir / f"{key}.npy", np.ascontiguousarray(array),
+                    allow_pickle=False)
+
+    with open(tmp_dir / OBJECTS_NAME, "wb") as f:
+        pickle.dump(
+            {
+                "preprocessor": preprocessor,
+                "label_encoder": label_encoder,
+                "feature_plan": feature_plan
+            },
+            f,
+            protocol=pickle.HIGHEST_PROTOCOL
+        )
+
+    files = {}
+    for path in sorted(tmp_dir.rglob("*")):
+        if path.is_file():
+            rel = path.relative_to(tmp_dir).as_posix()
+            files[rel] = {"sha256": _sha256(path), "bytes": path.stat().st_size}
+
+    version = hashlib.sha256(
+        json.dumps(files, sort_keys=True).encode()
+    ).hexdigest()[:16]
+
+    manifest = {
+        "format_version": BUNDLE_FORMAT_VERSION,
+        "bundle_version": version,
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "sklearn_version": sklearn.__version__,
+        "numpy_version": np.__version__,
+        "engines": engines,
+        "files": files
+    }
+    with open(tmp_dir / MANIFEST_NAME, "w") as f:
+        json.dump(manifest, f, indent=2)
+
+    # Swap in the finished bundle so readers never see a partial one
+    if bundle_dir.exists():
+        shutil.rmtree(bundle_dir)
+    tmp_dir.rename(bundle_dir)
+
+    LOG.info(f"Model bundle saved | Version: {version} | Path: {bundle_dir}")
+    return version
+
+
+# ======================================================
+# LOAD
+# ======================================================
+def bundle_exists(bundle_dir: Path = BUNDLE_DIR) -> bool:
+    return (bundle_dir / MANIFEST_NAME).exists()
+
+
+def load_bundle(bundle_dir: Path = BUNDLE_DIR,
+                verify: bool = BUNDLE_VERIFY_CHECKSUMS) -> ModelBundle:
+    manifest_path = bundle_dir / MANIFEST_NAME
+    if not manifest_path.exists():
+        raise FileNotFoundError(manifest_path)
+
+    with open(manifest_path) as f:
+        manifest = json.load(f)
+
+    if manifest.get("format_version") != BUNDLE_FORMAT_VERSION:
+        raise ValueError(
+            f"Unsupported bundle format {manifest.get('format_version')} "
+            f"(expected {BUNDLE_FORMAT_VERSION})"
+        )
+
+    if verify:
+        for rel, info in manifest["files"].items():
+            if _sha256(bundle_dir / rel) != info["sha256"]:
+                raise IOError(f"Checksum mismatch in model bundle: {rel}")
+
+    # Bundles written before boosting support hold random forests only
+    engines = manifest.get("engines", {name: "flat_forest" for name in FOREST_NAMES})
+    forests = {}
+    for name, kind in engines.items():
+        forests[name] = BUNDLE_KINDS[kind].from_arrays({
+            path.stem: np.load(path, mmap_mode="r", allow_pickle=False)
+            for path in (bundle_dir / name).glob("*.npy")
+        })
+
+    with open(bundle_dir / OBJECTS_NAME, "rb") as f:
+        objects = pickle.load(f)
+
+    LOG.info(f"Model bundle loaded | Version: {manifest['bundle_version']}")
+    return ModelBundle(manifest, objects, forests.get("regressor"),
+                       forests.get("classifier"), forests.get("joint"))
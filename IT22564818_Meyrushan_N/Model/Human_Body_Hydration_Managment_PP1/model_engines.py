@@ -0,0 +1,55 @@
+from typing import Any, Dict, List
+
+from sklearn.ensemble import (
+    RandomForestRegressor,
+    RandomForestClassifier,
+    HistGradientBoostingRegressor,
+    HistGradientBoostingClassifier
+)
+
+from config import (
+    RF_REGRESSOR_PARAMS,
+    RF_CLASSIFIER_PARAMS,
+    HGB_REGRESSOR_PARAMS,
+    HGB_CLASSIFIER_PARAMS,
+    USE_TUNED_PARAMS
+)
+
+
+# ======================================================
+# ENGINE REGISTRY
+# (ONE REGRESSOR + ONE CLASSIFIER PER MODEL FAMILY)
+# ======================================================
+ENGINES: Dict[str, Dict[str, Any]] = {
+    "random_forest": {
+        "regressor": (RandomForestRegressor, RF_REGRESSOR_PARAMS),
+        "classifier": (RandomForestClassifier, RF_CLASSIFIER_PARAMS)
+    },
+    "hist_gradient_boosting": {
+        "regressor": (HistGradientBoostingRegressor, HGB_REGRESSOR_PARAMS),
+        "classifier": (HistGradientBoostingClassifier, HGB_CLASSIFIER_PARAMS)
+    }
+}
+
+
+def engine_names() -> List[str]:
+    return list(ENGINES)
+
+
+def engine_params(engine: str, role: str) -> Dict[str, Any]:
+    if engine not in ENGINES:
+        raise ValueError(f"Unknown model engine: {engine} (choose from {engine_names()})")
+    _, params = ENGINES[engine][role]
+
+    # tune.py searches random-forest params only
+    if USE_TUNED_PARAMS and engine == "random_forest":
+        from tune import load_tuned_params
+        params = load_tuned_params(role, params)
+    return params
+
+
+def build_estimator(engine: str, role: str):
+    """Unfitted ``role`` ("regressor" / "classifier") model for ``engine``."""
+    params = engine_params(engine, role)
+    model_cls, _ = ENGINES[engine][role]
+    return model_cls(**params)
@@ -1,11 +1,35 @@
+import hashlib
+from functools import lru_cache
 import pandas as pd
 import numpy as np
-import requests
-from typing import Dict, Any, Tuple, List
-
-from config import MODEL_REG_PATH, MODEL_CLF_PATH, PREPROCESSOR_PATH, ENCODER_PATH
+from typing import Dict, Any, Tuple, List, Sequence, Union
+
+from config import (
+    MODEL_REG_PATH,
+    MODEL_CLF_PATH,
+    BUNDLE_DIR,
+    COMPACT_REG_PATH,
+    COMPACT_CLF_PATH,
+    COMPACT_BUNDLE_DIR,
+    USE_COMPACT_MODELS,
+    JOINT_MODEL_PATH,
+    JOINT_BUNDLE_DIR,
+    USE_JOINT_MODEL,
+    PREPROCESSOR_PATH,
+    ENCODER_PATH,
+    FEATURE_PLAN_PATH,
+    TIME_SLOT_MAPPING,
+    USE_FLAT_FOREST,
+    FLAT_FOREST_MAX_ROWS,
+    PREDICTION_CACHE_ENABLED
+)
 from utils import setup_logging, load_pickle
 from feature_eng import apply_feature_engineering
+from flat_forest import compile_model
+from feature_plan import FeaturePlan, TIME_SLOT_FIELD
+from model_bundle import bundle_exists, load_bundle
+from result_cache import PredictionCache, canonicalize_input
+from weather import WeatherProvider
 
 LOG = setup_logging()
 
@@ -33,28 +57,130 @@ RAW_REQUIRED_FIELDS = [
 # =====================================================
 class AdvancedPredictor:
 
-    def __init__(self):
+    def __init__(self, compact: bool = USE_COMPACT_MODELS, joint: bool = USE_JOINT_MODEL):
+        # Compressed forests from forest_compression.py, or the full ones
+        if compact:
+            self.reg_path, self.clf_path, self.bundle_dir = (
+                COMPACT_REG_PATH, COMPACT_CLF_PATH, COMPACT_BUNDLE_DIR
+            )
+        else:
+            self.reg_path, self.clf_path, self.bundle_dir = (
+                MODEL_REG_PATH, MODEL_CLF_PATH, BUNDLE_DIR
+            )
+        # One forest for both targets (joint_forest.py) replaces the pair
+        self.joint_path = JOINT_MODEL_PATH if joint else None
+        if joint:
+            self.bundle_dir = JOINT_BUNDLE_DIR
         self.regressor = None
         self.classifier = None
         self.preprocessor = None
         self.label_encoder = None
+        self.feature_plan = None
+        self.regressor_engine = None
+        self.classifier_engine = None
+        self.joint = None
+        self.joint_engine = None
+        self.bundle_version = None
+        self.model_version = None
+        self.result_cache = PredictionCache() if PREDICTION_CACHE_ENABLED else None
         self.is_loaded = False
 
     def load_models(self):
+        if USE_FLAT_FOREST and bundle_exists(self.bundle_dir):
+            self.load_bundle()
+            return
+
         LOG.info("Loading trained hydration models...")
-        self.regressor = load_pickle(MODEL_REG_PATH)
-        self.classifier = load_pickle(MODEL_CLF_PATH)
+        if self.joint_path is not None:
+            self.joint = load_pickle(self.joint_path)
+        else:
+            self.regressor = load_pickle(self.reg_path)
+            self.classifier = load_pickle(self.clf_path)
         self.preprocessor = load_pickle(PREPROCESSOR_PATH)
         self.label_encoder = load_pickle(ENCODER_PATH)
+
+        # Older artifact sets have no exported plan; compile it on the fly
+        if FEATURE_PLAN_PATH.exists():
+            self.feature_plan = load_pickle(FEATURE_PLAN_PATH)
+        else:
+            self.feature_plan = FeaturePlan.from_preprocessor(self.preprocessor)
+
+        if self.joint is not None:
+            self.joint_engine = self.joint.compiled() if USE_FLAT_FOREST else self.joint
+        elif USE_FLAT_FOREST:
+            self.regressor_engine = compile_model(self.regressor)
+            self.classifier_engine = compile_model(self.classifier)
+        else:
+            self.regressor_engine = self.regressor
+            self.classifier_engine = self.classifier
+
+        self.model_version = self.pickle_fingerprint()
+        self.is_loaded = True
+
+    def pickle_fingerprint(self) -> str:
+        # Cheap stand-in for a bundle version: changes whenever train.py rewrites the pickles
+        h = hashlib.sha256()
+        models = [self.joint_path] if self.joint_path is not None else [self.reg_path, self.clf_path]
+        for path in models + [PREPROCESSOR_PATH, ENCODER_PATH]:
+            st = path.stat()
+            h.update(f"{path.name}:{st.st_size}:{st.st_mtime_ns};".encode())
+        return "pickles-" + h.hexdigest()[:12]
+
+    def load_bundle(self):
+        LOG.info("Loading hydration model bundle...")
+        bundle = load_bundle(self.bundle_dir)
+
+        self.preprocessor = bundle.preprocessor
+        self.label_encoder = bundle.label_encoder
+        self.feature_plan = bundle.feature_plan
+        self.regressor_engine = bundle.regressor
+        self.classifier_engine = bundle.classifier
+        self.joint_engine = bundle.joint
+        self.bundle_version = bundle.version
+        self.model_version = bundle.version
+
+        # sklearn forests are only needed for large batches (loaded lazily)
+        self.regressor = None
+        self.classifier = None
+        self.joint = None
         self.is_loaded = True
 
+    def batch_models(self, n_rows: int):
+        if n_rows <= FLAT_FOREST_MAX_ROWS:
+            return self.regressor_engine, self.classifier_engine
+
+        if self.regressor is None and self.reg_path.exists() and self.clf_path.exists():
+            self.regressor = load_pickle(self.reg_path)
+            self.classifier = load_pickle(self.clf_path)
+
+        if self.regressor is None:
+            return self.regressor_engine, self.classifier_engine
+        return self.regressor, self.classifier
+
+    def batch_joint(self, n_rows: int):
+        if n_rows <= FLAT_FOREST_MAX_ROWS:
+            return self.joint_engine
+
+        if self.joint is None and self.joint_path.exists():
+            self.joint = load_pickle(self.joint_path)
+        return self.joint if self.joint is not None else self.joint_engine
+
+    def predict_targets(self, X: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Water volume and encoded risk class for each row of ``X``."""
+        if self.joint_engine is not None:
+            return self.batch_joint(len(X)).predict_targets(X)
+        regressor, classifier = self.batch_models(len(X))
+        return regressor.predict(X), classifier.predict(X)
+
     def validate_input(self, user_input: Dict[str, Any]):
         missing = [f for f in RAW_REQUIRED_FIELDS if f not in user_input]
         if missing:
             raise ValueError(f"Missing inputs: {missing}")
 
     def preprocess_input(self, user_input: Dict[str, Any]) -> np.ndarray:
-        df = pd.DataFrame([user_input])
+        return self.feature_plan.transform_one(user_input)
+
+    def preprocess_batch(self, df: pd.DataFrame) -> np.ndarray:
         df = apply_feature_engineering(df)
         return self.preprocessor.transform(df)
 
@@ -63,28 +189,35 @@ class AdvancedPredictor:
             self.load_models()
 
         self.validate_input(user_input)
-        X = self.preprocess_input(user_input)
+        if self.result_cache is None:
+            return self.predict_uncached(user_input)
+
+        # The canonical form only keys the cache: a miss scores the input as
+        # sent, and only the model outputs are shared between nearby inputs
+        canonical = canonicalize_input(user_input, RAW_REQUIRED_FIELDS)
+        water, hydration_risk = self.result_cache.get_or_compute(
+            self.model_version, canonical, lambda _: self.score_input(user_input)
+        )
+        return self.build_response(user_input, water, hydration_risk)
 
-        water = float(self.regressor.predict(X)[0])
-        risk_code = self.classifier.predict(X)[0]
-        hydration_risk = self.label_encoder.inverse_transform([risk_code])[0]
+    def predict_uncached(self, user_input: Dict[str, Any]) -> Dict[str, Any]:
+        return self.build_response(user_input, *self.score_input(user_input))
 
-        # -------- Novel Rule-Based Preventive Risks --------
+    def score_input(self, user_input: Dict[str, Any]) -> Tuple[float, str]:
+        X = self.preprocess_input(user_input)
+        water, risk_code = self.predict_targets(X)
+        hydration_risk = self.label_encoder.inverse_transform([risk_code[0]])[0]
+        return round(float(water[0]), 2), hydration_risk
+
+    def build_response(self, user_input: Dict[str, Any], water: float,
+                       hydration_risk: str) -> Dict[str, Any]:
         temp = user_input["Temperature_C"]
         humidity = user_input["Humidity_%"]
-        urine = user_input["Urine Color (Most Recent Urination)"]
-        sweat = user_input["Sweating Level (Last 4 Hours)"]
-
-        disease_risk_profile = {
-            "heat_exhaustion": "High" if temp >= 32 else "Moderate" if temp >= 28 else "Low",
-            "kidney_stress": "High" if urine >= 7 else "Moderate" if urine >= 5 else "Low",
-            "migraine": "Moderate" if humidity >= 70 else "Low",
-            "electrolyte_imbalance": "Moderate" if sweat in ["Heavy", "Very Heavy"] else "Low"
-        }
+        disease_risk_profile = self.assess_disease_risk(user_input)
 
         return {
             "hydration_prediction": {
-                "recommended_water_liters_next_4h": round(water, 2),
+                "recommended_water_liters_next_4h": water,
                 "hydration_risk_level": hydration_risk
             },
             "disease_risk_profile": disease_risk_profile,
@@ -98,6 +231,157 @@ class AdvancedPredictor:
             )
         }
 
+    # -------------------------------------------------
+    # DAY PLAN (ALL SIX TIME SLOTS IN ONE PASS)
+    # -------------------------------------------------
+    def predict_day(
+        self, user_input: Dict[str, Any], slot_weather: Sequence[Tuple[float, float]]
+    ) -> pd.DataFrame:
+        """
+        Score every 4-hour window of the day from one set of user inputs.
+
+        ``slot_weather`` holds one (temperature, humidity) pair per
+        ``TIME_SLOT_MAPPING`` window, e.g. from ``weather.aggregate_forecast``.
+        Returns one row per window with the same columns as ``predict_batch``.
+        """
+        if not self.is_loaded:
+            self.load_models()
+
+        slots = sorted(TIME_SLOT_MAPPING, key=TIME_SLOT_MAPPING.get)
+        if len(slot_weather) != len(slots):
+            raise ValueError(
+                f"Expected weather for {len(slots)} time slots, got {len(slot_weather)}"
+            )
+
+        rows = [
+            {**user_input, "Temperature_C": temp, "Humidity_%": hum, TIME_SLOT_FIELD: slot}
+            for slot, (temp, hum) in zip(slots, slot_weather)
+        ]
+        self.validate_input(rows[0])
+
+        X = np.vstack([self.preprocess_input(row) for row in rows])
+        water, risk_codes = self.predict_targets(X)
+        water = water.astype(float).round(2)
+        hydration_risk = self.label_encoder.inverse_transform(risk_codes)
+
+        disease_risk = [self.assess_disease_risk(row) for row in rows]
+
+        result = pd.DataFrame({
+            "recommended_water_liters_next_4h": water,
+            "hydration_risk_level": hydration_risk,
+            **{col: [d[col] for d in disease_risk] for col in disease_risk[0]},
+            "temperature_celsius": [row["Temperature_C"] for row in rows],
+            "humidity_percent": [row["Humidity_%"] for row in rows],
+            "time_window": slots,
+            "recommendations": [
+                self.generate_recommendations(r, d)
+                for r, d in zip(hydration_risk, disease_risk)
+            ]
+        })
+        return result
+
+    # -------------------------------------------------
+    # BATCH SCORING (ONE PASS PER BATCH)
+    # -------------------------------------------------
+    def predict_batch(
+        self, inputs: Union[pd.DataFrame, List[Dict[str, Any]]]
+    ) -> pd.DataFrame:
+        if not self.is_loaded:
+            self.load_models()
+
+        df = inputs if isinstance(inputs, pd.DataFrame) else pd.DataFrame(inputs)
+        df = df.reset_index(drop=True)
+
+        missing = [f for f in RAW_REQUIRED_FIELDS if f not in df.columns]
+        if missing:
+            raise ValueError(f"Missing inputs: {missing}")
+
+        X = self.preprocess_batch(df)
+
+        water, risk_codes = self.predict_targets(X)
+        water = water.astype(float).round(2)
+        hydration_risk = self.label_encoder.inverse_transform(risk_codes)
+
+        disease_risk = self.assess_disease_risk_batch(df)
+
+        result = pd.DataFrame({
+            "recommended_water_liters_next_4h": water,
+            "hydration_risk_level": hydration_risk,
+        })
+        for col in disease_risk.columns:
+            result[col] = disease_risk[col]
+
+        result["temperature_celsius"] = df["Temperature_C"]
+        result["humidity_percent"] = df["Humidity_%"]
+        result["time_window"] = df["Time Slot (Select Your Current 4-Hour Window)"]
+        result["recommendations"] = self.generate_recommendations_batch(
+            hydration_risk, disease_risk
+        )
+
+        LOG.info(f"Batch prediction completed | Rows: {len(result)}")
+        return result
+
+    # -------- Novel Rule-Based Preventive Risks --------
+    @staticmethod
+    def assess_disease_risk(user_input: Dict[str, Any]) -> Dict[str, str]:
+        temp = user_input["Temperature_C"]
+        humidity = user_input["Humidity_%"]
+        urine = user_input["Urine Color (Most Recent Urination)"]
+        sweat = user_input["Sweating Level (Last 4 Hours)"]
+
+        return {
+            "heat_exhaustion": "High" if temp >= 32 else "Moderate" if temp >= 28 else "Low",
+            "kidney_stress": "High" if urine >= 7 else "Moderate" if urine >= 5 else "Low",
+            "migraine": "Moderate" if humidity >= 70 else "Low",
+            "electrolyte_imbalance": "Moderate" if sweat in ["Heavy", "Very Heavy"] else "Low"
+        }
+
+    @staticmethod
+    def assess_disease_risk_batch(df: pd.DataFrame) -> pd.DataFrame:
+        temp = df["Temperature_C"].to_numpy(dtype=float)
+        humidity = df["Humidity_%"].to_numpy(dtype=float)
+        urine = df["Urine Color (Most Recent Urination)"].to_numpy(dtype=float)
+        sweat = df["Sweating Level (Last 4 Hours)"]
+
+        return pd.DataFrame({
+            "heat_exhaustion": np.select(
+                [temp >= 32, temp >= 28], ["High", "Moderate"], default="Low"
+            ),
+            "kidney_stress": np.select(
+                [urine >= 7, urine >= 5], ["High", "Moderate"], default="Low"
+            ),
+            "migraine": np.where(humidity >= 70, "Moderate", "Low"),
+            "electrolyte_imbalance": np.where(
+                sweat.isin(["Heavy", "Very Heavy"]).to_numpy(), "Moderate", "Low"
+            )
+        })
+
+    @staticmethod
+    def generate_recommendations_batch(risk, disease_risk: pd.DataFrame) -> List[List[str]]:
+        risk = np.asarray(risk)
+        flags = np.column_stack([
+            np.isin(risk, ["High", "Moderate"]),
+            disease_risk["heat_exhaustion"].to_numpy() == "High",
+            disease_risk["electrolyte_imbalance"].to_numpy() != "Low"
+        ])
+        conditional = [
+            "Increase water intake gradually over the next 4 hours.",
+            "High temperature detected – risk of heat exhaustion.",
+            "Maintain electrolyte balance if sweating increases."
+        ]
+        always = [
+            "Avoid excessive caffeine and sugary drinks.",
+            "This guidance is preventive and not a medical diagnosis."
+        ]
+
+        # Only 2^3 distinct recommendation lists exist, so build each once
+        codes = flags @ np.array([1, 2, 4])
+        table = {
+            code: [r for bit, r in enumerate(conditional) if code >> bit & 1] + always
+            for code in np.unique(codes)
+        }
+        return [list(table[c]) for c in codes]
+
     @staticmethod
     def generate_recommendations(risk, disease_risk) -> List[str]:
         recs = []
@@ -114,19 +398,14 @@ class AdvancedPredictor:
 # =====================================================
 # WEATHER API
 # =====================================================
+@lru_cache(maxsize=None)
+def _weather_provider() -> WeatherProvider:
+    return WeatherProvider()
+
+
 def get_current_weather(lat: float, lon: float) -> Tuple[float, float]:
-    try:
-        url = (
-            "https://api.open-meteo.com/v1/forecast"
-            f"?latitude={lat}&longitude={lon}"
-            "&current=temperature_2m,relative_humidity_2m"
-        )
-        r = requests.get(url, timeout=10)
-        r.raise_for_status()
-        c = r.json()["current"]
-        return float(c["temperature_2m"]), float(c["relative_humidity_2m"])
-    except Exception:
-        return 25.0, 50.0
+    # Same timeout, cache, circuit breaker and fallback as the HTTP service
+    return _weather_provider().get_sync(lat, lon)
 
 # =====================================================
 # USER-FRIENDLY TERMINAL INPUT (FIXED LOGIC)
@@ -1,5 +1,14 @@
+import math
+from itertools import permutations
+
+import torch
+import torch.nn.functional as F
+from torch.utils.data import default_collate
 from torchvision import transforms
-from config import IMG_SIZE
+from config_images import IMG_SIZE
+
+IMAGENET_MEAN = [0.485, 0.456, 0.406]
+IMAGENET_STD = [0.229, 0.224, 0.225]
 
 
 # ======================================================
@@ -38,6 +47,146 @@ def get_transforms(train: bool = True):
         ])
 
 
+# ======================================================
+# PRE-RESIZED uint8 TENSORS (SHARDED IMAGE STORE)
+# ======================================================
+def get_tensor_transforms(train: bool = True):
+    """
+    Same pipeline as ``get_transforms`` for CHW uint8 tensors that were
+    already resized to IMG_SIZE at ingestion (lip_image_store.py).
+    ConvertImageDtype divides by 255 exactly like ToTensor.
+    """
+
+    if train:
+        return transforms.Compose([
+            transforms.RandomHorizontalFlip(p=0.5),
+            transforms.RandomRotation(10),
+            transforms.ColorJitter(
+                brightness=0.1,
+                contrast=0.1,
+                saturation=0.1
+            ),
+            transforms.ConvertImageDtype(torch.float32),
+            transforms.Normalize(mean=IMAGENET_MEAN, std=IMAGENET_STD)
+        ])
+    else:
+        return transforms.Compose([
+            transforms.ConvertImageDtype(torch.float32),
+            transforms.Normalize(mean=IMAGENET_MEAN, std=IMAGENET_STD)
+        ])
+
+
+# ======================================================
+# BATCHED AUGMENTATION (AFTER COLLATION)
+# ======================================================
+def get_batch_sample_transform(store: bool = True):
+    """
+    Per-image work left when augmenting whole batches: nothing for the
+    pre-resized store, Resize + PILToTensor (uint8, no scaling) for PIL.
+    """
+    if store:
+        return None
+    return transforms.Compose([
+        transforms.Resize((IMG_SIZE, IMG_SIZE)),
+        transforms.PILToTensor()
+    ])
+
+
+class BatchAugment:
+    """
+    The ``get_tensor_transforms(train=True)`` pipeline for a whole
+    (B, 3, H, W) uint8 batch in a few vectorized ops: per-sample flip,
+    rotation in [-degrees, degrees] (nearest, zero fill), and brightness /
+    contrast / saturation jitter in a per-sample random order, then
+    /255 + ImageNet normalization. Each image draws its own parameters,
+    so the per-image distribution matches the torchvision version; the
+    jitter blends run in float instead of re-quantizing to uint8 between
+    steps.
+    """
+
+    def __init__(self, flip_p: float = 0.5, degrees: float = 10.0,
+                 brightness: float = 0.1, contrast: float = 0.1, saturation: float = 0.1):
+        self.flip_p = flip_p
+        self.degrees = degrees
+        self.jitter = {"brightness": brightness, "contrast": contrast, "saturation": saturation}
+        self.orders = list(permutations(self.jitter))
+
+    def __repr__(self):
+        params = {"flip_p": self.flip_p, "degrees": self.degrees, **self.jitter}
+        return f"BatchAugment({', '.join(f'{k}={v}' for k, v in params.items())})"
+
+    @staticmethod
+    def _grayscale(x):
+        r, g, b = x.unbind(dim=1)
+        return (0.2989 * r + 0.587 * g + 0.114 * b).unsqueeze(1)
+
+    def _flip(self, x):
+        flip = torch.rand(x.shape[0], device=x.device) < self.flip_p
+        return torch.where(flip.view(-1, 1, 1, 1), x.flip(-1), x)
+
+    def _rotate(self, x):
+        n, _, h, w = x.shape
+        angle = (torch.rand(n, device=x.device) * 2 - 1) * math.radians(self.degrees)
+        cos, sin = torch.cos(angle), torch.sin(angle)
+
+        # Output->input sampling grid for a counter-clockwise rotation
+        # about the centre, corrected for non-square normalized coordinates
+        theta = torch.zeros(n, 2, 3, device=x.device, dtype=x.dtype)
+        theta[:, 0, 0] = cos
+        theta[:, 0, 1] = -sin * h / w
+        theta[:, 1, 0] = sin * w / h
+        theta[:, 1, 1] = cos
+        grid = F.affine_grid(theta, list(x.shape), align_corners=False)
+        return F.grid_sample(x, grid, mode="nearest", padding_mode="zeros", align_corners=False)
+
+    def _color_op(self, name, x, factor):
+        if name == "brightness":
+            blend_with = torch.zeros_like(x)
+        elif name == "contrast":
+            blend_with = self._grayscale(x).mean(dim=(1, 2, 3), keepdim=True)
+        else:
+            blend_with = self._grayscale(x)
+        return (factor * x + (1 - factor) * blend_with).clamp_(0, 1)
+
+    def _color_jitter(self, x):
+        n = x.shape[0]
+        factors = {
+            name: (1 + (torch.rand(n, 1, 1, 1, device=x.device) * 2 - 1) * strength)
+            for name, strength in self.jitter.items()
+        }
+        order = torch.randint(len(self.orders), (n,), device=x.device)
+
+        out = torch.empty_like(x)
+        for k, names in enumerate(self.orders):
+            idx = (order == k).nonzero().squeeze(1)
+            if idx.numel() == 0:
+                continue
+            part = x[idx]
+            for name in names:
+                part = self._color_op(name, part, factors[name][idx])
+            out[idx] = part
+        return out
+
+    def __call__(self, images):
+        x = images.float().div_(255)
+        x = self._rotate(self._flip(x))
+        x = self._color_jitter(x)
+        mean = x.new_tensor(IMAGENET_MEAN).view(1, 3, 1, 1)
+        std = x.new_tensor(IMAGENET_STD).view(1, 3, 1, 1)
+        return (x - mean) / std
+
+
+class AugmentingCollate:
+    """DataLoader ``collate_fn``: stack uint8 samples, then augment the batch."""
+
+    def __init__(self, augment=None):
+        self.augment = augment or BatchAugment()
+
+    def __call__(self, batch):
+        images, labels = default_collate(batch)
+        return self.augment(images), labels
+
+
 # ======================================================
 # TEST
 # ======================================================
@@ -0,0 +1,135 @@
+import copy
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Iterable, Optional
+
+from config import (
+    PREDICTION_CACHE_MAX_ENTRIES,
+    PREDICTION_CACHE_TTL_S,
+    PREDICTION_CACHE_QUANTA
+)
+
+
+# ======================================================
+# INPUT CANONICALIZATION
+# ======================================================
+def quantize(value: Any, step: float) -> Any:
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return value
+    if number != number:
+        return value
+    return round(round(number / step) * step, 6)
+
+
+def canonicalize_input(user_input: Dict[str, Any], fields: Iterable[str],
+                       quanta: Dict[str, float] = PREDICTION_CACHE_QUANTA) -> Dict[str, Any]:
+    """
+    Reduce an input dict to ``fields`` only, with numeric values rounded
+    to their ``quanta`` step and strings stripped. Extra keys (e.g.
+    Latitude) are dropped since the model never reads them.
+    """
+    canonical = {}
+    for field in fields:
+        value = user_input[field]
+        if field in quanta:
+            value = quantize(value, quanta[field])
+        elif isinstance(value, str):
+            value = value.strip()
+        canonical[field] = value
+    return canonical
+
+
+# ======================================================
+# LRU + TTL RESULT CACHE
+# ======================================================
+class PredictionCache:
+    """
+    Bounded LRU cache of prediction results.
+
+    Keys are ``(model_version, canonical input)``, so results computed by
+    a previous model never match once a retrained bundle is loaded.
+    Thread-safe: predictions run on the server's executor threads.
+    """
+
+    def __init__(self, max_entries: int = PREDICTION_CACHE_MAX_ENTRIES,
+                 ttl_s: float = PREDICTION_CACHE_TTL_S):
+        self.max_entries = max_entries
+        self.ttl_s = ttl_s
+        # key -> (stored_at, result), least recently used first
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        self._version: Optional[str] = None
+
+        self.counters = {
+            "hits": 0,
+            "misses": 0,
+            "expired": 0,
+            "evictions": 0,
+            "invalidations": 0,
+            "uncacheable": 0
+        }
+
+    @staticmethod
+    def make_key(model_version: Optional[str], canonical: Dict[str, Any]) -> Hashable:
+        return (model_version, tuple(canonical.items()))
+
+    def get_or_compute(self, model_version: Optional[str], canonical: Dict[str, Any],
+                       compute: Callable[[Dict[str, Any]], Any]) -> Any:
+        try:
+            key = self.make_key(model_version, canonical)
+            hash(key)
+        except TypeError:
+            # Unhashable input values (e.g. lists) are scored uncached
+            with self._lock:
+                self.counters["uncacheable"] += 1
+            return compute(canonical)
+
+        with self._lock:
+            self._check_version(model_version)
+            entry = self._entries.get(key)
+            if entry is not None:
+                if time.monotonic() - entry[0] < self.ttl_s:
+                    self._entries.move_to_end(key)
+                    self.counters["hits"] += 1
+                    return copy.deepcopy(entry[1])
+                del self._entries[key]
+                self.counters["expired"] += 1
+            self.counters["misses"] += 1
+
+        # Compute outside the lock; a concurrent duplicate just recomputes
+        result = compute(canonical)
+
+        with self._lock:
+            self._entries[key] = (time.monotonic(), copy.deepcopy(result))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.counters["evictions"] += 1
+
+        return result
+
+    def _check_version(self, model_version: Optional[str]):
+        # Old-version entries can never hit again; free them at once
+        if model_version != self._version:
+            if self._entries:
+                self.counters["invalidations"] += len(self._entries)
+                self._entries.clear()
+            self._version = model_version
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, object]:
+        with self._lock:
+            lookups = self.counters["hits"] + self.counters["misses"]
+            return {
+                **self.counters,
+                "hit_ratio": self.counters["hits"] / lookups if lookups else 0.0,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "model_version": self._version
+            }
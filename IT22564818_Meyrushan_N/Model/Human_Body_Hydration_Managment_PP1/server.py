@@ -0,0 +1,319 @@
+import asyncio
+import base64
+import io
+import math
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from datetime import datetime
+from typing import Dict, Any, Iterable
+
+from fastapi import FastAPI, File, HTTPException, UploadFile
+from PIL import Image, UnidentifiedImageError
+
+from config import (
+    SERVER_HOST,
+    SERVER_PORT,
+    INFERENCE_WORKERS,
+    TIME_SLOT_MAPPING
+)
+from config_images import LIP_CLASS_NAMES
+from utils import setup_logging
+from predict import AdvancedPredictor, RAW_REQUIRED_FIELDS
+from feature_plan import RAW_NUMERIC_COLS
+from weather import WeatherProvider, aggregate_forecast, N_TIME_SLOTS
+from ImagePredict import load_model, get_recommendation
+from lip_batcher import LipBatchScheduler
+
+LOG = setup_logging()
+
+# =====================================================
+# FLUTTER FORM KEYS → MODEL INPUT FIELDS
+# (see FrontEnd/.../screens/hydration/form_screen.dart)
+# =====================================================
+FORM_FIELD_ALIASES = {
+    "Exercise_Time_Last_4_Hours": "Exercise Time (minutes) in Last 4 Hours",
+    "Urinated_Last_4_Hours": "Urinated (Last 4 Hours)",
+    "Urine_Color": "Urine Color (Most Recent Urination)",
+    "Thirsty": "Thirsty (Right Now)",
+    "Dizziness": "Dizziness (Right Now)",
+    "Fatigue": "Fatigue / Tiredness (Right Now)",
+    "Headache": "Headache (Right Now)",
+    "Sweating_Level": "Sweating Level (Last 4 Hours)",
+    "Time_Slot": "Time Slot (Select Your Current 4-Hour Window)"
+}
+
+TIME_SLOT_FIELD = "Time Slot (Select Your Current 4-Hour Window)"
+TIME_SLOTS = list(TIME_SLOT_MAPPING)
+
+# Filled in by the service when absent (weather lookup / current time)
+DEFAULTED_FIELDS = ["Temperature_C", "Humidity_%", TIME_SLOT_FIELD]
+LOCATION_FIELDS = ["Latitude", "Longitude"]
+
+
+# =====================================================
+# SHARED STATE (LOADED ONCE AT STARTUP)
+# =====================================================
+class ServiceState:
+
+    def __init__(self):
+        self.predictor = None
+        self.lip_model = None
+        self.lip_scheduler = None
+        self.weather = None
+        self.executor = None
+
+    def load(self):
+        LOG.info("Loading inference models for HTTP service...")
+        self.predictor = AdvancedPredictor()
+        self.predictor.load_models()
+        self.lip_model = load_model(LIP_CLASS_NAMES)
+        self.weather = WeatherProvider()
+        self.executor = ThreadPoolExecutor(
+            max_workers=INFERENCE_WORKERS,
+            thread_name_prefix="inference"
+        )
+        LOG.info(f"Service ready | Inference workers: {INFERENCE_WORKERS}")
+
+    def close(self):
+        if self.executor is not None:
+            self.executor.shutdown(wait=True)
+
+
+STATE = ServiceState()
+
+
+async def run_blocking(fn, *args):
+    # Keep CPU-bound model calls off the event loop
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(STATE.executor, fn, *args)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    STATE.load()
+    STATE.lip_scheduler = LipBatchScheduler(
+        STATE.lip_model, LIP_CLASS_NAMES, executor=STATE.executor
+    )
+    STATE.lip_scheduler.start()
+    yield
+    await STATE.lip_scheduler.stop()
+    STATE.close()
+
+
+app = FastAPI(title="Human Body Hydration API", lifespan=lifespan)
+
+
+# =====================================================
+# REQUEST HELPERS
+# =====================================================
+def current_time_slot(now: datetime = None) -> str:
+    now = now or datetime.now()
+    return TIME_SLOTS[now.hour // 4]
+
+
+def _json_type(value: Any) -> str:
+    return "null" if value is None else type(value).__name__
+
+
+def _coerce_number(field: str, value: Any, errors: list) -> Any:
+    # Numbers and numeric strings ("30") are accepted; bool, null and text are not
+    if isinstance(value, bool) or value is None:
+        errors.append(f"{field}: expected a number, got {_json_type(value)}")
+        return value
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        errors.append(f"{field}: expected a number, got {value!r}")
+        return value
+    if not math.isfinite(number):
+        errors.append(f"{field}: expected a finite number, got {value!r}")
+    return number
+
+
+def validate_form_input(user_input: Dict[str, Any], required: Iterable[str]) -> Dict[str, Any]:
+    """
+    Coerce numeric fields to float and check that text answers are
+    strings. Fields in ``required`` must be present; the other model and
+    location fields are checked only when given. Every problem is
+    reported in one 422, before anything reaches the model.
+    """
+    required = set(required)
+    errors = []
+    for field in list(RAW_REQUIRED_FIELDS) + LOCATION_FIELDS:
+        if field not in user_input:
+            if field in required:
+                errors.append(f"{field}: field required")
+            continue
+        value = user_input[field]
+        if field in RAW_NUMERIC_COLS or field in LOCATION_FIELDS:
+            user_input[field] = _coerce_number(field, value, errors)
+        elif not isinstance(value, str) or not value.strip():
+            errors.append(f"{field}: expected a non-empty string, got {_json_type(value)}")
+
+    if errors:
+        raise HTTPException(status_code=422, detail=errors)
+    return user_input
+
+
+async def build_form_input(payload: Dict[str, Any]) -> Dict[str, Any]:
+    user_input = {FORM_FIELD_ALIASES.get(k, k): v for k, v in payload.items()}
+    required = [f for f in RAW_REQUIRED_FIELDS if f not in DEFAULTED_FIELDS]
+    validate_form_input(user_input, required)
+    user_input.setdefault(TIME_SLOT_FIELD, current_time_slot())
+
+    if "Temperature_C" not in user_input or "Humidity_%" not in user_input:
+        if "Latitude" in user_input and "Longitude" in user_input:
+            temp, hum = await STATE.weather.get(
+                float(user_input["Latitude"]),
+                float(user_input["Longitude"])
+            )
+        else:
+            temp, hum = STATE.weather.fallback
+        user_input.setdefault("Temperature_C", temp)
+        user_input.setdefault("Humidity_%", hum)
+
+    return user_input
+
+
+def build_day_input(payload: Dict[str, Any]) -> Dict[str, Any]:
+    # Weather and time slot come per window from the day plan
+    user_input = {FORM_FIELD_ALIASES.get(k, k): v for k, v in payload.items()}
+    required = [f for f in RAW_REQUIRED_FIELDS if f not in DEFAULTED_FIELDS]
+    return validate_form_input(user_input, required)
+
+
+async def day_plan_weather(user_input: Dict[str, Any]):
+    # Caller-supplied hourly forecast wins, then a looked-up forecast,
+    # then any current reading repeated across the day
+    hourly = user_input.pop("hourly", None)
+    if hourly is not None:
+        try:
+            return aggregate_forecast(hourly, STATE.weather.fallback)
+        except (KeyError, TypeError, ValueError) as e:
+            raise HTTPException(status_code=422, detail=f"Invalid hourly forecast: {e}")
+
+    if "Latitude" in user_input and "Longitude" in user_input:
+        return await STATE.weather.get_day(
+            float(user_input["Latitude"]),
+            float(user_input["Longitude"])
+        )
+
+    reading = (
+        user_input.get("Temperature_C", STATE.weather.fallback[0]),
+        user_input.get("Humidity_%", STATE.weather.fallback[1])
+    )
+    return (reading,) * N_TIME_SLOTS
+
+
+def summarize_conditions(disease_risk: Dict[str, str]) -> str:
+    flagged = [
+        f"{k.replace('_', ' ').title()} ({v})"
+        for k, v in disease_risk.items() if v != "Low"
+    ]
+    return ", ".join(flagged) if flagged else "None"
+
+
+def decode_image(data: bytes) -> Image.Image:
+    try:
+        return Image.open(io.BytesIO(data)).convert("RGB")
+    except (UnidentifiedImageError, OSError) as e:
+        raise HTTPException(status_code=400, detail=f"Invalid image: {e}")
+
+
+async def lip_response(image: Image.Image) -> Dict[str, Any]:
+    label, score, confidence = await STATE.lip_scheduler.submit(image)
+    return {
+        "prediction": label,
+        "hydration_score": score,
+        "confidence": round(confidence, 4),
+        "recommendation": get_recommendation(label)
+    }
+
+
+# =====================================================
+# ENDPOINTS
+# =====================================================
+@app.get("/health")
+async def health():
+    return {"status": "ok"}
+
+
+@app.get("/metrics/lip")
+async def lip_metrics():
+    return STATE.lip_scheduler.metrics.snapshot()
+
+
+@app.get("/metrics/form")
+async def form_metrics():
+    cache = STATE.predictor.result_cache
+    return cache.stats() if cache is not None else {"enabled": False}
+
+
+@app.get("/metrics/weather")
+async def weather_metrics():
+    return STATE.weather.stats()
+
+
+@app.post("/predict/form")
+async def predict_form(payload: Dict[str, Any]):
+    user_input = await build_form_input(payload)
+
+    try:
+        result = await run_blocking(STATE.predictor.predict, user_input)
+    except (TypeError, ValueError) as e:
+        raise HTTPException(status_code=422, detail=str(e))
+
+    hp = result["hydration_prediction"]
+    return {
+        **result,
+        "recommended_total_water_liters": hp["recommended_water_liters_next_4h"],
+        "hydration_risk_level": hp["hydration_risk_level"],
+        "predicted_medical_conditions": summarize_conditions(
+            result["disease_risk_profile"]
+        )
+    }
+
+
+@app.post("/predict/form/day")
+async def predict_form_day(payload: Dict[str, Any]):
+    user_input = build_day_input(payload)
+    slot_weather = await day_plan_weather(user_input)
+
+    try:
+        plan = await run_blocking(STATE.predictor.predict_day, user_input, slot_weather)
+    except (TypeError, ValueError) as e:
+        raise HTTPException(status_code=422, detail=str(e))
+
+    return {
+        "current_time_window": current_time_slot(),
+        "windows": plan.to_dict(orient="records")
+    }
+
+
+@app.post("/predict/lip/mobile")
+async def predict_lip_mobile(file: UploadFile = File(...)):
+    image = decode_image(await file.read())
+    return await lip_response(image)
+
+
+@app.post("/predict/lip/web")
+async def predict_lip_web(payload: Dict[str, Any]):
+    encoded = payload.get("image_base64")
+    if not encoded:
+        raise HTTPException(status_code=422, detail="Missing image_base64")
+
+    try:
+        data = base64.b64decode(encoded, validate=True)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid base64: {e}")
+
+    return await lip_response(decode_image(data))
+
+
+# =====================================================
+# MAIN
+# =====================================================
+if __name__ == "__main__":
+    import uvicorn
+
+    uvicorn.run(app, host=SERVER_HOST, port=SERVER_PORT)
@@ -0,0 +1,341 @@
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from config import LABELED_PARQUET_PATH
+from utils import setup_logging
+
+LOG = setup_logging()
+
+STORE_FORMAT_VERSION = 3
+INDEX_COLUMN = "__index_level_0__"
+TEXT_TYPE = pa.dictionary(pa.int32(), pa.string())
+INT_TYPES = [pa.int8(), pa.int16(), pa.int32(), pa.int64()]
+
+
+# ======================================================
+# FINGERPRINT (SOURCE FILE + LABELING RULES)
+# ======================================================
+def source_fingerprint(source_path: Path, rules: Any) -> str:
+    st = source_path.stat()
+    digest = hashlib.sha256()
+    digest.update(json.dumps({
+        "format_version": STORE_FORMAT_VERSION,
+        "size": st.st_size,
+        "mtime_ns": st.st_mtime_ns
+    }).encode())
+    digest.update(repr(rules).encode())
+    return digest.hexdigest()[:16]
+
+
+# ======================================================
+# RUNNING COLUMN DTYPE INFO
+# ======================================================
+def narrowest_type(values: np.ndarray) -> pa.DataType:
+    # Smallest Arrow type that holds every float64 value exactly
+    finite = values[np.isfinite(values)]
+    if finite.size == values.size and np.all(finite == np.floor(finite)):
+        lo, hi = (finite.min(), finite.max()) if finite.size else (0, 0)
+        for int_type in INT_TYPES:
+            info = np.iinfo(int_type.to_pandas_dtype())
+            if info.min <= lo and hi <= info.max:
+                return int_type
+    if np.array_equal(values.astype(np.float32).astype(np.float64), values, equal_nan=True):
+        return pa.float32()
+    return pa.float64()
+
+
+def widen_type(a: pa.DataType, b: pa.DataType) -> pa.DataType:
+    # Smallest type that holds everything either type holds
+    if a == b:
+        return a
+    if a in INT_TYPES and b in INT_TYPES:
+        return max(a, b, key=INT_TYPES.index)
+    small_ints = (pa.int8(), pa.int16(), pa.float32())
+    return pa.float32() if a in small_ints and b in small_ints else pa.float64()
+
+
+class ColumnStats:
+    """
+    What one column needs on disk and on read, updated chunk by chunk:
+    value and missing counts, and for numeric columns the narrowest
+    storage type seen so far and whether every value is integral
+    (restored as int64). Constant memory per column.
+    """
+
+    def __init__(self, kind: str):
+        self.kind = kind
+        self.count = 0
+        self.missing = 0
+        self.integral = True
+        self.storage: Optional[pa.DataType] = None
+
+    def update(self, values: pd.Series) -> bool:
+        # True when this chunk needs a wider storage type than before
+        missing = values.isna().to_numpy()
+        self.missing += int(missing.sum())
+        self.count += int(missing.size - missing.sum())
+        if self.kind == "text":
+            return False
+
+        all_values = values.to_numpy(dtype=np.float64)
+        v = all_values[~missing]
+        self.integral = self.integral and bool(np.all(v == np.floor(v)))
+
+        needed = narrowest_type(all_values)
+        storage = needed if self.storage is None else widen_type(self.storage, needed)
+        widened = self.storage is not None and storage != self.storage
+        self.storage = storage
+        return widened
+
+    def arrow_type(self) -> pa.DataType:
+        if self.kind == "text":
+            return TEXT_TYPE
+        return self.storage or pa.float64()
+
+    def dtype(self) -> Optional[str]:
+        # What pd.to_numeric gives the same values in one frame
+        if self.kind != "numeric":
+            return None
+        return "int64" if self.count and self.integral and not self.missing else "float64"
+
+    def to_dict(self) -> Dict[str, Any]:
+        out = {"kind": self.kind, "count": self.count, "missing": self.missing}
+        if self.kind == "numeric":
+            out.update({"integral": self.integral, "storage": str(self.arrow_type())})
+        return out
+
+
+# ======================================================
+# INCREMENTAL PARQUET WRITER
+# ======================================================
+def manifest_path(path: Path) -> Path:
+    return path.with_suffix(".json")
+
+
+class DatasetWriter:
+    """
+    Append labeled chunks to a Parquet file, one row group per chunk.
+
+    The first chunk fixes the columns: text (object) columns become
+    dictionary-encoded strings, numeric columns the narrowest Arrow type
+    that holds them exactly (int8..int64, float32 or float64); the pandas
+    index is kept as a column. If a later chunk needs a wider type, the
+    row groups already written are re-cast into a new file one at a time.
+    The original int64/float64 dtypes and the stored types are written
+    with the fingerprint to a JSON manifest next to the file. Both are
+    renamed into place on close.
+    """
+
+    def __init__(self, path: Path, fingerprint: str):
+        self.path = path
+        self.fingerprint = fingerprint
+        self.tmp_path = path.with_suffix(path.suffix + ".tmp")
+        self.alt_tmp_path = path.with_suffix(path.suffix + ".wide.tmp")
+        self.columns: Optional[List[str]] = None
+        self.stats: Dict[str, ColumnStats] = {}
+        self.rows = 0
+        self.chunks = 0
+        self.rewrites = 0
+        self._data_path = self.tmp_path
+        self._metadata = None
+        self._schema = None
+        self._writer = None
+
+    def _start(self, chunk: pd.DataFrame):
+        self.columns = list(chunk.columns)
+        for col in self.columns:
+            is_text = chunk[col].dtype == object or chunk[col].isna().all()
+            self.stats[col] = ColumnStats("text" if is_text else "numeric")
+
+        # Keep the pandas metadata so reads restore categoricals and the index
+        sample = pa.Table.from_pandas(self._normalize(chunk.head(0)), preserve_index=True)
+        self._metadata = sample.schema.metadata
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+    def _build_schema(self) -> pa.Schema:
+        fields = [
+            pa.field(col, self.stats[col].arrow_type()) for col in self.columns
+        ] + [pa.field(INDEX_COLUMN, pa.int64())]
+        return pa.schema(fields, metadata=self._metadata)
+
+    def _open(self, data_path: Path):
+        self._data_path = data_path
+        self._schema = self._build_schema()
+        self._writer = pq.ParquetWriter(data_path, self._schema, compression="zstd")
+
+    def _widen(self, columns: List[str]):
+        # Re-cast the row groups written so far, so the file keeps one schema
+        self._writer.close()
+        old_path = self._data_path
+        self._open(self.alt_tmp_path if old_path == self.tmp_path else self.tmp_path)
+
+        source = pq.ParquetFile(old_path)
+        for i in range(source.num_row_groups):
+            self._writer.write_table(source.read_row_group(i).cast(self._schema))
+        source.close()
+        old_path.unlink()
+
+        self.rewrites += 1
+        LOG.info(
+            f"Widened stored types at chunk {self.chunks} | "
+            + ", ".join(f"{col}: {self.stats[col].arrow_type()}" for col in columns)
+        )
+
+    def _normalize(self, chunk: pd.DataFrame) -> pd.DataFrame:
+        out = {}
+        for col in self.columns:
+            s = chunk[col]
+            if self.stats[col].kind == "text":
+                values = s.to_numpy(dtype=object)
+                out[col] = pd.Categorical(np.where(pd.isna(values), None, values.astype(str)))
+            else:
+                try:
+                    out[col] = pd.to_numeric(s).astype(np.float64)
+                except (TypeError, ValueError):
+                    raise ValueError(
+                        f"Column {col!r} was numeric in the first chunk but has "
+                        f"non-numeric values in chunk {self.chunks}"
+                    )
+        return pd.DataFrame(out, index=chunk.index.astype(np.int64))
+
+    def write(self, chunk: pd.DataFrame):
+        if self.columns is None:
+            self._start(chunk)
+
+        extra = set(chunk.columns) - set(self.columns)
+        if extra:
+            raise ValueError(f"Chunk {self.chunks} has columns not in the first chunk: {sorted(extra)}")
+        normalized = self._normalize(chunk.reindex(columns=self.columns))
+
+        widened = [col for col in self.columns if self.stats[col].update(normalized[col])]
+        if self._writer is None:
+            self._open(self.tmp_path)
+        elif widened:
+            self._widen(widened)
+
+        # Safe cast: raises rather than truncating if a stored type is too narrow
+        table = pa.Table.from_pandas(normalized, preserve_index=True).cast(self._schema)
+        self._writer.write_table(table)
+        self.rows += len(chunk)
+        self.chunks += 1
+
+    def close(self) -> Dict[str, Any]:
+        if self._writer is None:
+            raise ValueError("No chunks were written")
+        self._writer.close()
+
+        manifest = {
+            "format_version": STORE_FORMAT_VERSION,
+            "fingerprint": self.fingerprint,
+            "rows": self.rows,
+            "chunks": self.chunks,
+            "file_size": self._data_path.stat().st_size,
+            "rewrites": self.rewrites,
+            "dtypes": {col: s.dtype() for col, s in self.stats.items() if s.dtype()},
+            "stats": {col: s.to_dict() for col, s in self.stats.items()}
+        }
+
+        # Data first, manifest last: a manifest always describes a complete file
+        os.replace(self._data_path, self.path)
+        tmp_manifest = manifest_path(self.path).with_suffix(".json.tmp")
+        with open(tmp_manifest, "w") as f:
+            json.dump(manifest, f, indent=1)
+        os.replace(tmp_manifest, manifest_path(self.path))
+        return manifest
+
+    def abort(self):
+        if self._writer is not None:
+            self._writer.close()
+        self.tmp_path.unlink(missing_ok=True)
+        self.alt_tmp_path.unlink(missing_ok=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+
+def write_dataset(df: pd.DataFrame, path: Path, fingerprint: str) -> Dict[str, Any]:
+    with DatasetWriter(path, fingerprint) as writer:
+        writer.write(df)
+    return read_store_metadata(path)
+
+
+# ======================================================
+# READING (COLUMN PROJECTION)
+# ======================================================
+def read_store_metadata(path: Path = LABELED_PARQUET_PATH) -> Optional[Dict[str, Any]]:
+    manifest_file = manifest_path(path)
+    if not path.exists() or not manifest_file.exists():
+        return None
+    with open(manifest_file) as f:
+        metadata = json.load(f)
+    if (metadata.get("format_version") != STORE_FORMAT_VERSION
+            or metadata.get("file_size") != path.stat().st_size):
+        return None
+    return metadata
+
+
+def read_dataset(path: Path = LABELED_PARQUET_PATH, columns: Optional[List[str]] = None,
+                 compact: bool = False) -> pd.DataFrame:
+    """
+    Read the stored frame, optionally only ``columns`` (the index is
+    always restored). Text columns come back as categoricals and numeric
+    columns as int64/float64, like one pd.read_csv + to_numeric pass.
+    ``compact`` keeps the narrower stored types instead.
+    """
+    metadata = read_store_metadata(path)
+    if metadata is None:
+        raise FileNotFoundError(f"No labeled dataset store at {path}")
+
+    table = pq.read_table(path, columns=columns, use_pandas_metadata=True)
+    # Hand Arrow buffers to pandas column by column instead of copying twice
+    df = table.to_pandas(split_blocks=True, self_destruct=True)
+    del table
+
+    for col, dtype in metadata["dtypes"].items():
+        if col not in df.columns:
+            continue
+        if compact:
+            if not df[col].to_numpy().flags.writeable:
+                # Zero-copy columns are read-only Arrow memory; pandas mutates in place
+                df[col] = df[col].copy()
+        else:
+            df[col] = df[col].astype(dtype)
+    return df
+
+
+def load_labeled_dataset(chunks: Callable[[], Iterable[pd.DataFrame]], fingerprint: str,
+                         columns: Optional[List[str]] = None,
+                         path: Path = LABELED_PARQUET_PATH,
+                         compact: bool = False) -> pd.DataFrame:
+    """
+    Read the labeled dataset from Parquet. When the store is missing or
+    its fingerprint is stale, rebuild it first from ``chunks()``, which
+    yields cleaned + labeled frames; only one chunk is in memory at a time.
+    """
+    metadata = read_store_metadata(path)
+    if metadata is None or metadata["fingerprint"] != fingerprint:
+        start = time.perf_counter()
+        with DatasetWriter(path, fingerprint) as writer:
+            for chunk in chunks():
+                writer.write(chunk)
+        LOG.info(
+            f"Labeled dataset store rebuilt | Rows: {writer.rows} | Chunks: {writer.chunks} | "
+            f"Time: {time.perf_counter() - start:.2f}s | Path: {path}"
+        )
+
+    return read_dataset(path, columns, compact)
@@ -1,30 +1,35 @@
+import argparse
 import pandas as pd
 import numpy as np
 import json
-from pathlib import Path
-
-from sklearn.ensemble import RandomForestRegressor, RandomForestClassifier
-from sklearn.model_selection import cross_val_score
+import time
 
 from config import (
-    RF_REGRESSOR_PARAMS,
-    RF_CLASSIFIER_PARAMS,
+    MODEL_ENGINE,
     RANDOM_STATE,
+    TRAINING_WORKERS,
+    TRAINING_CV_FOLDS,
     MODEL_REG_PATH,
     MODEL_CLF_PATH,
     PREPROCESSOR_PATH,
-    ENCODER_PATH
+    ENCODER_PATH,
+    FEATURE_PLAN_PATH,
+    MODEL_DIR
 )
 
 from utils import (
     setup_logging,
     save_pickle,
-    calculate_model_metrics,
-    Timer
+    ensure_dir,
+    calculate_model_metrics
 )
 
 from dataLoad import load_data
 from preprocess import build_preprocessor, prepare_data
+from feature_plan import FeaturePlan
+from model_bundle import save_bundle
+from train_orchestrator import TrainingOrchestrator, FitTask, cv_fold_tasks
+from model_engines import build_estimator, engine_names
 
 LOG = setup_logging()
 
@@ -34,12 +39,16 @@ LOG = setup_logging()
 # =====================================================
 class AdvancedModelTrainer:
 
-    def __init__(self):
+    def __init__(self, workers: int = TRAINING_WORKERS, engine: str = MODEL_ENGINE):
+        self.engine = engine
         self.regressor = None
         self.classifier = None
         self.preprocessor = None
         self.label_encoder = None
         self.training_metrics = {}
+        self.orchestrator = TrainingOrchestrator(workers)
+        self.timings = {}
+        self._pipeline_start = None
 
     # -------------------------------------------------
     # FEATURE PREPARATION
@@ -78,69 +87,86 @@ class AdvancedModelTrainer:
         )
 
     # -------------------------------------------------
-    # REGRESSION MODEL (NEXT 4H WATER)
+    # CONCURRENT FITS (REGRESSOR + CLASSIFIER + CV FOLDS)
     # -------------------------------------------------
-    def train_regressor(self, X_train, y_train, X_test, y_test):
-        LOG.info("Training RandomForest Regressor (Next 4h Water)...")
+    def fit_models(self, X_train, y_reg_train, y_clf_train):
+        LOG.info(
+            f"Training {self.engine} Regressor, Hydration Risk Classifier "
+            f"and {TRAINING_CV_FOLDS}-fold CV concurrently..."
+        )
+
+        classifier = build_estimator(self.engine, "classifier")
+        tasks = [
+            FitTask("regressor", build_estimator(self.engine, "regressor"), y_reg_train),
+            FitTask("classifier", classifier, y_clf_train)
+        ] + cv_fold_tasks(classifier, X_train, y_clf_train, TRAINING_CV_FOLDS)
 
-        with Timer() as t:
-            model = RandomForestRegressor(**RF_REGRESSOR_PARAMS)
-            model.fit(X_train, y_train)
+        results = self.orchestrator.run(tasks, X_train)
+        self.timings["fit"] = self.orchestrator.last_run
 
+        cv_scores = np.array([results[task.name] for task in tasks[2:]])
+        return results["regressor"], results["classifier"], cv_scores
+
+    # -------------------------------------------------
+    # REGRESSION MODEL (NEXT 4H WATER)
+    # -------------------------------------------------
+    def evaluate_regressor(self, model, X_test, y_test):
         preds = model.predict(X_test)
         metrics = calculate_model_metrics(y_test, preds, "regression")
 
         self.training_metrics["regression"] = metrics
 
         LOG.info(
-            f"Regressor trained in {t.get_duration():.2f}s | "
+            f"Regressor trained in {self.timings['fit']['fit_s']['regressor']:.2f}s | "
             f"RMSE={metrics['rmse']:.3f}, R²={metrics['r2']:.3f}"
         )
 
-        return model
-
     # -------------------------------------------------
     # CLASSIFICATION MODEL (HYDRATION RISK)
     # -------------------------------------------------
-    def train_classifier(self, X_train, y_train, X_test, y_test):
-        LOG.info("Training Hydration Risk Classifier...")
-
-        with Timer() as t:
-            model = RandomForestClassifier(**RF_CLASSIFIER_PARAMS)
-            model.fit(X_train, y_train)
-
+    def evaluate_classifier(self, model, X_test, y_test, cv_scores):
         preds = model.predict(X_test)
         metrics = calculate_model_metrics(y_test, preds, "classification")
 
-        cv_scores = cross_val_score(
-            model, X_train, y_train, cv=5, scoring="accuracy"
-        )
-
         metrics["cv_accuracy_mean"] = cv_scores.mean()
         metrics["cv_accuracy_std"] = cv_scores.std()
 
         self.training_metrics["hydration_classification"] = metrics
 
         LOG.info(
-            f"Classifier trained in {t.get_duration():.2f}s | "
+            f"Classifier trained in {self.timings['fit']['fit_s']['classifier']:.2f}s | "
             f"Accuracy={metrics['accuracy']:.3f}, F1={metrics['f1']:.3f}"
         )
 
-        return model
-
     # -------------------------------------------------
     # SAVE ARTIFACTS
     # -------------------------------------------------
     def save_all(self):
         LOG.info("Saving models and preprocessing artifacts...")
+        start = time.perf_counter()
 
-        MODEL_DIR = Path("models")
-        MODEL_DIR.mkdir(exist_ok=True)
+        ensure_dir(MODEL_DIR)
 
         save_pickle(self.regressor, MODEL_REG_PATH)
         save_pickle(self.classifier, MODEL_CLF_PATH)
         save_pickle(self.preprocessor, PREPROCESSOR_PATH)
         save_pickle(self.label_encoder, ENCODER_PATH)
+        feature_plan = FeaturePlan.from_preprocessor(self.preprocessor)
+        save_pickle(feature_plan, FEATURE_PLAN_PATH)
+
+        self.training_metrics["bundle_version"] = save_bundle(
+            self.regressor,
+            self.classifier,
+            self.preprocessor,
+            self.label_encoder,
+            feature_plan
+        )
+
+        self.timings["save_s"] = time.perf_counter() - start
+        if self._pipeline_start is not None:
+            self.timings["total_s"] = time.perf_counter() - self._pipeline_start
+        self.training_metrics["engine"] = self.engine
+        self.training_metrics["timings"] = self.timings
 
         with open(MODEL_DIR / "training_metrics.json", "w") as f:
             json.dump(self.training_metrics, f, indent=2)
@@ -152,6 +178,7 @@ class AdvancedModelTrainer:
     # -------------------------------------------------
     def train_pipeline(self, df: pd.DataFrame):
         LOG.info("Starting full training pipeline...")
+        self._pipeline_start = start = time.perf_counter()
 
         (
             X_train,
@@ -161,14 +188,16 @@ class AdvancedModelTrainer:
             y_clf_train,
             y_clf_test
         ) = self.prepare_features(df)
+        self.timings["prepare_features_s"] = time.perf_counter() - start
 
-        self.regressor = self.train_regressor(
-            X_train, y_reg_train, X_test, y_reg_test
+        self.regressor, self.classifier, cv_scores = self.fit_models(
+            X_train, y_reg_train, y_clf_train
         )
 
-        self.classifier = self.train_classifier(
-            X_train, y_clf_train, X_test, y_clf_test
-        )
+        start = time.perf_counter()
+        self.evaluate_regressor(self.regressor, X_test, y_reg_test)
+        self.evaluate_classifier(self.classifier, X_test, y_clf_test, cv_scores)
+        self.timings["evaluate_s"] = time.perf_counter() - start
 
         self.save_all()
         self.print_summary()
@@ -197,25 +226,36 @@ class AdvancedModelTrainer:
             f"± {clf['cv_accuracy_std']:.3f}"
         )
 
+        fit = self.timings.get("fit")
+        if fit:
+            LOG.info(
+                f"\nFits: {fit['wall_s']:.2f}s wall | {fit['concurrent_fits']} concurrent "
+                f"x {fit['jobs_per_fit']} jobs (budget {fit['budget']})"
+            )
+
         LOG.info("=" * 60)
 
 
 # =====================================================
 # MAIN
 # =====================================================
-def main():
+def main(engine: str = MODEL_ENGINE):
     LOG.info("=" * 60)
-    LOG.info("HYDRATION ML TRAINING PIPELINE (TIME-WINDOW AWARE)")
+    LOG.info(f"HYDRATION ML TRAINING PIPELINE (TIME-WINDOW AWARE) | ENGINE: {engine}")
     LOG.info("=" * 60)
 
     df = load_data()
     LOG.info(f"Dataset loaded: {len(df)} samples")
 
-    trainer = AdvancedModelTrainer()
+    trainer = AdvancedModelTrainer(engine=engine)
     trainer.train_pipeline(df)
 
     LOG.info("TRAINING COMPLETED SUCCESSFULLY")
 
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Train the hydration regressor and risk classifier")
+    parser.add_argument("--engine", choices=engine_names(), default=MODEL_ENGINE)
+    args = parser.parse_args()
+
+    main(args.engine)
@@ -0,0 +1,152 @@
+import shutil
+import tempfile
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+from joblib import Parallel, delayed
+from sklearn.base import clone
+from sklearn.metrics import accuracy_score
+from sklearn.model_selection import check_cv
+from threadpoolctl import threadpool_limits
+
+from config import TRAINING_WORKERS
+from utils import setup_logging
+
+LOG = setup_logging()
+
+
+# ======================================================
+# WORKER BUDGET
+# ======================================================
+def split_workers(n_tasks: int, budget: int = TRAINING_WORKERS) -> Tuple[int, int]:
+    """
+    Split a CPU budget into (concurrent fits, tree jobs per fit) so that
+    their product never exceeds ``budget``.
+    """
+    budget = max(1, int(budget))
+    outer = max(1, min(n_tasks, budget))
+    return outer, max(1, budget // outer)
+
+
+@contextmanager
+def shared_array(X, temp_dir: Optional[Path] = None) -> Iterator[np.ndarray]:
+    """Write ``X`` once to a temporary .npy and yield a read-only memmap of it."""
+    work = Path(tempfile.mkdtemp(prefix="hydration_train_", dir=temp_dir))
+    try:
+        path = work / "X_train.npy"
+        np.save(path, np.ascontiguousarray(X))
+        yield np.load(path, mmap_mode="r")
+    finally:
+        shutil.rmtree(work, ignore_errors=True)
+
+
+# ======================================================
+# FIT TASKS
+# ======================================================
+class FitTask:
+    """
+    One independent estimator fit. ``train_idx`` restricts the fit to a
+    subset of rows (a CV fold); when ``eval_idx`` is set the worker
+    returns the accuracy on those rows instead of the fitted model.
+    """
+
+    def __init__(self, name: str, estimator, y, train_idx=None, eval_idx=None):
+        self.name = name
+        self.estimator = estimator
+        self.y = np.asarray(y)
+        self.train_idx = train_idx
+        self.eval_idx = eval_idx
+
+
+def cv_fold_tasks(estimator, X, y, folds: int, prefix: str = "cv_fold") -> List[FitTask]:
+    # Same splitter cross_val_score(cv=folds) would pick for this estimator
+    splitter = check_cv(folds, y, classifier=True)
+    return [
+        FitTask(f"{prefix}_{i}", estimator, y, train_idx, eval_idx)
+        for i, (train_idx, eval_idx) in enumerate(splitter.split(X, y))
+    ]
+
+
+def _run_task(task: FitTask, X, n_jobs: int) -> Tuple[str, Any, float]:
+    start = time.perf_counter()
+    model = clone(task.estimator)
+    has_jobs = "n_jobs" in model.get_params()
+    if has_jobs:
+        model.set_params(n_jobs=n_jobs)
+
+    # Estimators without n_jobs (gradient boosting) use OpenMP threads instead
+    with threadpool_limits(limits=n_jobs):
+        if task.train_idx is None:
+            model.fit(X, task.y)
+        else:
+            model.fit(X[task.train_idx], task.y[task.train_idx])
+
+    if task.eval_idx is not None:
+        result = accuracy_score(task.y[task.eval_idx], model.predict(X[task.eval_idx]))
+    else:
+        # Saved models keep the configured n_jobs, not the training split
+        if has_jobs:
+            model.set_params(n_jobs=task.estimator.get_params()["n_jobs"])
+        result = model
+    return task.name, result, time.perf_counter() - start
+
+
+# ======================================================
+# ORCHESTRATOR
+# ======================================================
+class TrainingOrchestrator:
+    """
+    Runs independent fits concurrently in worker processes under a single
+    CPU budget.
+
+    ``X`` is written once to a .npy file and opened memory-mapped, so every
+    worker pages in the same read-only copy instead of receiving its own
+    pickle. Each fit gets ``budget // concurrent`` tree jobs and BLAS /
+    OpenMP pools inside workers are capped to the same number, so nested
+    parallelism never oversubscribes the CPUs.
+    """
+
+    def __init__(self, workers: int = TRAINING_WORKERS, temp_dir: Optional[Path] = None):
+        self.workers = max(1, int(workers))
+        self.temp_dir = temp_dir
+        self.last_run: Dict[str, Any] = {}
+
+    def map(self, fn: Callable, items: Sequence, X) -> List[Any]:
+        """
+        ``[fn(item, X, n_jobs) for item in items]`` spread over the budget;
+        ``n_jobs`` is the tree-job share each call may use.
+        """
+        outer, inner = split_workers(len(items), self.workers)
+        start = time.perf_counter()
+
+        if outer == 1:
+            out = [fn(item, X, inner) for item in items]
+        else:
+            with shared_array(X, self.temp_dir) as shared:
+                out = Parallel(
+                    n_jobs=outer, backend="loky", inner_max_num_threads=inner
+                )(delayed(fn)(item, shared, inner) for item in items)
+
+        self.last_run = {
+            "budget": self.workers,
+            "concurrent_fits": outer,
+            "jobs_per_fit": inner,
+            "wall_s": time.perf_counter() - start
+        }
+        return out
+
+    def run(self, tasks: List[FitTask], X) -> Dict[str, Any]:
+        """Fit every task; returns ``{name: model or score}``."""
+        done = self.map(_run_task, tasks, X)
+        self.last_run["fit_s"] = {name: seconds for name, _, seconds in done}
+
+        run = self.last_run
+        LOG.info(
+            f"Fitted {len(tasks)} models in {run['wall_s']:.2f}s | "
+            f"{run['concurrent_fits']} concurrent x {run['jobs_per_fit']} jobs "
+            f"(budget {self.workers})"
+        )
+        return {name: result for name, result, _ in done}
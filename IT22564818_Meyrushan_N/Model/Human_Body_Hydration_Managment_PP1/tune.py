@@ -0,0 +1,318 @@
+import argparse
+import json
+import math
+import time
+import warnings
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+from sklearn.ensemble import RandomForestRegressor, RandomForestClassifier
+from sklearn.metrics import accuracy_score, r2_score
+from sklearn.model_selection import ParameterSampler, train_test_split
+
+from config import (
+    RF_REGRESSOR_PARAMS,
+    RF_CLASSIFIER_PARAMS,
+    RANDOM_STATE,
+    TRAINING_WORKERS,
+    TUNING_PARAM_GRID,
+    TUNING_CANDIDATES,
+    TUNING_HALVING_FACTOR,
+    TUNING_FINALISTS,
+    TUNING_MIN_SAMPLES,
+    TUNING_MIN_TREES,
+    TUNING_MAX_TREES,
+    TUNING_BUDGET_S,
+    TUNING_VALIDATION_SIZE,
+    TUNING_LATENCY_REPEATS,
+    TUNING_RESULTS_PATH,
+    USE_FLAT_FOREST
+)
+from utils import setup_logging, ensure_dir
+from dataLoad import load_data
+from preprocess import build_preprocessor, prepare_data
+from flat_forest import FlatForest
+from forest_compression import subset_forest
+from train_orchestrator import TrainingOrchestrator
+
+LOG = setup_logging()
+
+FORESTS = {
+    "regressor": (RandomForestRegressor, RF_REGRESSOR_PARAMS, "r2"),
+    "classifier": (RandomForestClassifier, RF_CLASSIFIER_PARAMS, "accuracy")
+}
+
+
+# ======================================================
+# TUNED PARAMS (READ BY train.py)
+# ======================================================
+def load_tuned_params(target: str, default: Dict[str, Any]) -> Dict[str, Any]:
+    """Winning params for ``target`` from the last tune.py run, else ``default``."""
+    if not TUNING_RESULTS_PATH.exists():
+        return default
+    with open(TUNING_RESULTS_PATH) as f:
+        results = json.load(f)
+    if target not in results:
+        return default
+    LOG.info(f"Using tuned {target} params from {TUNING_RESULTS_PATH.name}")
+    return results[target]["best_params"]
+
+
+# ======================================================
+# SUCCESSIVE HALVING SCHEDULE
+# ======================================================
+def halving_schedule(n_candidates: int, n_rows: int,
+                     factor: int = TUNING_HALVING_FACTOR,
+                     finalists: int = TUNING_FINALISTS,
+                     min_samples: int = TUNING_MIN_SAMPLES,
+                     min_trees: int = TUNING_MIN_TREES,
+                     max_trees: int = TUNING_MAX_TREES) -> List[Dict[str, int]]:
+    """
+    Rounds of ``{"candidates", "samples", "trees"}``. Each round keeps
+    1/factor of the candidates and grows rows and trees by ``factor``;
+    the last round fits ``finalists`` forests on every row with
+    ``max_trees`` trees.
+    """
+    last = max(0, math.ceil(math.log(max(n_candidates / finalists, 1), factor)))
+    rounds = []
+    for r in range(last + 1):
+        scale = factor ** (r - last)
+        rounds.append({
+            "candidates": max(1, math.ceil(n_candidates / factor ** r)),
+            "samples": min(n_rows, max(min_samples, int(n_rows * scale))),
+            "trees": max(min_trees, int(round(max_trees * scale)))
+        })
+    return rounds
+
+
+def nested_order(y, rng, stratify: bool) -> np.ndarray:
+    """
+    Row order whose every prefix is a random (optionally class-stratified)
+    subsample, so a round's rows always contain the previous round's.
+    """
+    order = rng.permutation(len(y))
+    if not stratify:
+        return order
+    # Interleave classes by relative rank so all classes appear early
+    ranks = np.empty(len(y))
+    y_ordered = np.asarray(y)[order]
+    for label in np.unique(y_ordered):
+        members = order[y_ordered == label]
+        ranks[members] = (np.arange(len(members)) + 0.5) / len(members)
+    return order[np.argsort(ranks[order], kind="stable")]
+
+
+# ======================================================
+# CANDIDATES
+# ======================================================
+class Candidate:
+
+    def __init__(self, cid: int, params: Dict[str, Any], base: Dict[str, Any], model_cls):
+        self.cid = cid
+        self.params = params
+        self.model = model_cls(**{**base, **params}, warm_start=True)
+        self.score = None
+        self.samples = 0
+        self.trees = 0
+        self.fit_s = 0.0
+        self.rounds = 0
+        self.latency_ms = None
+        self.latency_trees = 0
+
+    def row(self) -> Dict[str, Any]:
+        return {
+            "id": self.cid,
+            "params": self.params,
+            "score": self.score,
+            "rounds": self.rounds,
+            "samples": self.samples,
+            "trees": self.trees,
+            "fit_s": self.fit_s,
+            "latency_ms": self.latency_ms,
+            "latency_trees": self.latency_trees
+        }
+
+
+def _grow(item, X, n_jobs: int):
+    """Add trees to a warm-started forest on a larger row prefix, then score it."""
+    model, fit_idx, eval_idx, y, trees, metric = item
+    start = time.perf_counter()
+    model.set_params(n_estimators=trees, n_jobs=n_jobs)
+    with warnings.catch_warnings():
+        # Earlier trees saw a smaller prefix; balanced weights still hold per fit
+        warnings.filterwarnings("ignore", message=".*warm_start.*")
+        model.fit(X[fit_idx], y[fit_idx])
+    preds = model.predict(X[eval_idx])
+    score = r2_score(y[eval_idx], preds) if metric == "r2" else accuracy_score(y[eval_idx], preds)
+    model.set_params(n_jobs=None)
+    return model, float(score), time.perf_counter() - start
+
+
+def serving_latency_ms(model, X_rows, repeats: int = TUNING_LATENCY_REPEATS,
+                       trees: Optional[int] = None) -> float:
+    # Single-row predictions through the engine predict.py serves with,
+    # on the newest ``trees`` trees only when given
+    if trees is not None:
+        n = len(model.estimators_)
+        model = subset_forest(model, list(range(n - trees, n)))
+    engine = FlatForest.from_sklearn(model) if USE_FLAT_FOREST else model
+    rows = [X_rows[i % len(X_rows)][np.newaxis, :] for i in range(repeats)]
+    engine.predict(rows[0])
+    timings = np.empty(repeats)
+    for i, row in enumerate(rows):
+        start = time.perf_counter()
+        engine.predict(row)
+        timings[i] = time.perf_counter() - start
+    return float(np.median(timings) * 1000)
+
+
+# ======================================================
+# SEARCH
+# ======================================================
+def successive_halving(target: str, X, y, fit_pool, eval_idx, deadline: float,
+                       orchestrator: TrainingOrchestrator,
+                       n_candidates: int = TUNING_CANDIDATES) -> Dict[str, Any]:
+    """
+    Successive halving over (rows, trees) for one forest. ``fit_pool`` is
+    the nested row order; surviving forests are grown in place with
+    ``warm_start`` instead of being refitted. Stops before a round whose
+    projected cost would overrun ``deadline``.
+    """
+    model_cls, base, metric = FORESTS[target]
+    y = np.asarray(y)
+
+    grid = list(ParameterSampler(TUNING_PARAM_GRID, n_iter=n_candidates,
+                                 random_state=RANDOM_STATE))
+    candidates = [Candidate(i, params, base, model_cls) for i, params in enumerate(grid)]
+    schedule = halving_schedule(len(candidates), len(fit_pool))
+
+    alive = candidates
+    rounds, stopped_early, last_work, last_wall = [], False, None, None
+    for r, step in enumerate(schedule):
+        alive = alive[:step["candidates"]]
+        work = len(alive) * step["samples"] * step["trees"]
+        if last_wall is not None:
+            projected = last_wall * work / last_work
+            if time.perf_counter() + projected > deadline:
+                LOG.info(f"{target}: stopping before round {r}, "
+                         f"projected {projected:.1f}s exceeds the budget")
+                stopped_early = True
+                break
+
+        fit_idx = fit_pool[:step["samples"]]
+        items = [(c.model, fit_idx, eval_idx, y, step["trees"], metric) for c in alive]
+        done = orchestrator.map(_grow, items, X)
+
+        for c, (model, score, fit_s) in zip(alive, done):
+            c.model, c.score, c.fit_s = model, score, c.fit_s + fit_s
+            c.samples, c.trees, c.rounds = step["samples"], step["trees"], r + 1
+        alive = sorted(alive, key=lambda c: c.score, reverse=True)
+
+        last_work, last_wall = work, orchestrator.last_run["wall_s"]
+        rounds.append({**step, "round": r, "wall_s": last_wall,
+                       "best_score": alive[0].score})
+        LOG.info(f"{target}: round {r} | {len(alive)} x {step['samples']} rows x "
+                 f"{step['trees']} trees | {last_wall:.1f}s | best {metric}={alive[0].score:.4f}")
+
+    # Single-row latency grows with the tree count, which differs by round,
+    # so every candidate is timed on the same number of trees: its newest
+    # ones, grown on its largest row prefix
+    X_eval = np.asarray(X[eval_idx])
+    latency_trees = schedule[0]["trees"]
+    leaderboard = sorted(
+        (c for c in candidates if c.rounds),
+        key=lambda c: (c.rounds, c.score), reverse=True
+    )
+    best = leaderboard[0]
+    best_latency = {"trees": best.trees, "latency_ms": serving_latency_ms(best.model, X_eval)}
+    for c in leaderboard:
+        c.latency_ms = serving_latency_ms(c.model, X_eval, trees=latency_trees)
+        c.latency_trees = latency_trees
+    for c in candidates:
+        c.model = None
+
+    return {
+        "metric": metric,
+        "best_params": {**base, **best.params, "n_estimators": TUNING_MAX_TREES},
+        "best_score": best.score,
+        "best_latency": best_latency,
+        "stopped_early": stopped_early,
+        "rounds": rounds,
+        "leaderboard": [c.row() for c in leaderboard]
+    }
+
+
+# ======================================================
+# MAIN
+# ======================================================
+def main(targets=("regressor", "classifier"), budget_s: float = TUNING_BUDGET_S,
+         workers: int = TRAINING_WORKERS, n_candidates: int = TUNING_CANDIDATES,
+         save: bool = True) -> Dict[str, Any]:
+    start = time.perf_counter()
+    LOG.info("=" * 60)
+    LOG.info(f"RANDOM FOREST TUNING | budget {budget_s:.0f}s | workers {workers}")
+    LOG.info("=" * 60)
+
+    # Same train split as train.py; the test split is never touched here
+    X_train, _, y_reg_train, _, y_clf_train, _, _ = prepare_data(load_data())
+    X = build_preprocessor().fit_transform(X_train)
+
+    rows = np.arange(len(X))
+    fit_rows, eval_idx = train_test_split(
+        rows, test_size=TUNING_VALIDATION_SIZE,
+        stratify=y_clf_train, random_state=RANDOM_STATE
+    )
+    orchestrator = TrainingOrchestrator(workers)
+    targets_y = {"regressor": y_reg_train, "classifier": y_clf_train}
+
+    results = {
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "budget_s": budget_s,
+        "workers": workers,
+        "rows": {"fit": len(fit_rows), "validation": len(eval_idx)}
+    }
+    for i, target in enumerate(targets):
+        # Each forest gets an even share of what is left of the budget
+        remaining = budget_s - (time.perf_counter() - start)
+        deadline = time.perf_counter() + remaining / (len(targets) - i)
+        y = np.asarray(targets_y[target])
+        rng = np.random.default_rng(RANDOM_STATE)
+        fit_pool = fit_rows[nested_order(y[fit_rows], rng, stratify=target == "classifier")]
+        results[target] = successive_halving(
+            target, X, y, fit_pool, eval_idx, deadline, orchestrator, n_candidates
+        )
+    results["elapsed_s"] = time.perf_counter() - start
+
+    print_leaderboards(results, targets)
+    if save:
+        ensure_dir(TUNING_RESULTS_PATH.parent)
+        with open(TUNING_RESULTS_PATH, "w") as f:
+            json.dump(results, f, indent=2)
+        LOG.info(f"Tuning results saved to {TUNING_RESULTS_PATH}")
+    return results
+
+
+def print_leaderboards(results: Dict[str, Any], targets, top: Optional[int] = 10):
+    for target in targets:
+        r = results[target]
+        print(f"\n{target.upper()} ({r['metric']}){' [budget hit]' if r['stopped_early'] else ''}")
+        lat = r["best_latency"]
+        print(f"Best: {lat['latency_ms']:.3f} ms per row at {lat['trees']} trees; "
+              f"leaderboard latency at {r['leaderboard'][0]['latency_trees']} trees")
+        print(f"{'rnd':>3} {'score':>7} {'rows':>5} {'trees':>5} {'latency ms':>10}  params")
+        for row in r["leaderboard"][:top]:
+            print(f"{row['rounds']:>3} {row['score']:7.4f} {row['samples']:>5} "
+                  f"{row['trees']:>5} {row['latency_ms']:10.3f}  {row['params']}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Successive-halving search for the hydration forests")
+    parser.add_argument("--target", choices=["regressor", "classifier", "both"], default="both")
+    parser.add_argument("--budget-s", type=float, default=TUNING_BUDGET_S)
+    parser.add_argument("--workers", type=int, default=TRAINING_WORKERS)
+    parser.add_argument("--candidates", type=int, default=TUNING_CANDIDATES)
+    args = parser.parse_args()
+
+    targets = ("regressor", "classifier") if args.target == "both" else (args.target,)
+    main(targets, args.budget_s, args.workers, args.candidates)
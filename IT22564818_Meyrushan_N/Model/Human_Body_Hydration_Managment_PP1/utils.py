@@ -48,6 +48,55 @@ def load_pickle(path: Path) -> Any:
         raise IOError(f"Failed to load pickle from {path}: {e}")
 
 
+def map_distinct(series: pd.Series, fn) -> np.ndarray:
+    """
+    ``series.map(fn)`` evaluated once per distinct value (categorical
+    codes or pd.factorize) and broadcast back. Missing values are mapped
+    as themselves, so None and NaN keep their own results, as they did
+    under ``.astype(str)``.
+    """
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        # Categoricals store every missing value as NaN
+        codes, uniques = series.cat.codes.to_numpy(), series.cat.categories
+        return np.array([fn(u) for u in uniques] + [fn(np.nan)])[codes]
+
+    codes, uniques = pd.factorize(series, use_na_sentinel=True)
+    out = np.array([fn(u) for u in uniques] + [fn(np.nan)])[codes]
+
+    # factorize folds None, NaN and pd.NA into one code; map each kind once
+    missing = np.flatnonzero(codes == -1)
+    if missing.size:
+        values = series.to_numpy(dtype=object)[missing]
+        first = {}
+        for v in values:
+            first.setdefault(type(v), v)
+        results = {kind: fn(v) for kind, v in first.items()}
+        out[missing] = [results[type(v)] for v in values]
+    return out
+
+
+def proc_status_mb(field: str) -> Optional[float]:
+    # VmRSS / VmHWM from /proc (Linux); None elsewhere
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith(field + ":"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return None
+
+
+def reset_peak_rss() -> bool:
+    # Writing 5 to clear_refs resets VmHWM to the current RSS (Linux >= 4.0)
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+        return True
+    except OSError:
+        return False
+
+
 def ensure_dir(path: Path) -> Path:
 
     path.mkdir(parents=True, exist_ok=True)
@@ -0,0 +1,261 @@
+import asyncio
+import time
+from typing import Any, Callable, Dict, Hashable, Optional, Sequence, Tuple
+
+import numpy as np
+
+from config import (
+    TIME_SLOT_MAPPING,
+    WEATHER_API_URL,
+    WEATHER_TIMEOUT_S,
+    WEATHER_CACHE_TTL_S,
+    WEATHER_CACHE_MAX_CELLS,
+    WEATHER_GRID_DEG,
+    WEATHER_FAILURE_THRESHOLD,
+    WEATHER_CIRCUIT_RESET_S,
+    WEATHER_FALLBACK
+)
+from utils import setup_logging
+
+LOG = setup_logging()
+
+Cell = Tuple[float, float]
+Reading = Tuple[float, float]
+DayReadings = Tuple[Reading, ...]
+
+N_TIME_SLOTS = len(TIME_SLOT_MAPPING)
+
+
+# ======================================================
+# HOURLY FORECAST → 4-HOUR TIME SLOTS
+# ======================================================
+def aggregate_forecast(hourly: Dict[str, Sequence[Any]],
+                       fallback: Reading = WEATHER_FALLBACK) -> DayReadings:
+    """
+    Average an open-meteo style hourly forecast (``time``,
+    ``temperature_2m``, ``relative_humidity_2m``) into one reading per
+    ``TIME_SLOT_MAPPING`` window. Windows without any forecast hours get
+    ``fallback``.
+    """
+    hours = np.array([int(str(t)[11:13]) for t in hourly["time"]], dtype=np.int64)
+    temps = np.asarray(hourly["temperature_2m"], dtype=float)
+    hums = np.asarray(hourly["relative_humidity_2m"], dtype=float)
+
+    valid = ~(np.isnan(temps) | np.isnan(hums))
+    slots = hours[valid] // 4
+    counts = np.bincount(slots, minlength=N_TIME_SLOTS)[:N_TIME_SLOTS]
+    temp_sum = np.bincount(slots, weights=temps[valid], minlength=N_TIME_SLOTS)[:N_TIME_SLOTS]
+    hum_sum = np.bincount(slots, weights=hums[valid], minlength=N_TIME_SLOTS)[:N_TIME_SLOTS]
+
+    return tuple(
+        (round(float(t / n), 1), round(float(h / n), 1)) if n else fallback
+        for t, h, n in zip(temp_sum, hum_sum, counts)
+    )
+
+
+# ======================================================
+# CIRCUIT BREAKER
+# ======================================================
+class CircuitBreaker:
+    """
+    Opens after ``failure_threshold`` consecutive failures. While open,
+    calls are rejected until ``reset_after_s`` has passed; then a single
+    trial call is let through (half-open) and its outcome decides
+    whether the circuit closes again.
+    """
+
+    def __init__(self, failure_threshold: int, reset_after_s: float):
+        self.failure_threshold = failure_threshold
+        self.reset_after_s = reset_after_s
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self.trial_in_flight = False
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_after_s:
+            return "half_open"
+        return "open"
+
+    def allow(self) -> bool:
+        state = self.state
+        if state == "closed":
+            return True
+        if state == "half_open" and not self.trial_in_flight:
+            self.trial_in_flight = True
+            return True
+        return False
+
+    def record_success(self):
+        self.failures = 0
+        self.opened_at = None
+        self.trial_in_flight = False
+
+    def record_failure(self):
+        self.failures += 1
+        self.trial_in_flight = False
+        if self.opened_at is not None or self.failures >= self.failure_threshold:
+            if self.opened_at is None:
+                LOG.warning("Weather circuit opened after repeated failures")
+            self.opened_at = time.monotonic()
+
+
+# ======================================================
+# CACHED, COALESCING WEATHER PROVIDER
+# ======================================================
+class WeatherProvider:
+
+    def __init__(self, base_url: str = WEATHER_API_URL,
+                 ttl_s: float = WEATHER_CACHE_TTL_S,
+                 max_cells: int = WEATHER_CACHE_MAX_CELLS,
+                 grid_deg: float = WEATHER_GRID_DEG,
+                 timeout_s: float = WEATHER_TIMEOUT_S,
+                 failure_threshold: int = WEATHER_FAILURE_THRESHOLD,
+                 reset_after_s: float = WEATHER_CIRCUIT_RESET_S,
+                 fallback: Reading = WEATHER_FALLBACK):
+        self.base_url = base_url
+        self.ttl_s = ttl_s
+        self.max_cells = max_cells
+        self.grid_deg = grid_deg
+        self.timeout_s = timeout_s
+        self.fallback = fallback
+        self.breaker = CircuitBreaker(failure_threshold, reset_after_s)
+
+        # Keyed by (kind, cell) so current and day lookups share the bound
+        self._cache: Dict[Hashable, Tuple[float, Any]] = {}
+        self._inflight: Dict[Hashable, asyncio.Task] = {}
+
+        self.counters = {
+            "hits": 0,
+            "misses": 0,
+            "coalesced": 0,
+            "upstream_calls": 0,
+            "upstream_failures": 0,
+            "fallbacks": 0,
+            "circuit_rejections": 0
+        }
+
+    # --------------------------------------------------
+    # PUBLIC API
+    # --------------------------------------------------
+    def cell(self, lat: float, lon: float) -> Cell:
+        g = self.grid_deg
+        return (round(round(lat / g) * g, 6), round(round(lon / g) * g, 6))
+
+    async def get(self, lat: float, lon: float) -> Reading:
+        cell = self.cell(lat, lon)
+        return await self._lookup(("current", cell), self._fetch, self.fallback)
+
+    async def get_day(self, lat: float, lon: float) -> DayReadings:
+        """Today's forecast, aggregated into the six 4-hour time slots."""
+        cell = self.cell(lat, lon)
+        return await self._lookup(
+            ("day", cell), self._fetch_day, (self.fallback,) * N_TIME_SLOTS
+        )
+
+    def get_sync(self, lat: float, lon: float) -> Reading:
+        """``get`` for callers without a running event loop (terminal, scripts)."""
+        return asyncio.run(self.get(lat, lon))
+
+    def stats(self) -> Dict[str, object]:
+        lookups = self.counters["hits"] + self.counters["misses"] + self.counters["coalesced"]
+        return {
+            **self.counters,
+            "hit_ratio": self.counters["hits"] / lookups if lookups else 0.0,
+            "cached_cells": len(self._cache),
+            "circuit_state": self.breaker.state
+        }
+
+    # --------------------------------------------------
+    # CACHE + IN-FLIGHT COALESCING
+    # --------------------------------------------------
+    async def _lookup(self, key: Hashable, fetch: Callable[[Cell], Any], default: Any):
+        cached = self._cache.get(key)
+        if cached is not None and time.monotonic() - cached[0] < self.ttl_s:
+            self.counters["hits"] += 1
+            return cached[1]
+
+        # Join an upstream call already running for this key
+        task = self._inflight.get(key)
+        if task is not None:
+            self.counters["coalesced"] += 1
+        else:
+            self.counters["misses"] += 1
+            task = asyncio.ensure_future(self._refresh(key, fetch, default))
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: self._settle(key, t))
+
+        # The refresh runs as its own task: a caller that is cancelled
+        # (client gone, timeout) stops waiting without failing the others
+        return await asyncio.shield(task)
+
+    def _settle(self, key: Hashable, task: asyncio.Task):
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        # Every caller may have gone; avoid "exception never retrieved"
+        if not task.cancelled():
+            task.exception()
+
+    # --------------------------------------------------
+    # UPSTREAM + FALLBACK
+    # --------------------------------------------------
+    async def _refresh(self, key: Hashable, fetch: Callable[[Cell], Any], default: Any):
+        if not self.breaker.allow():
+            self.counters["circuit_rejections"] += 1
+            return self._fallback(key, default)
+
+        self.counters["upstream_calls"] += 1
+        try:
+            value = await asyncio.to_thread(fetch, key[1])
+        except Exception as e:
+            self.counters["upstream_failures"] += 1
+            self.breaker.record_failure()
+            LOG.warning(f"Weather lookup failed for {key}: {e}")
+            return self._fallback(key, default)
+        finally:
+            # A cancelled trial gives no verdict; let the next lookup retry
+            self.breaker.trial_in_flight = False
+
+        self.breaker.record_success()
+        self._store(key, value)
+        return value
+
+    def _store(self, key: Hashable, value: Any):
+        # Dict order doubles as age order: re-insert to mark as newest
+        self._cache.pop(key, None)
+        self._cache[key] = (time.monotonic(), value)
+        while len(self._cache) > self.max_cells:
+            del self._cache[next(iter(self._cache))]
+
+    def _fallback(self, key: Hashable, default: Any):
+        # Prefer a stale reading for the same key over the static default
+        self.counters["fallbacks"] += 1
+        cached = self._cache.get(key)
+        return cached[1] if cached is not None else default
+
+    def _request(self, cell: Cell, **params) -> Dict[str, Any]:
+        import requests
+
+        r = requests.get(
+            self.base_url,
+            params={"latitude": cell[0], "longitude": cell[1], **params},
+            timeout=self.timeout_s
+        )
+        r.raise_for_status()
+        return r.json()
+
+    def _fetch(self, cell: Cell) -> Reading:
+        c = self._request(cell, current="temperature_2m,relative_humidity_2m")["current"]
+        return float(c["temperature_2m"]), float(c["relative_humidity_2m"])
+
+    def _fetch_day(self, cell: Cell) -> DayReadings:
+        # Local-time hours so the slots match the user's day
+        hourly = self._request(
+            cell,
+            hourly="temperature_2m,relative_humidity_2m",
+            forecast_days=1,
+            timezone="auto"
+        )["hourly"]
+        return aggregate_forecast(hourly, self.fallback)